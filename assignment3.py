@@ -8,52 +8,136 @@ Created on: December of 2023
 @author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
 """
 
+import os
+import sys
 import gameFunctions as funcs
+import rleBottles
+import bottleRenderer
+import gameBoard
+import gameStore
+import moveHistory
+import moveJournal
 
-option = int(input("1 - New game \n2 - Continuation game ?\n"))
-fileName = input("Name of the file containing the game information? ")
+# With the --rle option the bottles are kept run-length encoded, so moves
+# and the "full" check do not depend on the capacity of the bottles
+useRunLength = "--rle" in sys.argv[1:]
+rules = rleBottles if useRunLength else funcs
+# With the --ansi option only the lines of the bottles that changed are
+# drawn again, at the top of the terminal
+if "--ansi" in sys.argv[1:]:
+    showBottles = bottleRenderer.BottleScreen().show
+else:
+    showBottles = funcs.showBottles
+# With the --journal FILE option every move and error is appended to FILE
+# as it happens; if FILE already has a game, that game is continued
+journalName = None
+# Answers to "Source bottle?" that undo and redo moves
+UNDO_REDO = ['<', '>']
+if "--journal" in sys.argv[1:-1]:
+    journalName = sys.argv[sys.argv.index("--journal") + 1]
 
-if option == 1:
-    """ Read some of the information about a new game from a file, and
-        build the missing information accordingly"""
-    infoGame = funcs.newGameInfo(fileName)
+if journalName is not None and os.path.exists(journalName) and \
+   os.path.getsize(journalName) > 0:
+    option = 0
+    infoGame = moveJournal.loadJournal(journalName)
 else:
-    """ Read all the information about an old game from a file"""
-    infoGame = funcs.oldGameInfo(fileName)
+    option = int(input("1 - New game \n2 - Continuation game ?\n"
+                       "3 - Continuation game from a database ?\n"))
+    if option == 3:
+        """ Read all the information about an old game from a database"""
+        dbName = input("Name of the database file? ")
+        gameId = int(input("Id of the game? "))
+        with gameStore.GameStore(dbName) as store:
+            infoGame = store.loadGame(gameId)
+    else:
+        fileName = input("Name of the file containing the game information? ")
+        if option == 1:
+            """ Read some of the information about a new game from a file, and
+                build the missing information accordingly"""
+            infoGame = funcs.newGameInfo(fileName)
+        else:
+            """ Read all the information about an old game from a file"""
+            infoGame = funcs.oldGameInfo(fileName)
 
 expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = infoGame
+if useRunLength:
+    bottles = rleBottles.toRunBottles(bottles)
+# The full bottles are tracked by the board, also when one is poured out again
+board = gameBoard.GameBoard(bottles, botSize, expertise)
+fullBottles = board.fullBottles
+history = moveHistory.MoveHistory()
+journal = None
+if journalName is not None:
+    journal = moveJournal.MoveJournal(journalName)
+    # Also for a game continued from the journal, so that the next time
+    # only the records from here on are replayed
+    journal.snapshot(infoGame)
 
 endGame = False
-funcs.showBottles(bottles, botSize, nrErrors)
+showBottles(bottles, botSize, nrErrors)
 source = funcs.askUserFor("Source bottle? ", bottles.keys())
 # Let's play the game
 while not endGame and not source == 'Z':
-    destin = funcs.askUserFor("Destination bottle? ", bottles.keys())
-    if funcs.moveIsPossible(botSize, source, destin, bottles):
-        funcs.doMove(botSize, source, destin,bottles)
-        funcs.showBottles(bottles, botSize, nrErrors)
-        if funcs.full(bottles[destin], botSize):
-            fullBottles += 1
+    if source in UNDO_REDO:
+        """ Undo or redo the last move (or error) instead of a new one"""
+        canDo = history.canUndo() if source == '<' else history.canRedo()
+        if canDo:
+            replay = history.undo if source == '<' else history.redo
+            fullBottles, nrErrors = replay(bottles, fullBottles, nrErrors, board)
+            if journal is not None and source == '<':
+                journal.recordUndo()
+            elif journal is not None:
+                journal.recordRedo()
+            showBottles(bottles, botSize, nrErrors)
+        else:
+            print("Nothing to undo!" if source == '<' else "Nothing to redo!")
     else:
-        print("Error!")
-        nrErrors += 1
-    endGame = funcs.allBottlesFull(nrBotts, fullBottles, expertise) or \
+        destin = funcs.askUserFor("Destination bottle? ", bottles.keys())
+        if rules.moveIsPossible(botSize, source, destin, bottles):
+            transfer = board.doMove(source, destin, rules)
+            if journal is not None:
+                journal.recordMove(source, destin, transfer)
+            showBottles(bottles, botSize, nrErrors)
+            fullBottles = board.fullBottles
+            history.recordMove(source, destin, transfer, bottles, board.isFull(destin))
+        else:
+            print("Error!")
+            nrErrors += 1
+            history.recordError()
+            if journal is not None:
+                journal.recordError()
+    endGame = board.allBottlesFull() or \
               nrErrors == 3
               
     if not endGame:
-        source = funcs.askUserFor("Source bottle? (Z to leave game)", 
-                                  bottles.keys(), 'Z')
+        source = funcs.askUserFor("Source bottle? (Z to leave game, < undo, > redo)", 
+                                  list(bottles.keys()) + UNDO_REDO, 'Z')
 """
 End of game may have happened either because the user filled all the bottles he
 was supposed to, or he made 3 errors, or he gave up playing (by inputing 
 the letter 'Z'' for the source) 
 """        
+if journal is not None:
+    journal.close()
+    # A finished game is not continued; one left with 'Z' stays in the journal
+    if source != 'Z':
+        os.remove(journalName)
 if source == 'Z':
     store = funcs.askUserFor("Want to store the game for future playing? (YES,NO)", 
                              ['YES','NO'], '')
     if store == "YES":
-        fileName = input("Name of the file where to store the game information?")
-        funcs.writeGameInfo(fileName, expertise,nrBotts,fullBottles,botSize,bottles,nrErrors)
+        where = funcs.askUserFor("Store it in a file or in a database? (FILE,DATABASE)",
+                                 ['FILE','DATABASE'], '')
+        if where == "DATABASE":
+            dbName = input("Name of the database file? ")
+            player = input("Player name? ")
+            with gameStore.GameStore(dbName) as games:
+                gameId = games.saveGame((expertise,nrBotts,fullBottles,botSize,
+                                         bottles,nrErrors), player)
+            print("Game stored with id", gameId)
+        else:
+            fileName = input("Name of the file where to store the game information?")
+            funcs.writeGameInfo(fileName, expertise,nrBotts,fullBottles,botSize,bottles,nrErrors)
         print("Hope to see you again soon!")
     else:
         print("Better luck next time!")
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Solves many games in parallel processes.
+
+The games are either saved games (any format read by oldGameInfo, such as
+old.txt or midgame.txt) or new games built from the settings of a
+newGameInfo file, read once. They are sent one by one to a
+ProcessPoolExecutor, at most two per process at a time (so games are read
+or built only when a process is about to need them), and each result is
+written to the results file, one JSON object per line, as soon as its game
+is done:
+
+    {"game": ..., "solvable": ..., "optimalLength": ..., "nodes": ...,
+     "seconds": ..., "status": ...}
+
+solvable comes from solver.isSolvable (null if it was stopped by the limits)
+and, for the games that can be won, optimalLength from
+optimalSolver.optimalSolution, with nodes the states it expanded (both null
+if it was stopped). status is "ok", "limit" (the time or node limit of the
+game was reached) or "error" (the file could not be read, or the search
+failed; the message is in "error").
+
+Usage:
+    python3 batchSolver.py old.txt midgame.txt --out results.jsonl
+    python3 batchSolver.py --generate 1000 newgameinfo.txt --out results.jsonl
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import gameFunctions as funcs
+import optimalSolver
+import solver
+
+# *****************************************************
+def solveGame(name, infoGame, timeLimit = None, maxNodes = None):
+    """
+    Solves one game
+
+    Parameters
+    ----------
+    name : string
+        Identifies the game in the result.
+    infoGame : tuple
+        (expertise, nrBotts, fullBottles, botSize, bottles, nrErrors), as
+        returned by oldGameInfo.
+    timeLimit : float, optional
+        Maximum seconds for each of the two searches. The default is None.
+    maxNodes : int, optional
+        Maximum states for each of the two searches. The default is None.
+
+    Returns
+    -------
+    dictionary
+        The result (see the module documentation).
+    """
+    expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = infoGame
+    start = time.perf_counter()
+    result = {"game": name, "solvable": None, "optimalLength": None, "nodes": None,
+              "seconds": 0.0, "status": "limit"}
+    # The fast check first: the shortest solution is only searched for
+    # games that can be won (proving there is none takes IDA* much longer)
+    result["solvable"] = solver.isSolvable(bottles, botSize, expertise, maxNodes, timeLimit)
+    if result["solvable"] is False:
+        result.update(nodes = 0, status = "ok")
+    else:
+        try:
+            moves, nodes = optimalSolver.optimalSolution(bottles, botSize, expertise,
+                                                         maxNodes = maxNodes,
+                                                         timeLimit = timeLimit)
+            result.update(solvable = moves is not None,
+                          optimalLength = None if moves is None else len(moves),
+                          nodes = nodes, status = "ok")
+        except solver.SearchLimitExceeded:
+            pass
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+# *****************************************************
+def errorResult(name, error):
+    """
+    The result of a game that could not be read or solved
+    """
+    return {"game": name, "solvable": None, "optimalLength": None, "nodes": 0,
+            "seconds": 0.0, "status": "error", "error": f"{type(error).__name__}: {error}"}
+
+# *****************************************************
+def solveEntry(name, game, timeLimit, maxNodes):
+    """
+    Reads or builds the game of a (name, game) pair (see solveAll) and
+    solves it, in a worker process. Any exception becomes an error result,
+    so that one game does not stop the others.
+    """
+    try:
+        if not isinstance(game, tuple):
+            game = funcs.oldGameInfo(game) if isinstance(game, str) else game()
+        return solveGame(name, game, timeLimit, maxNodes)
+    except Exception as error:
+        return errorResult(name, error)
+
+# *****************************************************
+def solveAll(games, workers = None, timeLimit = None, maxNodes = None):
+    """
+    Solves many games in parallel processes
+
+    Parameters
+    ----------
+    games : iterable
+        (name, game) pairs, where game is either a tuple as returned by
+        oldGameInfo, the name of a file to read with oldGameInfo, or a
+        function without arguments that returns such a tuple (the last two
+        are read or called by the worker).
+    workers : int, optional
+        The number of processes. The default is None (one per CPU).
+    timeLimit : float, optional
+        Maximum seconds for each search of each game. The default is None.
+    maxNodes : int, optional
+        Maximum states for each search of each game. The default is None.
+
+    Yields
+    ------
+    dictionary
+        The result of each game (see the module documentation), as soon
+        as it is done.
+    """
+    window = 2 * (workers or os.cpu_count() or 1)
+    todo = iter(games)
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        pending = {}
+        while True:
+            # Keeps at most window games submitted, so that a long list of
+            # games is not all taken (and built) at once
+            for name, game in itertools.islice(todo, window - len(pending)):
+                future = executor.submit(solveEntry, name, game, timeLimit, maxNodes)
+                pending[future] = name
+            if not pending:
+                return
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as error:
+                    # The worker itself failed (e.g. it was killed)
+                    yield errorResult(name, error)
+
+# *****************************************************
+def generatedGames(settings, count, seed, solvable = False):
+    """
+    count new games built with newGameFromSettings(settings, solvable),
+    named by their number. settings are read once with newGameSettings.
+    Each game has its own random generator, from seed and its number (see
+    gameFunctions.gameSeed), and is built by the worker that solves it, so
+    the games do not depend on the number of workers.
+    """
+    for number in range(count):
+        yield str(number), functools.partial(funcs.newGameFromSettings, settings, solvable,
+                                             funcs.gameSeed(seed, number))
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Solves many games in parallel.")
+    parser.add_argument("files", nargs = "*", help = "saved games (see oldGameInfo)")
+    parser.add_argument("--generate", type = int, default = 0, metavar = "N",
+                        help = "solve N new games built from the first file "
+                               "(see newGameInfo) before the other files")
+    parser.add_argument("--solvable", action = "store_true",
+                        help = "generated games can always be won")
+    parser.add_argument("--seed", type = int, default = None)
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--timeout", type = float, default = 10.0,
+                        help = "seconds for each search of each game (default 10)")
+    parser.add_argument("--max-nodes", type = int, default = None)
+    parser.add_argument("--out", default = None,
+                        help = "results file, one JSON object per line "
+                               "(default: standard output)")
+    options = parser.parse_args(args)
+    if options.generate:
+        if not options.files:
+            parser.error("--generate needs a newGameInfo file")
+        try:
+            settings = funcs.newGameSettings(options.files[0])
+        except (IOError, ValueError) as error:
+            parser.error(str(error))
+        if options.seed is None:
+            options.seed = random.randrange(1 << 32)
+            print("Seed of the generated games:", options.seed, file = sys.stderr)
+        games = itertools.chain(
+            generatedGames(settings, options.generate, options.seed, options.solvable),
+            ((os.path.basename(name), name) for name in options.files[1:]))
+    else:
+        games = ((os.path.basename(name), name) for name in options.files)
+
+    out = open(options.out, "w") if options.out else sys.stdout
+    counts = {}
+    total = 0
+    start = time.perf_counter()
+    try:
+        for result in solveAll(games, options.workers, options.timeout, options.max_nodes):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            total += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{total} games in {elapsed:.2f} s ({total / elapsed:.1f} games/s): {counts}",
+          file = sys.stderr)
+
+if __name__ == "__main__":
+    main()
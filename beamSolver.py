@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Anytime beam search for games too large for the exact solvers.
+
+At each depth only the width best states are kept, ranked by the lower
+bound optimalSolver.runBound plus the free bottles in use (so that
+states that keep empty bottles to move the symbols to are preferred) and
+then by the number of complete bottles.
+Moves are scored before the new states are built, so only width states
+exist at a time; the states above the current depth keep only their move
+and their parent, to rebuild the sequence of moves. When a search ends
+(won, stuck or out of states) it is started again with twice the width,
+while there is time and memory, and the shortest solution is kept.
+
+bestMoves can be called at any time (also from another thread) and gives
+the shortest solution found so far, or, if there is none yet, the moves to
+the state with the lowest bound.
+
+Usage: python3 beamSolver.py midgame.txt --width 500 --seconds 10 --memory 200
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import heapq
+import time
+
+import gameFunctions as funcs
+import solver
+
+# Estimated bytes of a state kept in the beam, per bottle (its slot in the
+# board and lengths tuples), and of a state above the beam (its Node and
+# move)
+BYTES_PER_BOTTLE = 16
+BYTES_PER_STATE = 400
+BYTES_PER_ANCESTOR = 180
+# Estimated bytes of a state remembered as seen: its key (one slot per
+# bottle), its place in the set and the runs it keeps alive
+BYTES_PER_SEEN = 200
+BYTES_PER_SEEN_BOTTLE = 8
+
+# *****************************************************
+class Node:
+    """
+    A state of the search, with the move that led to it.
+    """
+    __slots__ = ("board", "lengths", "runs", "used", "complete", "key",
+                 "parent", "move", "depth")
+
+    def moves(self):
+        """
+        The (source, destin) index pairs from the first state to this one.
+        """
+        moves = []
+        node = self
+        while node.parent is not None:
+            moves.append(node.move)
+            node = node.parent
+        moves.reverse()
+        return moves
+
+# *****************************************************
+class BeamSolver:
+    """
+    Beam search with growing width, within a time and a memory budget.
+    """
+
+    def __init__(self, bottles, botSize, expert, width = 1000, timeLimit = None,
+                 memoryLimit = None):
+        """
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists. It is not modified.
+        botSize : int
+            The capacity of bottles.
+        expert : int
+            The level of the user's expertise.
+        width : int, optional
+            The number of states kept at each depth in the first search.
+            The default is 1000.
+        timeLimit : float, optional
+            The maximum time for run, in seconds. The default is None (no limit).
+        memoryLimit : int, optional
+            The maximum memory for the states, in bytes. The width is
+            reduced to fit. The default is None (no limit).
+            The memory is an approximation, estimated from the numbers of
+            states and bottles (see BYTES_PER_STATE and the constants next
+            to it), not measured. On games of 10 bottles the peak measured
+            with tracemalloc was within about 30% of it, above or below,
+            so leave some room. The estimated peak is kept in peakMemory.
+        """
+        self.letters = list(bottles.keys())
+        self.botSize = botSize
+        self.goal = len(bottles) - expert
+        self.width = width
+        self.timeLimit = timeLimit
+        self.memoryLimit = memoryLimit
+        self.nodes = 0
+        self.peakMemory = 0
+        self.solution = None
+        self.closest = None
+        self.root = self._rootNode(bottles)
+
+    def _rootNode(self, bottles):
+        node = Node()
+        node.board = tuple(solver.runsOf(content) for content in bottles.values())
+        node.lengths = tuple(len(content) for content in bottles.values())
+        node.runs = sum(len(runs) for runs in node.board)
+        node.used = sum(1 for runs in node.board if runs)
+        node.complete = sum(1 for runs, length in zip(node.board, node.lengths)
+                            if len(runs) == 1 and length == self.botSize)
+        node.key = tuple(sorted(node.board))
+        node.parent = None
+        node.move = None
+        node.depth = 0
+        return node
+
+    def bound(self, node):
+        return node.runs - min(node.used, self.goal)
+
+    def bestMoves(self):
+        """
+        The best sequence of moves found so far.
+
+        Returns
+        -------
+        moves : list of tuples
+            (source, destin) pairs of letters.
+        solved : bool
+            True if the moves win the game.
+        """
+        best = self.solution if self.solution is not None else self.closest
+        if best is None:
+            return [], False
+        return [(self.letters[source], self.letters[destin]) for source, destin in best.moves()], \
+               self.solution is not None
+
+    def _candidates(self, node, rank, heap, width):
+        # Scores every useful move of node, keeping the width best in heap
+        board = node.board
+        lengths = node.lengths
+        botSize = self.botSize
+        withRoom = {}
+        empty = None
+        for index, runs in enumerate(board):
+            if not runs:
+                empty = index
+            elif lengths[index] < botSize:
+                withRoom.setdefault(runs[-1][0], []).append(index)
+        for source, sourceRuns in enumerate(board):
+            # Complete bottles are never poured again
+            if not sourceRuns or (len(sourceRuns) == 1 and lengths[source] == botSize):
+                continue
+            symbol, run = sourceRuns[-1]
+            destins = [destin for destin in withRoom.get(symbol, ()) if destin != source]
+            # A single run poured into an empty bottle only changes its place
+            if empty is not None and len(sourceRuns) > 1:
+                destins.append(empty)
+            for destin in destins:
+                destLength = lengths[destin]
+                transfer = min(run, botSize - destLength)
+                whole = transfer == run
+                runs = node.runs + (destLength == 0) - whole
+                used = node.used + (destLength == 0) - (whole and len(sourceRuns) == 1)
+                complete = node.complete + (destLength + transfer == botSize and
+                                            (destLength == 0 or len(board[destin]) == 1))
+                # The bound, plus one for each of the free bottles (beyond the
+                # goal) in use: a state without free bottles is often stuck
+                score = (runs + max(0, used - self.goal), -complete, -transfer)
+                item = (tuple(-value for value in score), rank, source, destin)
+                if len(heap) < width:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+    def _child(self, node, source, destin):
+        board = solver.pourRuns(self.botSize, node.board, source, destin, keepOrder = True)
+        transfer = min(node.board[source][-1][1], self.botSize - node.lengths[destin])
+        lengths = list(node.lengths)
+        lengths[source] -= transfer
+        lengths[destin] += transfer
+        child = Node()
+        child.board = board
+        child.lengths = tuple(lengths)
+        child.runs = node.runs - len(node.board[source]) - len(node.board[destin]) + \
+                     len(board[source]) + len(board[destin])
+        child.used = node.used - (not board[source]) + (node.lengths[destin] == 0)
+        child.complete = node.complete + (len(board[destin]) == 1 and
+                                          lengths[destin] == self.botSize)
+        # The same bottles in another order are the same state
+        child.key = tuple(sorted(board))
+        child.parent = node
+        child.move = (source, destin)
+        child.depth = node.depth + 1
+        return child
+
+    def _fitWidth(self, width, ancestors, seen):
+        # The largest width (at most width) for which the estimated memory
+        # fits in memoryLimit
+        perState = BYTES_PER_STATE + BYTES_PER_BOTTLE * len(self.letters)
+        used = ancestors * BYTES_PER_ANCESTOR + \
+               seen * (BYTES_PER_SEEN + BYTES_PER_SEEN_BOTTLE * len(self.letters))
+        if self.memoryLimit is not None:
+            width = min(width, max(0, (self.memoryLimit - used) // perState))
+        self.peakMemory = max(self.peakMemory, used + width * perState)
+        return width
+
+    def iterate(self):
+        """
+        Runs the search, one depth at a time.
+
+        Yields
+        ------
+        int
+            The current width, after each depth (bestMoves is up to date).
+        """
+        deadline = None if self.timeLimit is None else time.perf_counter() + self.timeLimit
+        width = self.width
+        self.closest = self.root
+        if self.root.complete == self.goal:
+            self.solution = self.root
+            return
+        truncated = True
+        while truncated:
+            beam = [self.root]
+            seen = {self.root.key}
+            ancestors = 0
+            # A search that never had to leave states out can not be
+            # improved with a larger width
+            truncated = False
+            while beam:
+                if deadline is not None and time.perf_counter() > deadline:
+                    return
+                # No state deeper than the shortest solution can improve it
+                if self.solution is not None and beam[0].depth + 1 >= self.solution.depth:
+                    break
+                heap = []
+                for rank, node in enumerate(beam):
+                    self._candidates(node, rank, heap, width)
+                truncated = truncated or len(heap) == width
+                ancestors += len(beam)
+                fit = self._fitWidth(width, ancestors, len(seen))
+                if fit < width:
+                    # The states seen are forgotten before the width is reduced
+                    seen.clear()
+                    fit = self._fitWidth(width, ancestors, 0)
+                if fit == 0:
+                    return
+                chosen = heapq.nlargest(fit, heap)
+                following = []
+                for _, rank, source, destin in chosen:
+                    child = self._child(beam[rank], source, destin)
+                    if child.key in seen:
+                        continue
+                    seen.add(child.key)
+                    self.nodes += 1
+                    if child.complete == self.goal:
+                        if self.solution is None or child.depth < self.solution.depth:
+                            self.solution = child
+                        break
+                    if self.bound(child) < self.bound(self.closest):
+                        self.closest = child
+                    following.append(child)
+                # The states above the beam only keep their move and parent
+                for node in beam:
+                    if node is not self.root:
+                        node.board = node.lengths = node.key = None
+                beam = following
+                yield width
+            width *= 2
+            if self.memoryLimit is not None and \
+               self._fitWidth(width, 0, 0) < width:
+                return
+
+    def run(self):
+        """
+        Runs the search until the time or memory budget ends, or the
+        width can not grow.
+
+        Returns
+        -------
+        As bestMoves.
+        """
+        for _ in self.iterate():
+            pass
+        return self.bestMoves()
+
+# *****************************************************
+def beamSolve(bottles, botSize, expert, width = 1000, timeLimit = None, memoryLimit = None):
+    """
+    Searches for a short sequence of moves that wins the game, with
+    BeamSolver (see its parameters)
+
+    Returns
+    -------
+    moves : list of tuples
+        (source, destin) pairs of letters.
+    solved : bool
+        True if the moves win the game; if False the moves lead to the
+        closest state found.
+    """
+    return BeamSolver(bottles, botSize, expert, width, timeLimit, memoryLimit).run()
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Finds short solutions of large games.")
+    parser.add_argument("files", nargs = "+", help = "saved games (see oldGameInfo)")
+    parser.add_argument("--width", type = int, default = 1000)
+    parser.add_argument("--seconds", type = float, default = 10.0)
+    parser.add_argument("--memory", type = float, default = None,
+                        help = "maximum memory for the states, in MB (estimated)")
+    parser.add_argument("--moves", action = "store_true", help = "also print the moves")
+    options = parser.parse_args(args)
+    memoryLimit = None if options.memory is None else int(options.memory * (1 << 20))
+    for fileName in options.files:
+        expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = funcs.oldGameInfo(fileName)
+        start = time.perf_counter()
+        search = BeamSolver(bottles, botSize, expertise, options.width, options.seconds,
+                            memoryLimit)
+        moves, solved = search.run()
+        print(f"{fileName}: {len(moves)} moves{'' if solved else ' (not solved)'}, "
+              f"{search.nodes} nodes, {time.perf_counter() - start:.2f} s, "
+              f"~{search.peakMemory / (1 << 20):.1f} MB")
+        if options.moves and moves:
+            print(" ".join(f"{source}>{destin}" for source, destin in moves))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Compares building games one at a time with buildGameBottles and in batches
+with bottleBatch.buildGameBatch (also converted to dictionaries).
+
+Run from the project folder: python3 benchmarks/benchBottleBatch.py
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import bottleBatch
+import gameFunctions as funcs
+
+# *****************************************************
+def rate(function, count):
+    """
+    Boards built per second by function(), that builds count boards
+    """
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+# *****************************************************
+def benchmark(nrBotts, botSize, expert, count = 100000):
+    """
+    Prints the comparison for one configuration of the game
+    """
+    letters = [chr(0x4E00 + i) for i in range(nrBotts)]
+    symbols = [chr(0x100 + i) for i in range(nrBotts)]
+    random.seed(2023)
+    single = rate(lambda: [funcs.buildGameBottles(nrBotts, botSize, expert, letters, symbols)
+                           for _ in range(count // 10)], count // 10)
+    batch = rate(lambda: bottleBatch.buildGameBatch(count, nrBotts, botSize, expert, 2023), count)
+    boards, lengths = bottleBatch.buildGameBatch(count // 10, nrBotts, botSize, expert, 2023)
+    dicts = rate(lambda: list(bottleBatch.iterBottles(boards, lengths, letters, symbols)),
+                 count // 10)
+    print(f"{nrBotts:4} bottles of capacity {botSize:3}: buildGameBottles {single:10.0f}/s, "
+          f"buildGameBatch {batch:10.0f}/s ({batch / single:.0f}x), "
+          f"batch to dictionaries {dicts:8.0f}/s")
+
+if __name__ == "__main__":
+    benchmark(10, 4, 2)
+    benchmark(10, 10, 2)
+    benchmark(100, 16, 2, count = 10000)
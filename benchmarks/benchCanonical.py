@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Measures how much canonical.canonicalKey shrinks the set of states
+reachable from boards of the standard configuration (10 bottles of
+capacity 8), compared with a key that keeps the order of the bottles,
+and how fast it is.
+
+Run from the project folder: python3 benchmarks/benchCanonical.py
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import canonical
+import gameFunctions as funcs
+
+LETTERS = "ABCDEFGHIJ"
+SYMBOLS = "@#%$!+o?"
+NR_BOTTS = 10
+BOT_SIZE = 8
+# Explorations go this many moves deep, stopping after MAX_STATES states
+DEPTH = 12
+MAX_STATES = 200000
+
+# *****************************************************
+def plainKey(bottles):
+    """
+    The contents of the bottles, in the order of the letters
+    """
+    return tuple(tuple(content) for content in bottles.values())
+
+# *****************************************************
+def statesWithin(bottles, botSize, depth):
+    """
+    The plain keys of all the states reachable from bottles in at most
+    depth moves (stops early, after the first level above MAX_STATES)
+    """
+    seen = {plainKey(bottles)}
+    level = [bottles]
+    for _ in range(depth):
+        nextLevel = []
+        for state in level:
+            for source in state:
+                for destin in state:
+                    if source != destin and funcs.moveIsPossible(botSize, source, destin, state):
+                        child = {letter: list(content) for letter, content in state.items()}
+                        funcs.doMove(botSize, source, destin, child)
+                        childKey = plainKey(child)
+                        if childKey not in seen:
+                            seen.add(childKey)
+                            nextLevel.append(child)
+        level = nextLevel
+        if not level or len(seen) > MAX_STATES:
+            break
+    return seen
+
+# *****************************************************
+def main():
+    random.seed(2023)
+    print(f"States reachable from {NR_BOTTS}x{BOT_SIZE} boards in at most {DEPTH} moves")
+    for expert in (1, 2, 3, 4):
+        bottles = funcs.buildGameBottles(NR_BOTTS, BOT_SIZE, expert, LETTERS, SYMBOLS)
+        states = statesWithin(bottles, BOT_SIZE, DEPTH)
+        canonicalStates = set()
+        start = time.perf_counter()
+        for state in states:
+            canonicalStates.add(canonical.canonicalKey(dict(zip(LETTERS, state))))
+        elapsed = time.perf_counter() - start
+        print(f"expertise {expert}: {len(states)} plain states -> {len(canonicalStates)} "
+              f"canonical ({len(states) / len(canonicalStates):.1f}x fewer), "
+              f"{elapsed / len(states) * 1e6:.1f} us per key")
+
+    key = canonical.canonicalKey
+    elapsed = timeit.timeit(lambda: key(bottles), number = 10000) / 10000
+    print(f"canonicalKey: {elapsed * 1e6:.1f} us per board")
+
+    # Puzzle bank: the same boards with shuffled bottles and renamed symbols
+    boards = [funcs.buildGameBottles(NR_BOTTS, BOT_SIZE, 2, LETTERS, SYMBOLS) for _ in range(200)]
+    variants = []
+    for bottles in boards:
+        for _ in range(10):
+            contents = list(bottles.values())
+            random.shuffle(contents)
+            newSymbols = random.sample(SYMBOLS, len(SYMBOLS))
+            rename = dict(zip(SYMBOLS, newSymbols))
+            variants.append(dict(zip(LETTERS, [[rename[s] for s in c] for c in contents])))
+    plain = {plainKey(bottles) for bottles in variants}
+    canon = {canonical.canonicalKey(bottles) for bottles in variants}
+    print(f"Puzzle bank: {len(variants)} boards ({len(boards)} distinct puzzles): "
+          f"{len(plain)} plain keys, {len(canon)} canonical keys")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Benchmark suite for the functions in gameFunctions.
+
+Every function is timed on boards of every combination of the given
+numbers of bottles and capacities. For each case the suite reports the
+calls per second and the percentiles of the latency of a single call,
+and writes all the results to a JSON file, so later changes can be
+compared with a baseline.
+
+Run from the project folder, for example:
+
+    python3 benchmarks/benchGameFunctions.py --out baseline.json
+    python3 benchmarks/benchGameFunctions.py --bottles 10 100 --capacities 8 \\
+        --functions doMove moveIsPossible
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import locale
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameFunctions as funcs
+
+BOTTLES = [10, 100, 1000, 10000]
+CAPACITIES = [4, 16, 64, 256]
+EXPERT = 2
+PERCENTILES = [50, 90, 99]
+
+# *****************************************************
+def names(nrBotts):
+    """
+    One character letters and symbols for boards with nrBotts bottles
+    (newGameInfo reads them from a file as a single line each)
+    """
+    letters = "".join(chr(0x4E00 + i) for i in range(nrBotts))
+    symbols = "".join(chr(0x100 + i) for i in range(nrBotts))
+    return letters, symbols
+
+# *****************************************************
+def possibleMove(botSize, bottles, letters, symbols):
+    """
+    A random (source, destin) pair for which a move is possible. If none
+    is found, the bottles are filled again.
+    """
+    while True:
+        for _ in range(100 * len(letters)):
+            source = letters[random.randrange(len(letters))]
+            destin = letters[random.randrange(len(letters))]
+            if source != destin and funcs.moveIsPossible(botSize, source, destin, bottles):
+                return source, destin
+        bottles.update(funcs.buildGameBottles(len(letters), botSize, EXPERT, letters, symbols))
+
+# *****************************************************
+def cases(nrBotts, botSize, folder):
+    """
+    For each function, a function that prepares the arguments of one call
+    (not timed) and the function to call with them
+    """
+    letters, symbols = names(nrBotts)
+    bottles = funcs.buildGameBottles(nrBotts, botSize, EXPERT, letters, symbols)
+    keys = list(bottles.keys())
+    newFile = os.path.join(folder, "new.txt")
+    # newGameInfo opens the file without an encoding, so it is written
+    # with the same default one
+    try:
+        with open(newFile, "w", encoding = locale.getpreferredencoding(False)) as file:
+            file.write(f"{EXPERT}\n{EXPERT - 1}\n{nrBotts}\n{botSize}\n{letters}\n{symbols}")
+    except UnicodeEncodeError:
+        newFile = None
+        print(f"newGameInfo left out: the letters of {nrBotts} bottles can not be "
+              f"written in {locale.getpreferredencoding(False)}", file = sys.stderr)
+    oldFile = os.path.join(folder, "old.txt")
+    funcs.writeGameInfo(oldFile, EXPERT, nrBotts, 0, botSize, bottles, 0)
+    saveFile = os.path.join(folder, "save.txt")
+
+    def showBottles(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcs.showBottles(*args)
+
+    functions = {
+        "topSymbolAndPosition": (lambda: (bottles[random.choice(keys)],),
+                                 funcs.topSymbolAndPosition),
+        "moveIsPossible": (lambda: (botSize, keys[random.randrange(nrBotts)],
+                                    keys[random.randrange(nrBotts)], bottles),
+                           funcs.moveIsPossible),
+        "doMove": (lambda: (botSize, *possibleMove(botSize, bottles, letters, symbols), bottles),
+                   funcs.doMove),
+        "full": (lambda: (bottles[random.choice(keys)], botSize), funcs.full),
+        "buildGameBottles": (lambda: (nrBotts, botSize, EXPERT, letters, symbols),
+                             funcs.buildGameBottles),
+        "randomSymbols": (lambda: (botSize, nrBotts - EXPERT, symbols), funcs.randomSymbols),
+        "showBottles": (lambda: (bottles, botSize, 0), showBottles),
+        "newGameInfo": (lambda: (newFile,), funcs.newGameInfo),
+        "oldGameInfo": (lambda: (oldFile,), funcs.oldGameInfo),
+        "writeGameInfo": (lambda: (saveFile, EXPERT, nrBotts, 0, botSize, bottles, 0),
+                          funcs.writeGameInfo),
+    }
+    if newFile is None:
+        del functions["newGameInfo"]
+    return functions
+
+# *****************************************************
+def percentile(ordered, p):
+    """
+    The p-th percentile of a sorted list, by the nearest rank method
+    """
+    index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+# *****************************************************
+def timeCalls(prepare, function, budget, maxCalls, minCalls = 3):
+    """
+    Calls function until budget seconds of calls (or maxCalls calls) are
+    done, and returns the sorted latencies in nanoseconds. Preparing the
+    calls may take at most another 4 * budget seconds.
+    """
+    latencies = []
+    total = 0
+    deadline = time.perf_counter_ns() + 5 * budget * 1e9
+    while len(latencies) < minCalls or \
+          (len(latencies) < maxCalls and total < budget * 1e9 and
+           time.perf_counter_ns() < deadline):
+        args = prepare()
+        start = time.perf_counter_ns()
+        function(*args)
+        elapsed = time.perf_counter_ns() - start
+        latencies.append(elapsed)
+        total += elapsed
+    latencies.sort()
+    return latencies
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Benchmarks gameFunctions.")
+    parser.add_argument("--bottles", type = int, nargs = "+", default = BOTTLES)
+    parser.add_argument("--capacities", type = int, nargs = "+", default = CAPACITIES)
+    parser.add_argument("--functions", nargs = "+", default = None,
+                        help = "functions to time (default: all)")
+    parser.add_argument("--budget", type = float, default = 0.2,
+                        help = "seconds of calls per function and board (default: 0.2)")
+    parser.add_argument("--max-calls", type = int, default = 10000)
+    parser.add_argument("--seed", type = int, default = 2023)
+    parser.add_argument("--out", default = "bench_gameFunctions.json")
+    options = parser.parse_args(args)
+
+    random.seed(options.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for nrBotts in options.bottles:
+            for botSize in options.capacities:
+                for name, (prepare, function) in cases(nrBotts, botSize, folder).items():
+                    if options.functions and name not in options.functions:
+                        continue
+                    latencies = timeCalls(prepare, function, options.budget, options.max_calls)
+                    result = {"function": name, "nrBotts": nrBotts, "botSize": botSize,
+                              "calls": len(latencies),
+                              "opsPerSec": len(latencies) / (sum(latencies) / 1e9)}
+                    for p in PERCENTILES:
+                        result[f"p{p}Ns"] = percentile(latencies, p)
+                    results.append(result)
+                    print(f"{name:>20} {nrBotts:>6} x {botSize:<4}"
+                          f"{result['opsPerSec']:>14.1f} ops/s  "
+                          + "  ".join(f"p{p} {result[f'p{p}Ns'] / 1000:.1f} us"
+                                      for p in PERCENTILES))
+
+    with open(options.out, "w") as file:
+        json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                   "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": options.seed,
+                   "results": results}, file, indent = 1)
+    print("Results written to", options.out)
+
+if __name__ == "__main__":
+    main()
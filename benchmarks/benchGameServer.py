@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Load generator for gameServer.py.
+
+Opens many connections at the same time, each one a player that starts a
+new game and plays random possible moves (found with a MoveIndex over its
+own copy of the bottles), starting another game when one ends. Reports the
+sustained moves per second and the latency of the move requests.
+
+Without --port a server is started in this process, on a free port, so the
+players and the server share one CPU; give --port to load a server started
+apart (python3 gameServer.py newgameinfo.txt).
+
+Run from the project folder:
+    python3 benchmarks/benchGameServer.py newgameinfo.txt --players 1000 --seconds 10
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameServer
+import moveIndex
+
+# *****************************************************
+async def request(reader, writer, **arguments):
+    """
+    Sends a request and returns its answer
+    """
+    writer.write(json.dumps(arguments, ensure_ascii = False).encode("utf-8") + b"\n")
+    await writer.drain()
+    answer = json.loads(await reader.readline())
+    if not answer["ok"]:
+        raise IOError(answer["error"])
+    return answer
+
+# *****************************************************
+async def player(host, port, deadline, latencies, counts):
+    """
+    Plays until deadline (time.perf_counter), appending the latency of
+    each move to latencies
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit = gameServer.MAX_LINE)
+    try:
+        while time.perf_counter() < deadline:
+            game = await request(reader, writer, op = "new")
+            counts["games"] += 1
+            bottles = game["bottles"]
+            index = moveIndex.MoveIndex(bottles, game["botSize"])
+            while time.perf_counter() < deadline:
+                moves = index.legalMoves()
+                if not moves:
+                    break
+                source, destin = random.choice(moves)
+                start = time.perf_counter()
+                answer = await request(reader, writer, op = "move", source = source, destin = destin)
+                latencies.append(time.perf_counter() - start)
+                index.doMove(source, destin)
+                if answer["result"] != "playing":
+                    break
+    finally:
+        writer.close()
+
+# *****************************************************
+def percentile(sortedValues, fraction):
+    return sortedValues[min(len(sortedValues) - 1, int(fraction * len(sortedValues)))]
+
+# *****************************************************
+async def run(options):
+    server = None
+    host, port = options.host, options.port
+    if port is None:
+        server = await gameServer.startServer(options.fileName, host, 0)
+        port = server.sockets[0].getsockname()[1]
+    latencies = []
+    counts = {"games": 0}
+    start = time.perf_counter()
+    deadline = start + options.seconds
+    players = [player(host, port, deadline, latencies, counts) for _ in range(options.players)]
+    await asyncio.gather(*players)
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    print(f"{options.players} players, {elapsed:.1f} s: {counts['games']} games, "
+          f"{len(latencies)} moves ({len(latencies) / elapsed:.0f} moves/s)")
+    if latencies:
+        print(f"move latency: p50 {percentile(latencies, 0.50) * 1e3:.2f} ms, "
+              f"p90 {percentile(latencies, 0.90) * 1e3:.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1e3:.2f} ms, "
+              f"max {latencies[-1] * 1e3:.2f} ms")
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Loads a gameServer.py with many players.")
+    parser.add_argument("fileName", help = "file with the information for new games")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = None,
+                        help = "port of a running server (default: start one here)")
+    parser.add_argument("--players", type = int, default = 100)
+    parser.add_argument("--seconds", type = float, default = 10)
+    parser.add_argument("--seed", type = int, default = None)
+    options = parser.parse_args(args)
+    random.seed(options.seed)
+    asyncio.run(run(options))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Compares listing all the possible moves by calling moveIsPossible for every
+pair of bottles with listing them from a MoveIndex (including the cost of
+keeping the index up to date after each move).
+
+Run from the project folder: python3 benchmarks/benchMoveIndex.py
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameFunctions as funcs
+import moveIndex
+
+# *****************************************************
+def pairMoves(botSize, bottles):
+    """
+    All the possible moves, checking every pair of bottles
+    """
+    return [(source, destin) for source in bottles for destin in bottles
+            if source != destin and funcs.moveIsPossible(botSize, source, destin, bottles)]
+
+# *****************************************************
+def play(bottles, botSize, listMoves, turns):
+    """
+    Plays up to turns random possible moves, listing all of them at each
+    turn with listMoves(), that returns them and the doMove(source, destin)
+    to use.
+    Returns the time taken and the number of moves listed.
+    """
+    random.seed(7)
+    listed = 0
+    start = time.perf_counter()
+    for _ in range(turns):
+        moves, doMove = listMoves()
+        if not moves:
+            break
+        listed += len(moves)
+        doMove(*random.choice(moves))
+    return time.perf_counter() - start, listed
+
+# *****************************************************
+def benchmark(nrBotts, botSize, expert, turns = 200):
+    """
+    Prints the comparison for one configuration of the game
+    """
+    letters = [chr(0x4E00 + i) for i in range(nrBotts)]
+    symbols = [chr(0x100 + i) for i in range(nrBotts)]
+    random.seed(2023)
+    bottles = funcs.buildGameBottles(nrBotts, botSize, expert, letters, symbols)
+
+    work = {letter: list(content) for letter, content in bottles.items()}
+    pairTime, pairListed = play(work, botSize, lambda: (
+        pairMoves(botSize, work),
+        lambda source, destin: funcs.doMove(botSize, source, destin, work)), turns)
+
+    work = {letter: list(content) for letter, content in bottles.items()}
+    index = moveIndex.MoveIndex(work, botSize)
+    indexTime, indexListed = play(work, botSize, lambda: (index.legalMoves(), index.doMove), turns)
+
+    print(f"{nrBotts:6} bottles of capacity {botSize:3}: pairs {pairTime / turns * 1e3:9.3f} ms, "
+          f"index {indexTime / turns * 1e3:7.3f} ms per turn "
+          f"({pairTime / indexTime:.0f}x faster, {indexListed / turns:.0f} moves per turn)")
+
+if __name__ == "__main__":
+    benchmark(10, 4, 2)
+    benchmark(100, 4, 2)
+    benchmark(300, 16, 2)
+    benchmark(1000, 16, 2, turns = 20)
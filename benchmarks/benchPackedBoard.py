@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Compares the memory and the speed of the packed representation of the
+bottles (packedBoard) with the dictionary of lists (gameFunctions): the
+memory of a state, the time of a move one at a time and in a batch of
+states (packedDoMoves), and the time to copy and hash a state.
+
+Run from the project folder: python3 benchmarks/benchPackedBoard.py
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+import gameFunctions as funcs
+import packedBoard as packed
+
+# States of the batch of moves
+BATCH = 20000
+
+# *****************************************************
+def deepSize(bottles):
+    """
+    The memory, in bytes, taken by a dictionary of bottles and its lists
+    (the symbols themselves are shared strings, so they are not counted)
+    """
+    return sys.getsizeof(bottles) + sum(sys.getsizeof(content) for content in bottles.values())
+
+# *****************************************************
+def legalMoves(botSize, bottles, count):
+    """
+    A list of count moves, each one possible after the previous ones
+    """
+    work = {letter: list(content) for letter, content in bottles.items()}
+    letters = list(work.keys())
+    moves = []
+    while len(moves) < count:
+        source, destin = random.sample(letters, 2)
+        if funcs.moveIsPossible(botSize, source, destin, work):
+            funcs.doMove(botSize, source, destin, work)
+            moves.append((source, destin))
+    return moves
+
+# *****************************************************
+def benchmark(nrBotts, botSize, expert):
+    """
+    Prints the comparison for one configuration of the game
+    """
+    print(f"--- {nrBotts} bottles of capacity {botSize}, expertise {expert}")
+    random.seed(2023)
+    bottles = funcs.buildGameBottles(nrBotts, botSize, expert, "ABCDEFGHIJ", "@#%$!+o?")
+    state, letters, symbols = packed.packBottles(bottles, botSize)
+    index = {letter: i for i, letter in enumerate(letters)}
+    moves = legalMoves(botSize, bottles, 200)
+    packedMoves = [(index[s], index[d]) for s, d in moves]
+
+    dictBytes = deepSize(bottles)
+    packedBytes = sys.getsizeof(bytes(state))
+    compactBytes = sys.getsizeof(bytes(packed.compactStates(packed.stackStates([state]),
+                                                            botSize)[0]))
+    print(f"Memory per state: dict {dictBytes} B, packed {packedBytes} B "
+          f"({dictBytes / packedBytes:.1f}x smaller), compact {compactBytes} B "
+          f"({dictBytes / compactBytes:.1f}x smaller)")
+
+    def runDict():
+        work = {letter: list(content) for letter, content in bottles.items()}
+        for source, destin in moves:
+            funcs.moveIsPossible(botSize, source, destin, work)
+            funcs.doMove(botSize, source, destin, work)
+
+    def runPacked():
+        work = bytearray(state)
+        for source, destin in packedMoves:
+            packed.packedMoveIsPossible(botSize, source, destin, work)
+            packed.packedDoMove(botSize, source, destin, work)
+
+    def copyDict():
+        return hash(tuple(tuple(content) for content in
+                          {letter: list(content) for letter, content in bottles.items()}.values()))
+
+    def copyPacked():
+        return hash(bytes(state))
+
+    for name, dictFunc, packedFunc in (("200 moves", runDict, runPacked),
+                                       ("copy + hash", copyDict, copyPacked)):
+        dictTime = min(timeit.repeat(dictFunc, number=200, repeat=5))
+        packedTime = min(timeit.repeat(packedFunc, number=200, repeat=5))
+        print(f"{name}: dict {dictTime / 200 * 1e6:.1f} us, packed "
+              f"{packedTime / 200 * 1e6:.1f} us (packed {dictTime / packedTime:.1f}x as fast)")
+
+    batchMoves(nrBotts, botSize, expert)
+
+# *****************************************************
+def batchMoves(nrBotts, botSize, expert):
+    """
+    Prints the time of a move in each of BATCH games: one at a time on the
+    dictionaries and with one call of packedDoMoves on the packed states
+    """
+    games = [funcs.buildGameBottles(nrBotts, botSize, expert, "ABCDEFGHIJ", "@#%$!+o?")
+             for _ in range(BATCH)]
+    letters = list(games[0].keys())
+    moves = []
+    for bottles in games:
+        possible = [(source, destin) for source in letters for destin in letters
+                    if source != destin and
+                    funcs.moveIsPossible(botSize, source, destin, bottles)]
+        # (a game without moves gets one that is not possible)
+        moves.append(random.choice(possible) if possible else tuple(letters[:2]))
+    sources = np.array([letters.index(source) for source, _ in moves])
+    destins = np.array([letters.index(destin) for _, destin in moves])
+    states = packed.stackStates(packed.packBottles(bottles, botSize, "@#%$!+o?")[0]
+                                for bottles in games)
+
+    dictTime = packedTime = float("inf")
+    for repeat in range(5):
+        work = [{letter: list(content) for letter, content in bottles.items()}
+                for bottles in games]
+        start = time.perf_counter()
+        for bottles, (source, destin) in zip(work, moves):
+            if funcs.moveIsPossible(botSize, source, destin, bottles):
+                funcs.doMove(botSize, source, destin, bottles)
+        dictTime = min(dictTime, time.perf_counter() - start)
+        work = states.copy()
+        start = time.perf_counter()
+        packed.packedDoMoves(botSize, work, sources, destins)
+        packedTime = min(packedTime, time.perf_counter() - start)
+    print(f"a move in each of {BATCH} games: dict {dictTime / BATCH * 1e9:.0f} ns, "
+          f"packedDoMoves {packedTime / BATCH * 1e9:.0f} ns per move "
+          f"({dictTime / packedTime:.1f}x faster)")
+
+if __name__ == "__main__":
+    benchmark(10, 8, 2)
+    benchmark(10, 64, 2)
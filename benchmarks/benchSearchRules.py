@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Reports how many states optimalSolver.optimalSolution expands, and the time
+it takes, on a fixed corpus of games with all the rules of searchRules,
+with none, without each rule and with only each rule, and checks that
+every solution found is as short as the one found with no rules.
+
+Run from the project folder: python3 benchmarks/benchSearchRules.py
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameFunctions as funcs
+import optimalSolver
+import searchRules
+import solver
+
+LETTERS = "ABCDEFGHIJ"
+SYMBOLS = "@#%$!+o?"
+# Maximum states visited for each game, so that a slow configuration ends
+MAX_NODES = 500000
+
+# *****************************************************
+def corpus(configurations, seed = 23):
+    """
+    The games of the benchmark: (nrBotts, botSize, expert, how many)
+    configurations, built with buildSolvableGameBottles from seed
+    """
+    games = []
+    for nrBotts, botSize, expert, count in configurations:
+        for number in range(count):
+            bottles = funcs.buildSolvableGameBottles(nrBotts, botSize, expert, LETTERS, SYMBOLS,
+                                                     rng = funcs.gameSeed(seed, len(games)))
+            moves, _ = optimalSolver.optimalSolution(bottles, botSize, expert,
+                                                     pruning = (), ordering = ())
+            games.append((bottles, botSize, expert, len(moves)))
+    return games
+
+# *****************************************************
+def run(games, pruning, ordering, heuristic):
+    """
+    The states expanded, time taken and games stopped at MAX_NODES with a
+    configuration of the rules
+    """
+    nodes = 0
+    stopped = 0
+    start = time.perf_counter()
+    for bottles, botSize, expert, length in games:
+        try:
+            moves, visited = optimalSolver.optimalSolution(bottles, botSize, expert, heuristic,
+                                                           MAX_NODES, pruning = pruning,
+                                                           ordering = ordering)
+            assert len(moves) == length, "a rule lost the shortest solution"
+        except solver.SearchLimitExceeded:
+            visited = MAX_NODES
+            stopped += 1
+        nodes += visited
+    return nodes, time.perf_counter() - start, stopped
+
+# *****************************************************
+def report(games, heuristic):
+    """
+    Prints the comparison of the rules for one heuristic
+    """
+    pruning = list(searchRules.PRUNING_RULES)
+    ordering = list(searchRules.ORDERING_RULES)
+    configurations = [("no rules", [], []), ("all rules", pruning, ordering)]
+    for name in pruning:
+        configurations.append((f"without {name}", [rule for rule in pruning if rule != name],
+                               ordering))
+    for name in ordering:
+        configurations.append((f"without {name}", pruning,
+                               [rule for rule in ordering if rule != name]))
+    for name in pruning:
+        configurations.append((f"only {name}", [name], []))
+    for name in ordering:
+        configurations.append((f"only {name}", [], [name]))
+
+    print(f"heuristic {heuristic}, {len(games)} games:")
+    baseline = None
+    for name, pruningRules, orderingRules in configurations:
+        nodes, elapsed, stopped = run(games, pruningRules, orderingRules, heuristic)
+        if baseline is None:
+            baseline = nodes, elapsed
+        limited = f" ({stopped} stopped at {MAX_NODES})" if stopped else ""
+        print(f"  {name:24} {nodes:9} states {nodes / baseline[0]:6.2f}x "
+              f"{elapsed:7.2f} s {elapsed / baseline[1]:6.2f}x{limited}")
+
+if __name__ == "__main__":
+    report(corpus([(8, 4, 2, 30)]), "runs")
+    report(corpus([(8, 4, 2, 30)]), "boundaries")
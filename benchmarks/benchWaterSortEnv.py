@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Steps per second of waterSortEnv.WaterSortEnv, with random actions (most of
+them errors, so games end and are built again very often) and with random
+possible actions (chosen from legalMoves, outside the timed step).
+
+Run from the project folder: python3 benchmarks/benchWaterSortEnv.py
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import waterSortEnv
+
+# *****************************************************
+def legalActions(env, rng):
+    """
+    A random possible move for each game ((0, 0), an error, if there is none)
+    """
+    legal = env.legalMoves().reshape(env.count, -1)
+    keys = np.where(legal, rng.random(legal.shape), -1.0)
+    chosen = keys.argmax(axis = 1)
+    return np.stack((chosen // env.nrBotts, chosen % env.nrBotts), axis = 1)
+
+# *****************************************************
+def benchmark(count, nrBotts, botSize, expert, steps = 50):
+    """
+    Prints the steps per second for one configuration of the game
+    """
+    rng = np.random.default_rng(2023)
+    env = waterSortEnv.WaterSortEnv(count, nrBotts, botSize, expert, seed = 2023)
+    env.reset()
+    results = []
+    for name in ("random", "possible"):
+        elapsed = 0.0
+        ended = 0
+        for _ in range(steps):
+            if name == "random":
+                actions = rng.integers(0, nrBotts, size = (count, 2))
+            else:
+                actions = legalActions(env, rng)
+            start = time.perf_counter()
+            _, _, done, _ = env.step(actions)
+            elapsed += time.perf_counter() - start
+            ended += int(done.sum())
+        results.append(f"{name} actions {count * steps / elapsed / 1e6:5.2f} M steps/s "
+                       f"({ended / (count * steps):.0%} end)")
+    print(f"{count:6} games of {nrBotts} bottles of capacity {botSize}: " + ", ".join(results))
+
+if __name__ == "__main__":
+    for count in (1024, 16384, 65536):
+        benchmark(count, 10, 4, 2)
+    benchmark(16384, 10, 10, 2)
+    benchmark(4096, 50, 16, 2)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Many games built at once with NumPy.
+
+A batch of M games with the same number of bottles, capacity and expertise
+is kept in two arrays:
+    -> boards, of shape (M, nrBotts, botSize) and type uint8, with the
+       contents of each bottle from the bottom; 0 is an empty position and
+       i + 1 is the i-th symbol (as in packedBoard)
+    -> lengths, of shape (M, nrBotts), with the number of symbols in each bottle
+
+buildGameBatch fills them following the same rules as buildGameBottles
+(the symbols are shuffled and then cut in pieces of randint(botSize -
+expert, botSize) symbols, one per bottle), with all the games shuffled
+and cut together by NumPy.
+
+A game of a batch is read by the rules either through boardViews (no copy;
+the functions of gameFunctions that only read bottles, as moveIsPossible
+and full, compare the symbol codes as they compare symbols) or as a
+dictionary of lists of symbols made by toBottles, which is needed to play
+moves with doMove or to show the game.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import numpy as np
+
+# *****************************************************
+def buildGameBatch(count, nrBotts, botSize, expert, rng = None):
+    """
+    Builds count games filled in a random way, as buildGameBottles does
+
+    Parameters
+    ----------
+    count : int
+        The number of games (M).
+    nrBotts : int
+        The number of bottles in each game.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    rng : numpy.random.Generator, int or None, optional
+        The random number generator, or its seed (see
+        numpy.random.default_rng). To build batches in many processes, give
+        each one a generator from numpy.random.SeedSequence(seed).spawn.
+        The default is None (a new generator with a random seed).
+
+    Returns
+    -------
+    boards : numpy array of uint8, shape (count, nrBotts, botSize)
+        The contents of the bottles (see the module documentation).
+    lengths : numpy array of int, shape (count, nrBotts)
+        The number of symbols in each bottle.
+
+    Requires:
+    --------
+        0 < expert < nrBotts; nrBotts - expert <= 255
+
+    """
+    rng = np.random.default_rng(rng)
+    howManyFullBott = nrBotts - expert
+    total = howManyFullBott * botSize
+    # The symbols of each game, shuffled (randomSymbols)
+    symbols = np.repeat(np.arange(1, howManyFullBott + 1, dtype = np.uint8), botSize)
+    # (sorting random keys is faster than Generator.permuted on rows)
+    shuffled = symbols[rng.random((count, total)).argsort(axis = 1)]
+    # Each bottle gets the next randint(botSize - expert, botSize) symbols,
+    # while there are symbols left
+    sizes = rng.integers(botSize - expert, botSize, size = (count, nrBotts), endpoint = True)
+    ends = np.minimum(np.cumsum(sizes, axis = 1), total)
+    starts = np.zeros_like(ends)
+    starts[:, 1:] = ends[:, :-1]
+    lengths = ends - starts
+
+    positions = np.arange(botSize)
+    indexes = np.minimum(starts[:, :, None] + positions, total - 1).reshape(count, -1)
+    boards = np.take_along_axis(shuffled, indexes, axis = 1).reshape(count, nrBotts, botSize)
+    boards[positions >= lengths[:, :, None]] = 0
+    return boards, lengths
+
+# *****************************************************
+def boardViews(boards, lengths, game, letters):
+    """
+    The bottles of one game of a batch, without copying them
+
+    Parameters
+    ----------
+    boards : numpy array, shape (M, nrBotts, botSize)
+        As returned by buildGameBatch.
+    lengths : numpy array, shape (M, nrBotts)
+        As returned by buildGameBatch.
+    game : int
+        The index of the game in the batch.
+    letters : string
+        The letters that identify bottles.
+
+    Returns
+    -------
+    dictionary
+        Keys are the first nrBotts letters and values are read-only views of
+        the contents of the bottles in boards (symbol codes, from 1). It can
+        be given as bottles to topSymbolAndPosition, full and moveIsPossible
+        of gameFunctions, but not to doMove, which changes the lengths of
+        the bottles, nor to showBottles, which needs the symbols (use
+        toBottles for those).
+
+    """
+    views = {}
+    for bottle, length in enumerate(lengths[game].tolist()):
+        view = boards[game, bottle, :length]
+        view.flags.writeable = False
+        views[letters[bottle]] = view
+    return views
+
+# *****************************************************
+def toBottles(boards, lengths, game, letters, symbols):
+    """
+    One game of a batch as a dictionary of bottles
+
+    Parameters
+    ----------
+    boards : numpy array, shape (M, nrBotts, botSize)
+        As returned by buildGameBatch.
+    lengths : numpy array, shape (M, nrBotts)
+        As returned by buildGameBatch.
+    game : int
+        The index of the game in the batch.
+    letters : string
+        The letters that identify bottles.
+    symbols : string
+        The symbols that compose the liquid in bottles.
+
+    Returns
+    -------
+    dictionary where keys are strings and values are lists.
+        As documented in the buildGameBottles function, ready to be used by
+        the functions in gameFunctions.
+
+    """
+    table = [""] + list(symbols)
+    return {letters[bottle]: [table[code] for code in boards[game, bottle, :length].tolist()]
+            for bottle, length in enumerate(lengths[game].tolist())}
+
+# *****************************************************
+def iterBottles(boards, lengths, letters, symbols):
+    """
+    Every game of a batch as a dictionary of bottles (see toBottles)
+    """
+    table = [""] + list(symbols)
+    for rows, sizes in zip(boards.tolist(), lengths.tolist()):
+        yield {letters[bottle]: [table[code] for code in row[:length]]
+               for bottle, (row, length) in enumerate(zip(rows, sizes))}
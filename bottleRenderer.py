@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Differential drawing of the game bottles on ANSI terminals.
+
+The first frame clears the screen and is drawn at the top. The following
+frames only rewrite the lines that changed since the previous one, and
+then leave the cursor right below the frame, erasing what was written
+there (the questions and answers of the previous turn).
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import sys
+
+import gameFunctions as funcs
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_BELOW = "\x1b[J"
+CLEAR_LINE = "\x1b[2K"
+
+# *****************************************************
+def moveTo(row):
+    """
+    The ANSI sequence that moves the cursor to the start of row (from 1).
+    """
+    return f"\x1b[{row};1H"
+
+# *****************************************************
+class BottleScreen:
+    """
+    Draws frames of renderBottles, rewriting only the lines that changed.
+    """
+
+    def __init__(self, out = None):
+        """
+        Parameters
+        ----------
+        out : file, optional
+            Where to write. The default is None (sys.stdout at each frame).
+        """
+        self.out = out
+        self.previous = None
+
+    def frame(self, bottles, botSize, nrErrors):
+        """
+        The text to write to show a new frame.
+
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists.
+        botSize : int
+            The capacity of bottles.
+        nrErrors : int
+            The number of errors the user already made.
+
+        Returns
+        -------
+        string
+            The changed lines with the ANSI sequences to place them.
+        """
+        lines = funcs.renderBottles(bottles, botSize, nrErrors).split("\n")[:-1]
+        if self.previous is None or len(self.previous) != len(lines):
+            text = CLEAR_SCREEN + "\n".join(lines) + "\n"
+        else:
+            parts = [moveTo(row + 1) + CLEAR_LINE + line
+                     for row, (line, old) in enumerate(zip(lines, self.previous))
+                     if line != old]
+            text = "".join(parts) + moveTo(len(lines) + 1)
+        self.previous = lines
+        return text + CLEAR_BELOW
+
+    def show(self, bottles, botSize, nrErrors):
+        """
+        Writes a new frame, with a single write. Same arguments as
+        gameFunctions.showBottles.
+        """
+        out = self.out if self.out is not None else sys.stdout
+        out.write(self.frame(bottles, botSize, nrErrors))
+        out.flush()
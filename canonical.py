@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Canonical form of boards.
+
+Two boards that only differ in the order of the bottles, or in which
+symbols are used, are the same puzzle. canonicalKey renames the symbols
+to 0, 1, 2, ... and sorts the bottles so that such boards get the same
+key, which can be used to deduplicate boards or as a transposition table
+key in a search.
+
+The symbols are ordered by properties that do not depend on the names of
+the bottles or of the symbols (the heights where each symbol appears,
+refined by the bottles it shares, until no class splits). Ties that
+remain after that are resolved by individualising and refining: each
+symbol of the first tied class is in turn given a class of its own, the
+classes are refined again, and so on until every symbol has its own
+class; the smallest of the keys found is the canonical one. Symbols that
+can be swapped without changing the board give the same keys and are
+tried only once. The same puzzle always gets the same key, and two
+different puzzles never do.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+# *****************************************************
+def symbolClasses(contents):
+    """
+    Gives each symbol a class that does not depend on names
+
+    Parameters
+    ----------
+    contents : list of sequences
+        The contents of the bottles, in any order.
+
+    Returns
+    -------
+    dictionary
+        Keys are the symbols, values are ints. Symbols with equal
+        values can not be told apart by the properties used.
+
+    """
+    heights = {}
+    for content in contents:
+        for position, symbol in enumerate(content):
+            heights.setdefault(symbol, []).append(position)
+    signatures = {symbol: tuple(sorted(positions)) for symbol, positions in heights.items()}
+    return refineClasses(contents, rankValues(signatures))
+
+# *****************************************************
+def refineClasses(contents, classes):
+    """
+    Splits the classes of the symbols by the classes of the symbols they
+    share bottles with, until no class is split any more
+
+    Parameters
+    ----------
+    contents : list of sequences
+        The contents of the bottles, in any order.
+    classes : dictionary
+        Keys are the symbols, values are ints (see symbolClasses).
+
+    Returns
+    -------
+    dictionary
+        The refined classes.
+
+    """
+    count = len(set(classes.values()))
+    while count < len(classes):
+        bottleSignatures = [tuple(classes[s] for s in content) for content in contents]
+        neighbours = {symbol: [] for symbol in classes}
+        for content, signature in zip(contents, bottleSignatures):
+            for position, symbol in enumerate(content):
+                neighbours[symbol].append((position, signature))
+        signatures = {symbol: (classes[symbol], tuple(sorted(seen)))
+                      for symbol, seen in neighbours.items()}
+        classes = rankValues(signatures)
+        if len(set(classes.values())) == count:
+            break
+        count = len(set(classes.values()))
+    return classes
+
+# *****************************************************
+def rankValues(signatures):
+    """
+    Replaces the values of a dictionary by their rank among all values
+
+    Parameters
+    ----------
+    signatures : dictionary
+        Values must be comparable with each other.
+
+    Returns
+    -------
+    dictionary
+        The same keys; equal values get the same rank.
+
+    """
+    ranks = {value: rank for rank, value in enumerate(sorted(set(signatures.values())))}
+    return {key: ranks[value] for key, value in signatures.items()}
+
+# *****************************************************
+def symbolNames(contents):
+    """
+    The new name of each symbol in canonicalKey
+
+    Parameters
+    ----------
+    contents : list of tuples
+        The contents of the bottles, in any order.
+
+    Returns
+    -------
+    dictionary
+        Keys are the symbols, values are their new names (0, 1, 2, ...).
+
+    """
+    classes = symbolClasses(contents)
+    if len(set(classes.values())) == len(classes):
+        return classes
+    ordered = sorted(tuple(content) for content in contents)
+    best = None
+
+    def search(classes):
+        # Individualises each symbol of the first class with more than one,
+        # refines, and keeps the smallest key of the leaves
+        nonlocal best
+        groups = {}
+        for symbol, value in classes.items():
+            groups.setdefault(value, []).append(symbol)
+        tied = [members for value, members in sorted(groups.items()) if len(members) > 1]
+        if not tied:
+            key = sorted(tuple(classes[s] for s in content) for content in contents)
+            if best is None or key < best[0]:
+                best = (key, classes)
+            return
+        tried = []
+        for symbol in tied[0]:
+            # Swapping two symbols that leaves the board as it was gives
+            # the same leaves
+            if any(twins(ordered, symbol, other) for other in tried):
+                continue
+            tried.append(symbol)
+            search(refineClasses(contents, rankValues(
+                {other: (value, other != symbol) for other, value in classes.items()})))
+
+    search(classes)
+    return best[1]
+
+# *****************************************************
+def twins(ordered, first, second):
+    """
+    Is the board the same after swapping the symbols first and second?
+
+    Parameters
+    ----------
+    ordered : list of tuples
+        The contents of the bottles, sorted.
+    first, second :
+        Two symbols.
+
+    Returns
+    -------
+    bool
+
+    """
+    swap = {first: second, second: first}
+    return sorted(tuple(swap.get(s, s) for s in content) for content in ordered) == ordered
+
+# *****************************************************
+def canonicalKey(bottles):
+    """
+    A key that is the same for boards that only differ in the order of
+    the bottles or in the names of the symbols
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists (or RunBottle).
+
+    Returns
+    -------
+    tuple
+        A sorted tuple with one tuple of ints per bottle. The ints are
+        the new names of the symbols, from the bottom to the top.
+
+    """
+    contents = [tuple(content) for content in bottles.values()]
+    rename = symbolNames(contents)
+    return tuple(sorted(tuple(rename[s] for s in content) for content in contents))
+
+# *****************************************************
+def canonicalOrder(bottles):
+    """
+    The canonical key of a board and the bottle at each of its positions,
+    to translate moves between boards with the same key
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists (or RunBottle).
+
+    Returns
+    -------
+    key : tuple
+        As returned by canonicalKey.
+    letters : list of strings
+        The letter of the bottle of each position of key (bottles with
+        the same contents in the order of bottles).
+
+    """
+    contents = [tuple(content) for content in bottles.values()]
+    rename = symbolNames(contents)
+    renamed = sorted((tuple(rename[s] for s in content), letter)
+                     for letter, content in zip(bottles, contents))
+    return tuple(content for content, _ in renamed), [letter for _, letter in renamed]
+
+# *****************************************************
+def keyToBottles(key, letters, symbols):
+    """
+    Builds a board from a canonical key
+
+    Parameters
+    ----------
+    key : tuple
+        A key returned by canonicalKey.
+    letters : string
+        The letters that identify bottles (at least len(key)).
+    symbols : string
+        The symbols that compose the liquid in bottles.
+
+    Returns
+    -------
+    dictionary where keys are strings and values are lists.
+
+    """
+    return {letters[i]: [symbols[s] for s in content] for i, content in enumerate(key)}
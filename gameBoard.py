@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Incremental tracking of the full bottles of a game.
+
+GameBoard keeps, for each bottle, the number of boundaries between
+different symbols in its contents. A bottle is full with a same symbol
+(as in gameFunctions.full) when it has botSize elements and no boundary,
+so it is known in O(1). When some units of one symbol go from a bottle to
+another (a move, or the undo of a move) only the boundaries at the tops of
+the two bottles can change, so the set of full bottles is updated in O(1)
+per move, also when a full bottle is poured out again. The number of full
+bottles and allBottlesFull come from that set, without rescanning.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import gameFunctions as funcs
+
+# *****************************************************
+def boundaries(content):
+    """
+    The number of positions of content where the symbol differs from
+    the one below it
+    """
+    return sum(1 for i in range(1, len(content)) if content[i] != content[i - 1])
+
+# *****************************************************
+class GameBoard:
+    """
+    The bottles of a game together with the set of full bottles.
+    """
+
+    def __init__(self, bottles, botSize, expert, zobrist = None):
+        """
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists (or RunBottle). The board
+            keeps a reference to it, not a copy.
+        botSize : int
+            The capacity of bottles.
+        expert : int
+            The user's expert level.
+        zobrist : ZobristTable, optional
+            If given, the board keeps the hash of the bottles in self.hash.
+            The default is None (self.hash is None).
+        """
+        self.bottles = bottles
+        self.botSize = botSize
+        self.expert = expert
+        self.zobrist = zobrist
+        self.hash = zobrist.boardHash(bottles) if zobrist is not None else None
+        self.boundaries = {letter: boundaries(content) for letter, content in bottles.items()}
+        self.fullSet = {letter for letter in bottles if self._isFull(letter)}
+
+    def _isFull(self, letter):
+        return len(self.bottles[letter]) == self.botSize and self.boundaries[letter] == 0
+
+    @property
+    def fullBottles(self):
+        """
+        The number of bottles full with a same symbol.
+        """
+        return len(self.fullSet)
+
+    def isFull(self, letter):
+        """
+        Same result as gameFunctions.full(bottles[letter], botSize), in O(1).
+        """
+        return letter in self.fullSet
+
+    def allBottlesFull(self):
+        """
+        Same result as gameFunctions.allBottlesFull for the current
+        number of full bottles, in O(1).
+        """
+        return funcs.allBottlesFull(len(self.bottles), len(self.fullSet), self.expert)
+
+    def update(self, source, destin, transfer):
+        """
+        Updates the board after transfer units of a same symbol went from
+        the top of source to the top of destin (by doMove, or by undoing a
+        move from destin to source).
+
+        Parameters
+        ----------
+        source : string
+            The letter of the bottle the units left.
+        destin : string
+            The letter of the bottle the units went to.
+        transfer : int
+            The quantity of units.
+
+        Returns
+        -------
+        None.
+        """
+        # A bottle poured into itself moves nothing (see
+        # gameFunctions.doMove)
+        if transfer == 0 or source == destin:
+            return
+        if self.zobrist is not None:
+            self.hash = self.zobrist.updateHash(self.hash, source, destin, transfer, self.bottles)
+        destContent = self.bottles[destin]
+        sourceContent = self.bottles[source]
+        size = len(destContent)
+        symbol = destContent[size - 1]
+        if size > transfer and destContent[size - transfer - 1] != symbol:
+            self.boundaries[destin] += 1
+        if len(sourceContent) > 0 and sourceContent[len(sourceContent) - 1] != symbol:
+            self.boundaries[source] -= 1
+        for letter in (source, destin):
+            if self._isFull(letter):
+                self.fullSet.add(letter)
+            else:
+                self.fullSet.discard(letter)
+
+    def doMove(self, source, destin, rules = funcs):
+        """
+        Does a move with rules.doMove and updates the board.
+
+        Parameters
+        ----------
+        source : string
+            The letter of the source bottle.
+        destin : string
+            The letter of the destination bottle.
+        rules : module, optional
+            Where doMove comes from (gameFunctions or rleBottles).
+            The default is gameFunctions.
+
+        Returns
+        -------
+        int
+            The quantity returned by rules.doMove.
+
+        Requires:
+        --------
+            rules.moveIsPossible(botSize, source, destin, bottles)
+        """
+        transfer = rules.doMove(self.botSize, source, destin, self.bottles)
+        self.update(source, destin, transfer)
+        return transfer
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Terminal client for gameServer.py, with the same questions as assignment3.py.
+
+Usage: python3 gameClient.py --port 8765
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import json
+import socket
+
+import gameFunctions as funcs
+
+# *****************************************************
+class GameConnection:
+    """
+    A connection to gameServer.py. Can be used in a with statement.
+    """
+
+    def __init__(self, host = "127.0.0.1", port = 8765):
+        self.socket = socket.create_connection((host, port))
+        self.file = self.socket.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        try:
+            self.request("quit")
+        except (OSError, ValueError):
+            pass
+        self.file.close()
+        self.socket.close()
+
+    def request(self, op, **arguments):
+        """
+        Sends a request and waits for its answer.
+
+        Parameters
+        ----------
+        op : string
+            The operation (see gameServer).
+        **arguments :
+            The arguments of the operation.
+
+        Returns
+        -------
+        dictionary
+            The answer, None for "quit".
+
+        Raises
+        ------
+        IOError:
+            If the server answered with an error.
+        """
+        arguments["op"] = op
+        self.file.write(json.dumps(arguments, ensure_ascii = False).encode("utf-8") + b"\n")
+        self.file.flush()
+        if op == "quit":
+            return None
+        line = self.file.readline()
+        if not line:
+            raise IOError("The server closed the connection")
+        answer = json.loads(line)
+        if not answer["ok"]:
+            raise IOError(answer["error"])
+        return answer
+
+# *****************************************************
+def play(connection):
+    """
+    Plays one game with the user, as assignment3.py does
+    """
+    option = funcs.askUserFor("1 - New game \n2 - Continuation game ?\n", ['1', '2'])
+    if option == '1':
+        game = connection.request("new")
+    else:
+        fileName = input("Name of the file containing the game (JSON format)? ")
+        with open(fileName, encoding = "utf-8") as file:
+            game = connection.request("load", game = file.read())
+
+    letters = list(game["bottles"].keys())
+    funcs.showBottles(game["bottles"], game["botSize"], game["errors"])
+    source = funcs.askUserFor("Source bottle? ", letters)
+    while source != 'Z':
+        if source in ('<', '>'):
+            try:
+                connection.request("undo" if source == '<' else "redo")
+            except IOError:
+                print("Nothing to undo!" if source == '<' else "Nothing to redo!")
+        else:
+            destin = funcs.askUserFor("Destination bottle? ", letters)
+            if not connection.request("move", source = source, destin = destin)["possible"]:
+                print("Error!")
+        game = connection.request("show")
+        funcs.showBottles(game["bottles"], game["botSize"], game["errors"])
+        if game["result"] != "playing":
+            break
+        source = funcs.askUserFor("Source bottle? (Z to leave game, < undo, > redo)",
+                                  letters + ['<', '>'], 'Z')
+
+    if source == 'Z':
+        store = funcs.askUserFor("Want to store the game for future playing? (YES,NO)",
+                                 ['YES','NO'], '')
+        if store == "YES":
+            fileName = input("Name of the file where to store the game information?")
+            with open(fileName, "w", encoding = "utf-8") as file:
+                file.write(connection.request("save")["game"])
+            print("Hope to see you again soon!")
+        else:
+            print("Better luck next time!")
+    else:
+        print("Full bottles =", game["fullBottles"], "  Errors =", game["errors"])
+        print("CONGRATULATIONS!!" if game["result"] == "win" else "Better luck next time!")
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Plays a game on a gameServer.py.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    options = parser.parse_args(args)
+    with GameConnection(options.host, options.port) as connection:
+        play(connection)
+
+if __name__ == "__main__":
+    main()
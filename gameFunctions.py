@@ -8,8 +8,60 @@ Created on: December of 2023
 @author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
 """
 
-from random import randint
-from random import shuffle
+import hashlib
+import random
+import sys
+
+import saveFormat
+
+# *****************************************************
+def gameRandom(rng = None):
+    """
+    The random number generator to use when building a game
+
+    Parameters
+    ----------
+    rng : random.Random, int or None, optional
+        A generator (or the module random), used as it is, or a seed for a
+        new one. The default is None: the functions of the module random
+        (its global generator).
+
+    Returns
+    -------
+    random.Random or the module random
+        Something with the methods randint and shuffle.
+
+    """
+    if rng is None:
+        return random
+    if rng is random or isinstance(rng, random.Random):
+        return rng
+    return random.Random(rng)
+
+# *****************************************************
+def gameSeed(seed, number):
+    """
+    The seed of game number of a batch of games started with seed
+
+    Each game of the batch gets its own generator, gameRandom(gameSeed(seed,
+    number)), that does not depend on the other games, so the games are the
+    same whatever the process or the order in which they are built.
+
+    Parameters
+    ----------
+    seed : int or string
+        The seed of the whole batch.
+    number : int
+        The number of the game in the batch.
+
+    Returns
+    -------
+    int
+        A 64 bit seed.
+
+    """
+    digest = hashlib.blake2b(f"{seed}:{number}".encode("utf-8"), digest_size = 8).digest()
+    return int.from_bytes(digest, "little")
 
 # *****************************************************
 def topSymbolAndPosition(contents):
@@ -31,15 +83,46 @@ def topSymbolAndPosition(contents):
 
     """
     position = len(contents) - 1
-    symbol = "_" if contents == [] else contents[position]
+    symbol = "_" if position == -1 else contents[position]
     return symbol, position
 
 # *****************************************************
+def renderBottles(bottles, botSize, nrErrors):
+    """
+    Builds the representation of the game bottles that showBottles prints.
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists.
+    botSize : int
+        The capacity of bottles.
+    nrErrors : int
+        The number of errors the user already made.
+
+    Returns
+    -------
+    string
+        The whole frame, lines ended by a newline.
+
+    """
+    lines = [" " * 3 + "".join(letter + " " * 6 for letter in bottles.keys())]
+    contents = list(bottles.values())
+    line = botSize - 1
+    while line >= 0:
+        lines.append("".join("  |" + content[line] + "|  " if line < len(content)
+                             else "  | |  " for content in contents))
+        line -= 1
+    lines.append("NUMBER OF ERRORS: " + str(nrErrors))
+    return "\n".join(lines) + "\n"
+# *****************************************************
 def showBottles(bottles,botSize,nrErrors):
     """
     Prints in the standard output a representation of the
     game bottles.
 
+    The whole frame is built by renderBottles and written at once.
+
     Parameters
     ----------
     bottles : dictionary
@@ -54,23 +137,7 @@ def showBottles(bottles,botSize,nrErrors):
     None.
 
     """
-    print(" " * 3, end = "")
-    for letter in bottles.keys():
-        print(letter, end = " " * 6) 
-    print()
-    
-    line = botSize - 1
-    while line >= 0:
-       for content in bottles.values():
-           print(" " * 2, end = "")
-           if line < len(content):
-               print("|" + content[line] + "|", end = "")
-           else:
-               print("| |", end = "")               
-           print(" " * 2, end = "")
-       line -= 1
-       print()
-    print("NUMBER OF ERRORS:", nrErrors)
+    sys.stdout.write(renderBottles(bottles, botSize, nrErrors))
 # *****************************************************
 def allBottlesFull(nrBotts, nrBottFull, expert):
     """
@@ -139,12 +206,15 @@ def doMove(botSize, source, destin, bottles):
     Returns
     -------
     int
-        The quantity of "liquid" that was transferred from source to destin.
+        The quantity of "liquid" that was transferred from source to destin
+        (0 if they are the same bottle, which is left as it was).
 
     Requires: 
     --------
         moveIsPossible(botSize, source, destin, bottles)
     """
+    if source == destin:
+        return 0
     sourceSymb, sourceTop = topSymbolAndPosition(bottles[source])
     destSymb, destTop = topSymbolAndPosition(bottles[destin])    
     # How many there are in source to transfer?
@@ -182,7 +252,9 @@ def moveIsPossible(botSize, source, destin, bottles):
     bool
         True if the source is not empty, and, either the destination is empty
         or it has some empty position(s) and the top symbols of both bottles
-        are the same.
+        are the same. A bottle that is neither empty nor full can be poured
+        into itself: the move is possible (not an error) and changes nothing
+        (see doMove).
 
     Requires: 
     --------
@@ -196,7 +268,7 @@ def moveIsPossible(botSize, source, destin, bottles):
            (destTop == -1 or
            (destTop < botSize - 1 and sourceSymb == destSymb)) 
 # ***************************************************************
-def buildGameBottles(nrBotts, botSize, expert, letters, symbols):
+def buildGameBottles(nrBotts, botSize, expert, letters, symbols, rng = None):
     """
     Builds a dictionary of bottles, filled in a random way.
 
@@ -212,6 +284,9 @@ def buildGameBottles(nrBotts, botSize, expert, letters, symbols):
         The letters that identify bottles.
     symbols : string
         The symbols that compose the liquid in bottles.
+    rng : random.Random, int or None, optional
+        The random number generator, or its seed (see gameRandom).
+        The default is None (the global generator of the module random).
 
     Returns
     -------
@@ -228,26 +303,166 @@ def buildGameBottles(nrBotts, botSize, expert, letters, symbols):
         expert < nrBotts
 
     """   
+    rng = gameRandom(rng)
     result = {}
     howManyFullBott = nrBotts - expert
-    allSymbols = randomSymbols(botSize,howManyFullBott,symbols)
+    allSymbols = randomSymbols(botSize,howManyFullBott,symbols,rng)
     letter = 0
     indexFrom = 0
     # In this way we obtain a more balanced symbol distribution
-    indexTo = randint(botSize - expert,botSize)
+    indexTo = rng.randint(botSize - expert,botSize)
     for nr in range(nrBotts - 1):
         symbolsToPut = allSymbols[indexFrom : indexTo]
         result[letters[letter]] = symbolsToPut
         letter += 1
         indexFrom = indexTo
-        newValueTo = indexTo + randint(botSize - expert,botSize)
+        newValueTo = indexTo + rng.randint(botSize - expert,botSize)
         indexTo = min(len(allSymbols), newValueTo)
     symbolsToPut = allSymbols[indexFrom : indexTo]
     result[letters[letter]] = symbolsToPut
         
     return result
 # *****************************************************
-def randomSymbols(botSize, howMany, symbols):
+def buildSolvableGameBottles(nrBotts, botSize, expert, letters, symbols,
+                             attempts = 0, maxNodes = None, rng = None):
+    """
+    Builds a dictionary of bottles, filled in a random way, that is
+    guaranteed to have a solution.
+
+    By default the bottles are built with scrambleSolvedBottles, which
+    always gives a game with a solution. With attempts, bottles are first
+    built with buildGameBottles and kept if the solver proves they can be
+    won (more than 10 times slower with 10 bottles); if that fails
+    attempts times, they are scrambled.
+
+    Parameters
+    ----------
+    nrBotts : int
+        The number of bottles in the game.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    letters : string
+        The letters that identify bottles.
+    symbols : string
+        The symbols that compose the liquid in bottles.
+    attempts : int, optional
+        How many games built with buildGameBottles are checked. The default
+        is 0 (none: the game is scrambled). With expert 1 random games
+        almost never have a solution, so they are not checked.
+    maxNodes : int, optional
+        The maximum number of states the solver may expand for each check.
+        The default is None, which means 4 * nrBotts * botSize.
+    rng : random.Random, int or None, optional
+        The random number generator, or its seed (see gameRandom).
+        The default is None (the global generator of the module random).
+
+    Returns
+    -------
+    result : dictionary where keys are strings and values are lists.
+        As documented in the buildGameBottles function.
+
+    Requires:
+    --------
+        letters length is >= nrBotts; symbols length is >= (nrBotts - expert);
+        0 < expert < nrBotts
+
+    """
+    # Imported here because the solver module imports this one
+    import solver
+
+    rng = gameRandom(rng)
+    if expert < 2:
+        attempts = 0
+    if maxNodes is None:
+        maxNodes = 4 * nrBotts * botSize
+    for attempt in range(attempts):
+        result = buildGameBottles(nrBotts, botSize, expert, letters, symbols, rng)
+        if solver.isSolvable(result, botSize, expert, maxNodes):
+            return result
+    return scrambleSolvedBottles(nrBotts, botSize, expert, letters, symbols, rng = rng)
+# *****************************************************
+def scrambleSolvedBottles(nrBotts, botSize, expert, letters, symbols, steps = None,
+                          rng = None):
+    """
+    Builds a dictionary of bottles by undoing random moves of a solved game,
+    so the game always has a solution.
+
+    Each step takes some "liquid" from the top of a bottle and puts it on
+    another one, in a way that the move, done in the game, between the same
+    two bottles transfers exactly that quantity back.
+
+    Parameters
+    ----------
+    nrBotts : int
+        The number of bottles in the game.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    letters : string
+        The letters that identify bottles.
+    symbols : string
+        The symbols that compose the liquid in bottles.
+    steps : int, optional
+        How many moves to undo. The default is None, which means 3 * nrBotts.
+        More steps are done while some bottle is still full with a same
+        symbol.
+    rng : random.Random, int or None, optional
+        The random number generator, or its seed (see gameRandom).
+        The default is None (the global generator of the module random).
+
+    Returns
+    -------
+    result : dictionary where keys are strings and values are lists.
+        As documented in the buildGameBottles function.
+
+    Requires:
+    --------
+        letters length is >= nrBotts; symbols length is >= (nrBotts - expert);
+        0 < expert < nrBotts
+
+    """
+    rng = gameRandom(rng)
+    howManyFullBott = nrBotts - expert
+    contents = [[symbols[i]] * botSize for i in range(howManyFullBott)] + \
+               [[] for i in range(expert)]
+    rng.shuffle(contents)
+    if steps is None:
+        steps = 3 * nrBotts
+    done = 0
+    tries = 0
+    # After a while few moves can be undone, so the tries are limited
+    while tries < 10 * steps and \
+          (done < steps or any(full(content, botSize) for content in contents)):
+        tries += 1
+        fromBott = contents[rng.randint(0, nrBotts - 1)]
+        toBott = contents[rng.randint(0, nrBotts - 1)]
+        if fromBott is toBott or fromBott == [] or len(toBott) == botSize:
+            continue
+        symbol = fromBott[-1]
+        # Pouring back into a bottle that is not full would transfer the
+        # whole run of equal symbols at the top of toBott
+        if toBott != [] and toBott[-1] == symbol and len(fromBott) < botSize:
+            continue
+        run = 1
+        while run < len(fromBott) and fromBott[-1 - run] == symbol:
+            run += 1
+        most = min(run, botSize - len(toBott))
+        # fromBott must keep the same symbol at the top, or become empty
+        if most == run and run < len(fromBott):
+            most -= 1
+        if most < 1:
+            continue
+        howMany = rng.randint(1, most)
+        del fromBott[-howMany:]
+        toBott.extend([symbol] * howMany)
+        done += 1
+
+    return {letters[i]: contents[i] for i in range(nrBotts)}
+# *****************************************************
+def randomSymbols(botSize, howMany, symbols, rng = None):
     """
     Builds and returns a list with (botSize * howMany) characters of symbols
 
@@ -259,6 +474,9 @@ def randomSymbols(botSize, howMany, symbols):
         The number of different symbols to be used.
     symbols : string
         The symbols that can be used.
+    rng : random.Random, int or None, optional
+        The random number generator, or its seed (see gameRandom).
+        The default is None (the global generator of the module random).
 
     Returns
     -------
@@ -272,7 +490,7 @@ def randomSymbols(botSize, howMany, symbols):
     # botSize chars of each of the first howMany symbols
     symbolsToUse = symbols[0:howMany]
     result = [s for s in symbolsToUse for _ in range(botSize)]
-    shuffle(result)
+    gameRandom(rng).shuffle(result)
     return result
 
 # *****************************************************
@@ -308,7 +526,7 @@ def askUserFor(ask, options, end = ""):
 # ***************** NEW FUNCTIONS HERE ****************
 # *****************************************************
   
-def newGameInfo(fileName):
+def newGameInfo(fileName, solvable = False, rng = None):
     """
     Opens and reads the information in the file containing the necessary
     to initialize a new game.
@@ -317,6 +535,13 @@ def newGameInfo(fileName):
     ----------
     fileName : str
         The name of the file containing information regarding the game.
+    solvable : bool, optional
+        If True the bottles are built with buildSolvableGameBottles, so the
+        game can always be won. The default is False (buildGameBottles).
+    rng : random.Random, int or None, optional
+        The random number generator, or its seed (see gameRandom), for the
+        expertise and the bottles. The default is None (the global generator
+        of the module random).
 
     Requires
     --------
@@ -353,6 +578,31 @@ def newGameInfo(fileName):
         If the file 'fileName' does not contain the valid information,
         such as missing information or incorrect order.
     """
+    return newGameFromSettings(newGameSettings(fileName), solvable, rng)
+
+# *****************************************************
+def newGameSettings(fileName):
+    """
+    Reads the file of newGameInfo, to build many new games with
+    newGameFromSettings without reading it again.
+
+    Parameters
+    ----------
+    fileName : str
+        The name of the file containing information regarding the game
+        (see newGameInfo).
+
+    Returns
+    -------
+    tuple
+        (MAX_EXPERT, LESS_EXPERT, totalNumberOfBottles, bottleSize, letters,
+        symbols), the lines of the file.
+
+    Raises
+    ------
+    FileNotFoundError, IOError:
+        As newGameInfo.
+    """
     try:
         with open (fileName, 'r') as file:
             data = file.read().split('\n')
@@ -360,7 +610,6 @@ def newGameInfo(fileName):
             # Level of expertise
             MAX_EXPERT = int(data[0])
             LESS_EXPERT = int(data[1])
-            expertise = randint(MAX_EXPERT,LESS_EXPERT+1)
 
             # Number of bottles and their size
             totalNumberOfBottles = int(data[2])
@@ -370,20 +619,44 @@ def newGameInfo(fileName):
             letters = str(data[4])
             symbols = str(data[5])
 
-            # Dictionary containing bottle information
-            bottleInfo = buildGameBottles(totalNumberOfBottles,bottleSize,expertise,letters,symbols)
-
-            # New games start with 0 bottles full and 0 errors
-            fullBottles = 0
-            errors = 0
-
-        return expertise,totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors
+        return MAX_EXPERT, LESS_EXPERT, totalNumberOfBottles, bottleSize, letters, symbols
 
     except FileNotFoundError:
         raise FileNotFoundError(f"The file '{fileName}' does not exist. Please try again!")
     except IOError:
         raise IOError(f"The file '{fileName}' does not contain valid information about the game! Please use a file containing the necessary information in the correct order.")
 
+# *****************************************************
+def newGameFromSettings(settings, solvable = False, rng = None):
+    """
+    Builds a new game from the settings read by newGameSettings
+
+    Parameters
+    ----------
+    settings : tuple
+        As returned by newGameSettings.
+    solvable, rng :
+        As in newGameInfo.
+
+    Returns
+    -------
+    As newGameInfo.
+    """
+    MAX_EXPERT, LESS_EXPERT, totalNumberOfBottles, bottleSize, letters, symbols = settings
+    rng = gameRandom(rng)
+    expertise = rng.randint(MAX_EXPERT,LESS_EXPERT+1)
+
+    # Dictionary containing bottle information
+    build = buildSolvableGameBottles if solvable else buildGameBottles
+    bottleInfo = build(totalNumberOfBottles,bottleSize,expertise,letters,symbols,
+                       rng = rng)
+
+    # New games start with 0 bottles full and 0 errors
+    fullBottles = 0
+    errors = 0
+
+    return expertise,totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors
+
 # *****************************************************
 def oldGameInfo(fileName):
     """
@@ -405,6 +678,9 @@ def oldGameInfo(fileName):
         -> Line 4 - capacity of the bottles (int)
         -> Line 5 - dictionary containing bottle information (string)
         -> Line 6 - number of errors (int)
+    or the same information in one of the formats of the saveFormat module
+    (binary or JSON), which is found from the contents of the file.
+    Nothing in the file is ever executed.
 
     Returns
     -------
@@ -431,21 +707,8 @@ def oldGameInfo(fileName):
         such as missing information or incorrect order.
     """
     try:
-        with open(fileName, 'r') as file:
-            data = file.read().split('\n')
-
-            expertise = int(data[0])
-            totalNumberOfBottles = int(data[1])
-            fullBottles = int(data[2])
-            bottleSize = int(data[3])
-
-            bottleInfoString = data[4].replace("'", "\"")
-            bottleInfo = eval(bottleInfoString)
+        return saveFormat.loadGame(fileName)
 
-            errors = int(data[5])   
-          
-        return expertise,totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors
- 
     except FileNotFoundError:
         raise FileNotFoundError(f"The file '{fileName}' does not exist. Please try again!")
     except IOError:
@@ -456,6 +719,10 @@ def writeGameInfo(fileName,expertise,totalNumberOfBottles,fullBottles,bottleSize
     """
     Creates a file 'fileName' with the information regarding a game.
 
+    The format is chosen from the extension of fileName: binary for .wsg,
+    JSON for .json and the 6 lines read by oldGameInfo for any other
+    (see the saveFormat module).
+
     Parameters
     ----------
     fileName : string
@@ -478,10 +745,5 @@ def writeGameInfo(fileName,expertise,totalNumberOfBottles,fullBottles,bottleSize
     None.
 
     """
-    with open(fileName,'w') as file:
-        file.write(str(expertise) + '\n')
-        file.write(str(totalNumberOfBottles) + '\n')
-        file.write(str(fullBottles) + '\n')
-        file.write(str(bottleSize) + '\n')
-        file.write(str(bottleInfo) + '\n')
-        file.write(str(errors) + '\n')
+    saveFormat.saveGame(fileName, (expertise, totalNumberOfBottles, fullBottles,
+                                   bottleSize, bottleInfo, errors))
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Game server for many players at the same time.
+
+An asyncio TCP server where each connection is one player with one game
+at a time, kept in memory and played with the rules of assignment3.py
+(GameBoard for the full bottles, MoveHistory for undo and redo). The
+protocol is one JSON object per line in each direction. Requests have an
+"op" and its arguments:
+
+    {"op": "new"}                          -> a new game (from the server's file)
+    {"op": "load", "game": "<json>"}       -> a game in the JSON format of saveFormat
+    {"op": "show"}                         -> the whole game
+    {"op": "move", "source": "A", "destin": "B"}
+    {"op": "undo"} / {"op": "redo"}
+    {"op": "save"}                         -> the game in the JSON format of saveFormat
+    {"op": "quit"}                         -> closes the connection
+
+Every answer has "ok". If it is false, "error" says why and nothing changed.
+Otherwise "new", "load" and "show" answer with the whole game (see
+GameSession.state) and the others with the counters of the game, "result"
+("playing", "win" or "lose") and, for moves, "possible" and "transfer".
+A move that is not possible counts as an error, as in assignment3.py.
+The file for new games is read once, when the server starts, and new
+games are built in the default executor of the event loop, so that the
+other players are not kept waiting.
+
+Usage: python3 gameServer.py newgameinfo.txt --port 8765
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import asyncio
+import json
+
+import gameBoard
+import gameFunctions as funcs
+import moveHistory
+import saveFormat
+
+# Maximum errors before the game is lost, as in assignment3.py
+MAX_ERRORS = 3
+# Longest request accepted, in bytes
+MAX_LINE = 1 << 20
+
+# *****************************************************
+class GameSession:
+    """
+    The game of one player.
+    """
+
+    def __init__(self, infoGame):
+        """
+        Parameters
+        ----------
+        infoGame : tuple
+            (expertise, nrBotts, fullBottles, botSize, bottles, nrErrors), as
+            returned by newGameInfo or oldGameInfo. The bottles are changed.
+        """
+        self.expertise, self.nrBotts, _, self.botSize, self.bottles, self.nrErrors = infoGame
+        self.board = gameBoard.GameBoard(self.bottles, self.botSize, self.expertise)
+        self.history = moveHistory.MoveHistory()
+
+    def result(self):
+        if self.nrErrors >= MAX_ERRORS:
+            return "lose"
+        return "win" if self.board.allBottlesFull() else "playing"
+
+    def counters(self):
+        """
+        The counters of the game, sent after each move.
+        """
+        return {"ok": True, "fullBottles": self.board.fullBottles,
+                "errors": self.nrErrors, "result": self.result()}
+
+    def info(self):
+        """
+        The game as a tuple, as returned by oldGameInfo.
+        """
+        return (self.expertise, self.nrBotts, self.board.fullBottles, self.botSize,
+                self.bottles, self.nrErrors)
+
+    def state(self):
+        """
+        The whole game: the counters plus expertise, nrBotts, botSize and
+        bottles (a dictionary of lists).
+        """
+        answer = self.counters()
+        answer.update(expertise = self.expertise, nrBotts = self.nrBotts,
+                      botSize = self.botSize,
+                      bottles = {letter: list(content) for letter, content in self.bottles.items()})
+        return answer
+
+    def move(self, source, destin):
+        """
+        Plays a move, or counts an error if it is not possible.
+        """
+        if source not in self.bottles or destin not in self.bottles:
+            raise ValueError(f"There is no bottle {source if source not in self.bottles else destin}")
+        possible = funcs.moveIsPossible(self.botSize, source, destin, self.bottles)
+        transfer = 0
+        if possible:
+            transfer = self.board.doMove(source, destin)
+            self.history.recordMove(source, destin, transfer, self.bottles,
+                                    self.board.isFull(destin))
+        else:
+            self.nrErrors += 1
+            self.history.recordError()
+        answer = self.counters()
+        answer.update(possible = possible, transfer = transfer)
+        return answer
+
+    def undo(self):
+        _, self.nrErrors = self.history.undo(self.bottles, 0, self.nrErrors, self.board)
+        return self.counters()
+
+    def redo(self):
+        _, self.nrErrors = self.history.redo(self.bottles, 0, self.nrErrors, self.board)
+        return self.counters()
+
+# *****************************************************
+async def handleRequest(request, session, settings, solvable):
+    """
+    Answers one request of a player
+
+    Parameters
+    ----------
+    request : dictionary
+        The request, with an "op" (see the module documentation).
+    session : GameSession
+        The current game of the player, None if there is none yet.
+    settings : tuple
+        The information for new games (see gameFunctions.newGameSettings).
+    solvable : bool
+        Passed to newGameFromSettings.
+
+    Returns
+    -------
+    answer : dictionary
+        The answer to send.
+    session : GameSession
+        The game of the player after the request.
+
+    Raises
+    ------
+    KeyError, ValueError, IndexError, IOError:
+        If the request is not valid, with the reason.
+    """
+    op = request["op"]
+    if op == "new":
+        infoGame = await asyncio.get_running_loop().run_in_executor(
+            None, funcs.newGameFromSettings, settings, solvable)
+        session = GameSession(infoGame)
+        return session.state(), session
+    if op == "load":
+        session = GameSession(saveFormat.loadJson(request["game"]))
+        return session.state(), session
+    if session is None:
+        raise ValueError("There is no game yet")
+    if op == "show":
+        return session.state(), session
+    if op == "save":
+        return {"ok": True, "game": saveFormat.dumpJson(*session.info())}, session
+    if session.result() != "playing":
+        raise ValueError("The game is over")
+    if op == "move":
+        return session.move(str(request["source"]).upper(),
+                            str(request["destin"]).upper()), session
+    if op == "undo":
+        return session.undo(), session
+    if op == "redo":
+        return session.redo(), session
+    raise ValueError(f"Unknown op {op!r}")
+
+# *****************************************************
+async def serveClient(reader, writer, settings, solvable):
+    """
+    Plays with one connected player until the connection is closed
+    """
+    session = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                if request.get("op") == "quit":
+                    break
+                answer, session = await handleRequest(request, session, settings, solvable)
+            except (KeyError, ValueError, IndexError, TypeError, AttributeError, IOError,
+                    RecursionError) as error:
+                # RecursionError: JSON nested too deeply, in the request or
+                # in the game of a "load"
+                answer = {"ok": False, "error": str(error)}
+            writer.write(json.dumps(answer, ensure_ascii = False).encode("utf-8") + b"\n")
+            await writer.drain()
+    except (ConnectionError, ValueError):
+        # ValueError: a request longer than MAX_LINE
+        pass
+    finally:
+        writer.close()
+
+# *****************************************************
+async def startServer(fileName, host = "127.0.0.1", port = 8765, solvable = False):
+    """
+    Starts the server (it runs while the event loop runs)
+
+    Parameters
+    ----------
+    fileName : string
+        The file with the information for new games (see newGameInfo).
+    host : string, optional
+        The address to listen on. The default is "127.0.0.1".
+    port : int, optional
+        The port to listen on, 0 for any free port. The default is 8765.
+    solvable : bool, optional
+        If True new games can always be won. The default is False.
+
+    Returns
+    -------
+    asyncio.Server
+        The server; server.sockets[0].getsockname() has the actual port.
+    """
+    # Fails now, and not at the first new game, if the file is not valid
+    settings = funcs.newGameSettings(fileName)
+    return await asyncio.start_server(
+        lambda reader, writer: serveClient(reader, writer, settings, solvable),
+        host, port, limit = MAX_LINE)
+
+# *****************************************************
+async def serve(fileName, host, port, solvable):
+    server = await startServer(fileName, host, port, solvable)
+    print("Listening on", *server.sockets[0].getsockname()[:2])
+    async with server:
+        await server.serve_forever()
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Serves games to many players.")
+    parser.add_argument("fileName", help = "file with the information for new games")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--solvable", action = "store_true",
+                        help = "only new games that can be won")
+    options = parser.parse_args(args)
+    try:
+        asyncio.run(serve(options.fileName, options.host, options.port, options.solvable))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Saved games kept in a single SQLite database.
+
+Each game is one row of the table games, with the whole game in the binary
+format of saveFormat (column game) plus indexed columns to search by id,
+player, expertise and last modified time. Loading a game is a single read
+by primary key.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import sqlite3
+import time
+
+import saveFormat
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player TEXT NOT NULL DEFAULT '',
+    expertise INTEGER NOT NULL,
+    nrBotts INTEGER NOT NULL,
+    fullBottles INTEGER NOT NULL,
+    botSize INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    game BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gamesByPlayer ON games (player, modified);
+CREATE INDEX IF NOT EXISTS gamesByExpertise ON games (expertise, modified);
+CREATE INDEX IF NOT EXISTS gamesByModified ON games (modified);
+"""
+
+# Columns returned by listGames
+SUMMARY = ("id", "player", "expertise", "nrBotts", "fullBottles", "botSize", "errors", "modified")
+
+# *****************************************************
+class GameStore:
+    """
+    A database of saved games. Can be used in a with statement.
+    """
+
+    def __init__(self, fileName):
+        """
+        Parameters
+        ----------
+        fileName : string
+            The name of the database file. It is created if needed.
+        """
+        self.connection = sqlite3.connect(fileName)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def _write(self, info, player, gameId):
+        expertise, nrBotts, fullBottles, botSize, bottles, errors = info
+        row = (player, expertise, nrBotts, fullBottles, botSize, errors, time.time(),
+               saveFormat.dumpBinary(*info))
+        if gameId is None:
+            cursor = self.connection.execute(
+                "INSERT INTO games (player, expertise, nrBotts, fullBottles, botSize,"
+                " errors, modified, game) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+            return cursor.lastrowid
+        self.connection.execute(
+            "INSERT OR REPLACE INTO games (player, expertise, nrBotts, fullBottles, botSize,"
+            " errors, modified, game, id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row + (gameId,))
+        return gameId
+
+    def saveGame(self, info, player = "", gameId = None):
+        """
+        Stores a game.
+
+        Parameters
+        ----------
+        info : tuple
+            (expertise, nrBotts, fullBottles, botSize, bottles, nrErrors),
+            as returned by oldGameInfo.
+        player : string, optional
+            The name of the player. The default is "".
+        gameId : int, optional
+            The id of a stored game to replace. The default is None (new game).
+
+        Returns
+        -------
+        int
+            The id of the game.
+        """
+        with self.connection:
+            return self._write(info, player, gameId)
+
+    def saveGames(self, games):
+        """
+        Stores many games in a single transaction.
+
+        Parameters
+        ----------
+        games : iterable
+            (info, player, gameId) tuples, as the arguments of saveGame.
+
+        Returns
+        -------
+        list of ints
+            The ids of the games, in the same order.
+        """
+        with self.connection:
+            return [self._write(info, player, gameId) for info, player, gameId in games]
+
+    def loadGame(self, gameId):
+        """
+        Reads a stored game.
+
+        Returns
+        -------
+        tuple
+            As returned by oldGameInfo.
+
+        Raises
+        ------
+        KeyError:
+            If there is no game with id gameId.
+        """
+        row = self.connection.execute("SELECT game FROM games WHERE id = ?",
+                                      (gameId,)).fetchone()
+        if row is None:
+            raise KeyError(f"There is no saved game with id {gameId}")
+        return saveFormat.loadBinary(row[0])
+
+    def listGames(self, player = None, expertise = None, since = None, limit = 100):
+        """
+        The most recently modified games that match all the given criteria.
+
+        Parameters
+        ----------
+        player : string, optional
+            Only games of this player.
+        expertise : int, optional
+            Only games of this level of expertise.
+        since : float, optional
+            Only games modified at or after this time (seconds since the epoch).
+        limit : int, optional
+            The maximum number of games. The default is 100.
+
+        Returns
+        -------
+        list of dictionaries
+            One per game, with the keys in SUMMARY, newest first.
+        """
+        conditions = []
+        values = []
+        for column, operator, value in (("player", "=", player),
+                                        ("expertise", "=", expertise),
+                                        ("modified", ">=", since)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                values.append(value)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        rows = self.connection.execute(
+            f"SELECT {', '.join(SUMMARY)} FROM games{where} ORDER BY modified DESC LIMIT ?",
+            values + [limit])
+        return [dict(zip(SUMMARY, row)) for row in rows]
+
+    def deleteGame(self, gameId):
+        """
+        Removes a stored game (nothing happens if it does not exist).
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM games WHERE id = ?", (gameId,))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Headless version of the game loop in assignment3.py, for running many games
+without a terminal.
+
+The rules are the same: a move that is not possible counts as an error, the
+game ends after 3 errors, the full bottles are tracked by a GameBoard and the
+game is won when allBottlesFull.
+Moves are chosen by a policy object, with a method
+
+    chooseMove(bottles, botSize, nrErrors)
+
+that returns a (source, destin) pair of letters, or None to leave the game
+(like answering 'Z' in assignment3.py).
+
+Usage: python3 headlessGame.py newgameinfo.txt 1000 --policy solver
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import gameBoard
+import gameFunctions as funcs
+import moveIndex
+import solver
+import zobrist
+
+# Maximum errors before the game is lost, as in assignment3.py
+MAX_ERRORS = 3
+
+# *****************************************************
+class RandomPolicy:
+    """
+    Chooses any two different bottles, so it also makes errors.
+    """
+
+    def chooseMove(self, bottles, botSize, nrErrors):
+        return tuple(random.sample(list(bottles.keys()), 2))
+
+# *****************************************************
+class LegalRandomPolicy:
+    """
+    Chooses a random possible move, and leaves when there is none.
+    The possible moves come from a MoveIndex, refreshed with the two bottles
+    of the previous move.
+    """
+
+    def __init__(self):
+        self.index = None
+        self.lastMove = ()
+
+    def startGame(self, infoGame):
+        self.index = moveIndex.MoveIndex(infoGame[4], infoGame[3])
+        self.lastMove = ()
+
+    def chooseMove(self, bottles, botSize, nrErrors):
+        if self.index is None or self.index.bottles is not bottles:
+            self.startGame((None, None, None, botSize, bottles, nrErrors))
+        for letter in self.lastMove:
+            self.index.refresh(letter)
+        moves = self.index.legalMoves()
+        if not moves:
+            return None
+        self.lastMove = random.choice(moves)
+        return self.lastMove
+
+# *****************************************************
+class SolverPolicy:
+    """
+    Plays the moves found by solver.solve, and leaves if there is no solution.
+    """
+
+    def __init__(self, maxNodes = None):
+        self.maxNodes = maxNodes
+        self.expert = 0
+        self.plan = None
+
+    def startGame(self, infoGame):
+        """
+        Called before the first move with the game information tuple.
+        """
+        self.expert = infoGame[0]
+        self.plan = None
+
+    def chooseMove(self, bottles, botSize, nrErrors):
+        if self.plan is None:
+            try:
+                moves, nodes = solver.solve(bottles, botSize, self.expert, self.maxNodes)
+            except solver.SearchLimitExceeded:
+                moves = None
+            self.plan = list(reversed(moves)) if moves is not None else []
+        return self.plan.pop() if self.plan else None
+
+# Policies available from the command line
+POLICIES = {"random": RandomPolicy, "legal": LegalRandomPolicy, "solver": SolverPolicy}
+
+# *****************************************************
+def playGame(infoGame, policy, maxTurns = 10000):
+    """
+    Plays one game with the rules of assignment3.py, without input or output
+
+    Parameters
+    ----------
+    infoGame : tuple
+        (expertise, nrBotts, fullBottles, botSize, bottles, nrErrors), as
+        returned by newGameInfo or oldGameInfo. The bottles are changed.
+    policy : object
+        Chooses the moves (see the module documentation). If it has a
+        startGame method, it is called first with infoGame.
+    maxTurns : int, optional
+        Maximum number of turns before the game is stopped. The default is 10000.
+
+    Returns
+    -------
+    dictionary
+        Summary of the game: result ("win", "lose", "quit" or "limit"),
+        turns, moves, errors, fullBottles, units (of "liquid" transferred),
+        repeats (moves that lead to a board already seen in the game, by
+        its Zobrist hash), expertise, nrBotts and botSize.
+
+    """
+    expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = infoGame
+    board = gameBoard.GameBoard(bottles, botSize, expertise, zobrist.ZobristTable())
+    fullBottles = board.fullBottles
+    seen = {board.hash}
+    if hasattr(policy, "startGame"):
+        policy.startGame(infoGame)
+
+    endGame = False
+    turns = 0
+    moves = 0
+    units = 0
+    repeats = 0
+    result = "limit"
+    while not endGame and turns < maxTurns:
+        choice = policy.chooseMove(bottles, botSize, nrErrors)
+        if choice is None:
+            result = "quit"
+            break
+        turns += 1
+        source, destin = choice
+        if funcs.moveIsPossible(botSize, source, destin, bottles):
+            units += board.doMove(source, destin)
+            moves += 1
+            fullBottles = board.fullBottles
+            if board.hash in seen:
+                repeats += 1
+            seen.add(board.hash)
+        else:
+            nrErrors += 1
+        endGame = board.allBottlesFull() or \
+                  nrErrors == MAX_ERRORS
+    if endGame:
+        result = "lose" if nrErrors >= MAX_ERRORS else "win"
+
+    return {"result": result, "turns": turns, "moves": moves, "errors": nrErrors,
+            "fullBottles": fullBottles, "units": units, "repeats": repeats,
+            "expertise": expertise, "nrBotts": nrBotts, "botSize": botSize}
+
+# *****************************************************
+def runGames(fileName, policy, nrGames, solvable = False, maxTurns = 10000, seed = None):
+    """
+    Plays nrGames new games, one after the other
+
+    Parameters
+    ----------
+    fileName : string
+        The file with the information for new games (see newGameInfo).
+    policy : object
+        Chooses the moves of every game.
+    nrGames : int
+        How many games to play.
+    solvable : bool, optional
+        Passed to newGameInfo. The default is False.
+    maxTurns : int, optional
+        Passed to playGame. The default is 10000.
+    seed : int, optional
+        If given, game number i is built with its own random generator,
+        gameFunctions.gameSeed(seed, i), so the games are the same whatever
+        the policy. The default is None (the global generator).
+
+    Yields
+    ------
+    dictionary
+        The summary of each game, as returned by playGame.
+
+    """
+    for number in range(nrGames):
+        rng = None if seed is None else funcs.gameSeed(seed, number)
+        yield playGame(funcs.newGameInfo(fileName, solvable, rng), policy, maxTurns)
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Plays games without a terminal.")
+    parser.add_argument("fileName", help = "file with the information for new games")
+    parser.add_argument("nrGames", type = int)
+    parser.add_argument("--policy", choices = sorted(POLICIES), default = "legal")
+    parser.add_argument("--solvable", action = "store_true",
+                        help = "only play games that can be won")
+    parser.add_argument("--seed", type = int, default = None)
+    parser.add_argument("--out", default = None,
+                        help = "file for the summaries, one JSON object per line "
+                               "(default: standard output)")
+    options = parser.parse_args(args)
+
+    random.seed(options.seed)
+    policy = POLICIES[options.policy]()
+    out = open(options.out, "w") if options.out else sys.stdout
+    results = {}
+    start = time.perf_counter()
+    try:
+        for summary in runGames(options.fileName, policy, options.nrGames, options.solvable,
+                                seed = options.seed):
+            out.write(json.dumps(summary) + "\n")
+            results[summary["result"]] = results.get(summary["result"], 0) + 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{options.nrGames} games in {elapsed:.2f} s "
+          f"({options.nrGames / elapsed * 3600:.0f} games/hour): {results}", file = sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Undo and redo of moves and errors.
+
+Only what doMove already knows is kept for each move: the source and
+destination bottles, the symbol and the quantity transferred, plus whether
+the move filled the destination bottle (so fullBottles was incremented).
+Undoing or redoing a move costs O(quantity transferred), without copies of
+the bottles. Errors are kept too, so nrErrors is also rolled back.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+ERROR = ("error",)
+
+# *****************************************************
+class MoveHistory:
+    """
+    The moves and errors of a game, with the position of the next redo.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.position = 0
+
+    def canUndo(self):
+        return self.position > 0
+
+    def canRedo(self):
+        return self.position < len(self.entries)
+
+    def _add(self, entry):
+        # A new move or error makes the undone ones impossible to redo
+        del self.entries[self.position:]
+        self.entries.append(entry)
+        self.position += 1
+
+    def recordMove(self, source, destin, transfer, bottles, filled):
+        """
+        Records a move just done with doMove.
+
+        Parameters
+        ----------
+        source : string
+            The letter of the source bottle.
+        destin : string
+            The letter of the destination bottle.
+        transfer : int
+            The quantity returned by doMove.
+        bottles : dictionary
+            The bottles, already after the move.
+        filled : bool
+            True if fullBottles was incremented because of the move.
+
+        Returns
+        -------
+        None.
+        """
+        symbol = bottles[destin][len(bottles[destin]) - 1]
+        self._add(("move", source, destin, symbol, transfer, int(filled)))
+
+    def recordError(self):
+        """
+        Records an error (a move that was not possible).
+        """
+        self._add(ERROR)
+
+    def undo(self, bottles, fullBottles, nrErrors, board = None):
+        """
+        Undoes the last move or error that was not undone yet.
+
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists (or RunBottle). Changed in place.
+        fullBottles : int
+            The number of full bottles.
+        nrErrors : int
+            The number of errors.
+        board : GameBoard, optional
+            The board of bottles, updated too. If given, fullBottles is
+            taken from it. The default is None.
+
+        Returns
+        -------
+        fullBottles : int
+            The number of full bottles after the undo.
+        nrErrors : int
+            The number of errors after the undo.
+
+        Raises
+        ------
+        IndexError:
+            If there is nothing to undo.
+        """
+        if not self.canUndo():
+            raise IndexError("There is nothing to undo")
+        self.position -= 1
+        entry = self.entries[self.position]
+        if entry is ERROR:
+            return fullBottles, nrErrors - 1
+        _, source, destin, symbol, transfer, filled = entry
+        sourceContent = bottles[source]
+        destContent = bottles[destin]
+        for _ in range(transfer):
+            destContent.pop()
+            sourceContent.append(symbol)
+        if board is not None:
+            board.update(destin, source, transfer)
+            return board.fullBottles, nrErrors
+        return fullBottles - filled, nrErrors
+
+    def redo(self, bottles, fullBottles, nrErrors, board = None):
+        """
+        Does again the last move or error undone. Same parameters and
+        results as undo.
+
+        Raises
+        ------
+        IndexError:
+            If there is nothing to redo.
+        """
+        if not self.canRedo():
+            raise IndexError("There is nothing to redo")
+        entry = self.entries[self.position]
+        self.position += 1
+        if entry is ERROR:
+            return fullBottles, nrErrors + 1
+        _, source, destin, symbol, transfer, filled = entry
+        sourceContent = bottles[source]
+        destContent = bottles[destin]
+        for _ in range(transfer):
+            sourceContent.pop()
+            destContent.append(symbol)
+        if board is not None:
+            board.update(source, destin, transfer)
+            return board.fullBottles, nrErrors
+        return fullBottles + filled, nrErrors
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Index of the possible moves of a game.
+
+For each top symbol, MoveIndex keeps the bottles that show it at the top
+and, among those, the ones that still have room; it also keeps the empty
+bottles. A move from source to destin is possible (as in moveIsPossible)
+when source is not empty and destin is either empty or has room and the
+same top symbol, so the destinations of a source are found without looking
+at the other bottles, and all the possible moves are listed in time
+proportional to their number (plus the number of different top symbols).
+As in gameFunctions, a bottle that is neither empty nor full can be poured
+into itself; destinations and legalMoves leave those moves out, since they
+change nothing.
+
+After a move only the two bottles involved change, so keeping the index up
+to date costs O(1) per move: MoveIndex.doMove does it, and refresh must be
+called for the bottles changed by any other means (undo, for instance).
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import gameFunctions as funcs
+
+# *****************************************************
+class MoveIndex:
+    """
+    The possible moves of a dictionary of bottles, kept up to date.
+    """
+
+    def __init__(self, bottles, botSize):
+        """
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists (or RunBottle). The index
+            keeps a reference to it, not a copy.
+        botSize : int
+            The capacity of bottles.
+        """
+        self.bottles = bottles
+        self.botSize = botSize
+        # Letter -> (top symbol, has room), for the bottles that are not empty
+        self.topOf = {}
+        # Top symbol -> letters of the bottles with that top symbol
+        self.byTop = {}
+        # Top symbol -> letters of the bottles with that top symbol and room
+        self.withRoom = {}
+        self.empty = set()
+        for letter in bottles:
+            self.refresh(letter)
+
+    def _remove(self, letter):
+        if letter in self.empty:
+            self.empty.discard(letter)
+            return
+        top = self.topOf.pop(letter, None)
+        if top is None:
+            return
+        symbol, room = top
+        letters = self.byTop[symbol]
+        letters.discard(letter)
+        if not letters:
+            del self.byTop[symbol]
+        if room:
+            letters = self.withRoom[symbol]
+            letters.discard(letter)
+            if not letters:
+                del self.withRoom[symbol]
+
+    def refresh(self, letter):
+        """
+        Updates the index after the contents of bottle letter changed. O(1).
+        """
+        self._remove(letter)
+        content = self.bottles[letter]
+        size = len(content)
+        if size == 0:
+            self.empty.add(letter)
+            return
+        symbol = content[size - 1]
+        room = size < self.botSize
+        self.topOf[letter] = (symbol, room)
+        self.byTop.setdefault(symbol, set()).add(letter)
+        if room:
+            self.withRoom.setdefault(symbol, set()).add(letter)
+
+    def moveIsPossible(self, source, destin):
+        """
+        Same result as gameFunctions.moveIsPossible, in O(1).
+        """
+        if source not in self.topOf:
+            return False
+        if destin in self.empty:
+            return True
+        top = self.topOf.get(destin)
+        return top is not None and top[1] and top[0] == self.topOf[source][0]
+
+    def destinations(self, source):
+        """
+        The letters of the bottles where the top of source can be poured.
+
+        Parameters
+        ----------
+        source : string
+            The letter of the source bottle.
+
+        Returns
+        -------
+        list of strings
+            Empty if source is empty. source itself is not included.
+        """
+        top = self.topOf.get(source)
+        if top is None:
+            return []
+        result = [destin for destin in self.withRoom.get(top[0], ()) if destin != source]
+        result.extend(self.empty)
+        return result
+
+    def legalMoves(self):
+        """
+        All the possible moves, as (source, destin) pairs, but the ones
+        from a bottle into itself.
+
+        Returns
+        -------
+        list of tuples
+            In no particular order.
+        """
+        moves = []
+        for symbol, destins in self.withRoom.items():
+            sources = self.byTop[symbol]
+            if len(sources) == 1 and len(destins) == 1:
+                # The only bottle with this top can not pour into itself
+                continue
+            moves.extend((source, destin) for source in sources
+                         for destin in destins if source != destin)
+        if self.empty:
+            moves.extend((source, destin) for source in self.topOf for destin in self.empty)
+        return moves
+
+    def hasMove(self):
+        """
+        Is there any possible move? O(number of different top symbols).
+        """
+        if self.empty:
+            return bool(self.topOf)
+        return any(len(self.byTop[symbol]) > 1 for symbol in self.withRoom)
+
+    def doMove(self, source, destin, rules = funcs):
+        """
+        Does a move with rules.doMove and updates the index.
+
+        Parameters
+        ----------
+        source : string
+            The letter of the source bottle.
+        destin : string
+            The letter of the destination bottle.
+        rules : module, optional
+            Where doMove comes from (gameFunctions or rleBottles).
+            The default is gameFunctions.
+
+        Returns
+        -------
+        int
+            The quantity returned by rules.doMove.
+
+        Requires:
+        --------
+            self.moveIsPossible(source, destin)
+        """
+        transfer = rules.doMove(self.botSize, source, destin, self.bottles)
+        self.refresh(source)
+        self.refresh(destin)
+        return transfer
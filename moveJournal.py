@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Append-only journal of a game.
+
+The journal is a text file with one record per line:
+    -> "S <game>" - a snapshot of the game, in the JSON format of saveFormat
+    -> "M <source> <destin> <transfer>" - a move done with doMove
+       (fields separated by tabs)
+    -> "E" - an error (a move that was not possible)
+    -> "U" / "R" - an undo / redo of the previous move or error (see moveHistory)
+
+Every record is appended and flushed as soon as it happens, so saving is
+O(1) and a crashed session loses nothing. loadJournal rebuilds the game
+from the last snapshot and the records after it; only the end of the file
+has to be read to find that snapshot.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+
+import gameBoard
+import gameFunctions as funcs
+import moveHistory
+import saveFormat
+
+# Bytes read at a time when looking for the last snapshot
+CHUNK = 1 << 16
+
+# *****************************************************
+class JournalError(IOError):
+    """
+    Raised when a journal can not be replayed.
+    """
+
+# *****************************************************
+class MoveJournal:
+    """
+    Appends the records of a game to a journal file.
+    """
+
+    def __init__(self, fileName, sync = False):
+        """
+        Parameters
+        ----------
+        fileName : string
+            The journal file. Records are added at its end.
+        sync : bool, optional
+            If True every record is also forced to the disk (os.fsync).
+            The default is False (records are flushed to the system).
+        """
+        removePartialRecord(fileName)
+        self.file = open(fileName, "a", encoding = "utf-8")
+        self.sync = sync
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def _append(self, line):
+        self.file.write(line + "\n")
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def snapshot(self, info):
+        """
+        Appends a snapshot of the whole game, a tuple as returned by oldGameInfo.
+        """
+        self._append("S " + saveFormat.dumpJson(*info))
+
+    def recordMove(self, source, destin, transfer):
+        """
+        Appends a move, with the quantity returned by doMove.
+        """
+        self._append(f"M {source}\t{destin}\t{transfer}")
+
+    def recordError(self):
+        """
+        Appends an error.
+        """
+        self._append("E")
+
+    def recordUndo(self):
+        """
+        Appends an undo.
+        """
+        self._append("U")
+
+    def recordRedo(self):
+        """
+        Appends a redo.
+        """
+        self._append("R")
+
+# *****************************************************
+def removePartialRecord(fileName):
+    """
+    Removes from the end of a journal a record without its newline, that
+    is, one that was being written when a session crashed
+
+    Parameters
+    ----------
+    fileName : string
+        The journal file. Nothing is done if it does not exist.
+
+    Returns
+    -------
+    None.
+
+    """
+    if not os.path.exists(fileName):
+        return
+    with open(fileName, "r+b") as file:
+        size = file.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            start = max(0, position - CHUNK)
+            file.seek(start)
+            found = file.read(position - start).rfind(b"\n")
+            if found >= 0:
+                file.truncate(start + found + 1)
+                return
+            position = start
+        file.truncate(0)
+
+# *****************************************************
+def lastSnapshotOffset(file, end = None):
+    """
+    The position of the last snapshot record of an open journal
+
+    Parameters
+    ----------
+    file : binary file
+        The journal, open for reading.
+    end : int, optional
+        Only snapshots that start before this offset are considered.
+        The default is None (the end of the file).
+
+    Returns
+    -------
+    int
+        The offset of the line with the last snapshot.
+
+    Raises
+    ------
+    JournalError:
+        If the journal has no snapshot.
+    """
+    if end is None:
+        end = file.seek(0, os.SEEK_END)
+    position = end
+    tail = b""
+    while position > 0:
+        start = max(0, position - CHUNK)
+        file.seek(start)
+        tail = file.read(position - start) + tail
+        position = start
+        found = tail.rfind(b"\nS ")
+        if found >= 0:
+            return start + found + 1
+    if tail.startswith(b"S "):
+        return 0
+    raise JournalError("The journal has no snapshot of the game")
+
+# *****************************************************
+def loadJournal(fileName):
+    """
+    Rebuilds a game from its journal
+
+    Parameters
+    ----------
+    fileName : string
+        The journal file.
+
+    Returns
+    -------
+    tuple
+        (expertise, nrBotts, fullBottles, botSize, bottles, nrErrors), as
+        returned by oldGameInfo, after all the records of the journal.
+
+    Raises
+    ------
+    FileNotFoundError:
+        If the file 'fileName' does not exist.
+    JournalError:
+        If the journal has no snapshot or a move that can not be replayed.
+    """
+    with open(fileName, "rb") as file:
+        offset = lastSnapshotOffset(file)
+        file.seek(offset)
+        lines = file.read().decode("utf-8").split("\n")
+        # A snapshot that was not completely written (the session crashed
+        # while writing it) is ignored, and the previous one is used
+        while len(lines) == 1 and offset > 0:
+            offset = lastSnapshotOffset(file, offset - 1)
+            file.seek(offset)
+            lines = file.read().decode("utf-8").split("\n")
+    # The last line is either empty or a record that was not completely
+    # written, so it is ignored
+    lines.pop()
+    if not lines:
+        raise JournalError("The journal has no complete snapshot of the game")
+    expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = \
+        saveFormat.loadJson(lines[0][2:])
+    board = gameBoard.GameBoard(bottles, botSize, expertise)
+    fullBottles = board.fullBottles
+    history = moveHistory.MoveHistory()
+    for line in lines[1:]:
+        if line == "E":
+            nrErrors += 1
+            history.recordError()
+        elif line in ("U", "R"):
+            replay = history.undo if line == "U" else history.redo
+            try:
+                fullBottles, nrErrors = replay(bottles, fullBottles, nrErrors, board)
+            except IndexError as error:
+                raise JournalError(f"Record {line!r} with nothing to undo or redo") from error
+        elif line.startswith("M "):
+            try:
+                source, destin, transfer = line[2:].split("\t")
+                transfer = int(transfer)
+            except ValueError as error:
+                raise JournalError(f"Malformed record {line!r}") from error
+            if source not in bottles or destin not in bottles or \
+               not funcs.moveIsPossible(botSize, source, destin, bottles) or \
+               board.doMove(source, destin) != transfer:
+                raise JournalError(f"The move {source} -> {destin} can not be replayed")
+            fullBottles = board.fullBottles
+            history.recordMove(source, destin, transfer, bottles, board.isFull(destin))
+        else:
+            raise JournalError(f"Unknown record {line!r}")
+    return expertise, nrBotts, fullBottles, botSize, bottles, nrErrors
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Solutions with the least number of moves, by iterative-deepening A* (IDA*).
+
+The bottles are kept as runs of equal symbols (see solver.runsOf), in the
+order of their letters. Two lower bounds of the number of moves still
+needed can be used:
+
+    -> "boundaries": the number of boundaries between different symbols
+       inside the bottles, since a move removes at most one (when the whole
+       top run of the source goes onto the same symbol or into an empty
+       bottle, the boundary below it disappears)
+    -> "runs": the number of runs minus the number of symbols, since only a
+       run poured whole onto the same symbol joins two runs; it can be made
+       larger by one for each symbol more than the bottles that are not
+       empty (a bottle must be used for each of them)
+
+Both never overestimate the moves needed, so the first solution found is
+one of the shortest. Memory is bounded: besides the current path, only a
+table of at most tableSize states (seen in the current iteration) is kept.
+
+Usage: python3 optimalSolver.py midgame.txt --heuristic runs
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import math
+import time
+
+import gameFunctions as funcs
+import searchRules
+import solver
+
+# *****************************************************
+def boundaryBound(board, goal):
+    """
+    The number of boundaries between different symbols inside the bottles
+
+    Parameters
+    ----------
+    board : tuple
+        One tuple of runs (see solver.runsOf) per bottle.
+    goal : int
+        The number of bottles that must be full at the end.
+
+    Returns
+    -------
+    int
+        A lower bound of the number of moves needed to win.
+
+    """
+    return sum(len(runs) - 1 for runs in board if runs)
+
+# *****************************************************
+def runBound(board, goal):
+    """
+    The number of runs minus the number of runs at the end of the game,
+    with each symbol that does not have its own bottle yet counted as a run
+
+    Parameters
+    ----------
+    board : tuple
+        One tuple of runs (see solver.runsOf) per bottle.
+    goal : int
+        The number of bottles that must be full at the end (one per symbol).
+
+    Returns
+    -------
+    int
+        A lower bound of the number of moves needed to win.
+
+    """
+    runs = 0
+    used = 0
+    for bottle in board:
+        if bottle:
+            runs += len(bottle)
+            used += 1
+    return runs - min(used, goal)
+
+HEURISTICS = {"boundaries": boundaryBound, "runs": runBound}
+
+# *****************************************************
+def optimalSolution(bottles, botSize, expert, heuristic = "runs", maxNodes = None,
+                    timeLimit = None, tableSize = 1 << 18, pruning = (), ordering = ()):
+    """
+    Searches for a shortest sequence of moves that wins the game
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists. It is not modified.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    heuristic : string, optional
+        The lower bound to use, a key of HEURISTICS. The default is "runs".
+    maxNodes : int, optional
+        The maximum number of states to expand. The default is None (no limit).
+    timeLimit : float, optional
+        The maximum time for the search, in seconds. The default is None (no limit).
+    tableSize : int, optional
+        The maximum number of states remembered in each iteration. The
+        default is 2 ** 18.
+    pruning : iterable of strings, optional
+        The names of the pruning rules to use (keys of
+        searchRules.PRUNING_RULES), None for all of them. The default is
+        () (none: the table of states already leaves out what they prune).
+    ordering : iterable of strings, optional
+        The names of the ordering rules to use among the moves with the
+        same bound, the first one the most important (keys of
+        searchRules.ORDERING_RULES), None for all of them. The default is
+        () (none).
+
+    Returns
+    -------
+    moves : list of tuples or None
+        The (source, destin) pairs of a shortest winning sequence. None if
+        the game can not be won.
+    nodes : int
+        The number of states expanded by the search (in all iterations).
+
+    Raises
+    ------
+    SearchLimitExceeded:
+        If more than maxNodes states or timeLimit seconds were needed.
+    ValueError:
+        If a rule is not known.
+
+    """
+    pruners = searchRules.ruleFunctions(pruning, searchRules.PRUNING_RULES)
+    orderers = searchRules.ruleFunctions(ordering, searchRules.ORDERING_RULES)
+    deadline = None if timeLimit is None else time.perf_counter() + timeLimit
+    bound = HEURISTICS[heuristic]
+    letters = list(bottles.keys())
+    goal = len(letters) - expert
+    start = tuple(solver.runsOf(content) for content in bottles.values())
+    path = []
+    nodes = 0
+
+    def won(board):
+        return solver.nrComplete(board, botSize) == goal
+
+    def children(board, previous):
+        # The boards after each possible move that is not pruned, without
+        # repeated states (moves into different empty bottles give the
+        # same state), with the keys to order them
+        lengths = [sum(count for _, count in runs) for runs in board]
+        result = {}
+        for source, sourceRuns in enumerate(board):
+            if not sourceRuns:
+                continue
+            for destin, destRuns in enumerate(board):
+                if destin == source or lengths[destin] == botSize or \
+                   (destRuns and destRuns[-1][0] != sourceRuns[-1][0]) or \
+                   any(prune(botSize, board, lengths, source, destin, previous)
+                       for prune in pruners):
+                    continue
+                child = solver.pourRuns(botSize, board, source, destin, keepOrder = True)
+                key = tuple(sorted(child))
+                if key not in result:
+                    order = (bound(child, goal),) + \
+                            tuple(rule(botSize, board, lengths, source, destin)
+                                  for rule in orderers)
+                    transfer = min(sourceRuns[-1][1], botSize - lengths[destin])
+                    result[key] = (order, (source, destin, transfer), child)
+        return result
+
+    def search(board, key, previous, cost, limit, onPath, table):
+        # Depth-first search of the states with cost + bound <= limit.
+        # Returns True if a solution was found, or the smallest
+        # cost + bound above limit
+        nonlocal nodes
+        nodes += 1
+        if maxNodes is not None and nodes > maxNodes:
+            raise solver.SearchLimitExceeded(f"No solution found in {maxNodes} nodes")
+        if deadline is not None and nodes % solver.CHECK_TIME_EVERY == 0 and \
+           time.perf_counter() > deadline:
+            raise solver.SearchLimitExceeded(f"No solution found in {timeLimit} s")
+        smallest = math.inf
+        onPath.add(key)
+        ordered = sorted(children(board, previous).items(), key = lambda item: item[1][0])
+        for childKey, (order, move, child) in ordered:
+            total = cost + 1 + order[0]
+            if total > limit:
+                smallest = min(smallest, total)
+                continue
+            if childKey in onPath or table.get(childKey, math.inf) <= cost + 1:
+                continue
+            if len(table) < tableSize:
+                table[childKey] = cost + 1
+            path.append((letters[move[0]], letters[move[1]]))
+            if won(child):
+                return True
+            found = search(child, childKey, move, cost + 1, limit, onPath, table)
+            if found is True:
+                return True
+            smallest = min(smallest, found)
+            path.pop()
+        onPath.discard(key)
+        return smallest
+
+    if won(start):
+        return [], 0
+    limit = bound(start, goal)
+    while True:
+        found = search(start, tuple(sorted(start)), None, 0, limit, set(), {})
+        if found is True:
+            return path, nodes
+        if found == math.inf:
+            return None, nodes
+        limit = found
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Finds shortest solutions of games.")
+    parser.add_argument("files", nargs = "+", help = "saved games (see oldGameInfo)")
+    parser.add_argument("--heuristic", choices = sorted(HEURISTICS), default = "runs")
+    parser.add_argument("--timeout", type = float, default = None,
+                        help = "seconds for each game (default: no limit)")
+    parser.add_argument("--max-nodes", type = int, default = None)
+    parser.add_argument("--pruning", nargs = "*", default = [],
+                        choices = sorted(searchRules.PRUNING_RULES), help = "pruning rules to use")
+    parser.add_argument("--ordering", nargs = "*", default = [],
+                        choices = sorted(searchRules.ORDERING_RULES), help = "ordering rules to use")
+    parser.add_argument("--moves", action = "store_true", help = "also print the moves")
+    options = parser.parse_args(args)
+    for fileName in options.files:
+        expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = funcs.oldGameInfo(fileName)
+        start = time.perf_counter()
+        try:
+            moves, nodes = optimalSolution(bottles, botSize, expertise, options.heuristic,
+                                           options.max_nodes, options.timeout,
+                                           pruning = options.pruning, ordering = options.ordering)
+            length = "no solution" if moves is None else f"{len(moves)} moves"
+        except solver.SearchLimitExceeded as error:
+            moves, nodes, length = None, options.max_nodes, str(error)
+        elapsed = time.perf_counter() - start
+        nodesText = "" if nodes is None else \
+                    f", {nodes} nodes, {nodes / max(elapsed, 1e-9):.0f} nodes/s"
+        print(f"{fileName}: {length}{nodesText}, {elapsed:.2f} s")
+        if options.moves and moves:
+            print(" ".join(f"{source}>{destin}" for source, destin in moves))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Compact representation of the game bottles.
+
+A board with nrBotts bottles of capacity botSize is kept in a single
+bytearray with nrBotts * (botSize + 1) bytes. Each bottle takes a block
+of (botSize + 1) bytes: the first one is the number of symbols in the
+bottle and the remaining botSize are the slots, from the bottom to the
+top. A slot holds 0 if it is empty, or (i + 1) for the i-th symbol of
+the symbols table.
+
+Many states are kept in a NumPy array of uint8 with one packed state per
+row (see stackStates), so that the searches that expand many states at a
+time play a move in each of them at once (packedDoMoves), and are stored
+with compactStates, with two slots per byte and without the lengths. On
+10 bottles of capacity 8 and 64 (see benchmarks/benchPackedBoard.py) a
+compact state takes 14 to 18 times less memory than the dictionary of
+lists, and packedDoMoves plays a move about 10 times faster than
+moveIsPossible and doMove of gameFunctions. One move at a time, with
+packedMoveIsPossible and packedDoMove, is about as fast as gameFunctions,
+since then the time is mostly the Python call itself.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import numpy as np
+
+# The one byte string of each code, to avoid building it on every move
+_CODES = [bytes([code]) for code in range(256)]
+
+# *****************************************************
+def packBottles(bottles, botSize, symbols = None):
+    """
+    Builds the packed state that corresponds to a dictionary of bottles
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists.
+    botSize : int
+        The capacity of bottles.
+    symbols : string, optional
+        The symbols table. The default is None, in which case the symbols
+        found in bottles, sorted, are used.
+
+    Returns
+    -------
+    state : bytearray
+        The packed contents of the bottles, in key order.
+    letters : string
+        The letters that identify the bottles, in the order of state.
+    symbols : string
+        The symbols table used to encode the contents.
+
+    Requires:
+    --------
+        botSize <= 255; at most 255 different symbols.
+
+    """
+    if symbols is None:
+        symbols = "".join(sorted({s for content in bottles.values() for s in content}))
+    codes = {symbol: code + 1 for code, symbol in enumerate(symbols)}
+    letters = "".join(bottles.keys())
+    state = bytearray(len(letters) * (botSize + 1))
+    base = 0
+    for content in bottles.values():
+        state[base] = len(content)
+        state[base + 1 : base + 1 + len(content)] = bytes(codes[s] for s in content)
+        base += botSize + 1
+    return state, letters, symbols
+
+# *****************************************************
+def unpackBottles(state, botSize, letters, symbols):
+    """
+    Builds the dictionary of bottles that corresponds to a packed state
+
+    Parameters
+    ----------
+    state : bytes or bytearray
+        A packed state, as returned by packBottles.
+    botSize : int
+        The capacity of bottles.
+    letters : string
+        The letters that identify the bottles.
+    symbols : string
+        The symbols table used to encode the contents.
+
+    Returns
+    -------
+    result : dictionary where keys are strings and values are lists.
+
+    """
+    result = {}
+    base = 0
+    for letter in letters:
+        length = state[base]
+        result[letter] = [symbols[code - 1] for code in state[base + 1 : base + 1 + length]]
+        base += botSize + 1
+    return result
+
+# *****************************************************
+def packedTopSymbolAndPosition(botSize, bottle, state):
+    """
+    The symbol code and position of the top of a packed bottle
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    bottle : int
+        The index of the bottle in the state.
+    state : bytes or bytearray
+        A packed state.
+
+    Returns
+    -------
+    code : int
+        The code at the last position. 0 if the bottle is empty.
+    position : int
+        The index of the last position. -1 if the bottle is empty.
+
+    """
+    base = bottle * (botSize + 1)
+    position = state[base] - 1
+    return state[base + 1 + position] if position >= 0 else 0, position
+
+# *****************************************************
+def packedMoveIsPossible(botSize, source, destin, state):
+    """
+    Is it possible to transfer any "liquid" from source to destin?
+
+    Same rule as gameFunctions.moveIsPossible, on a packed state.
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    source : int
+        The index of the source bottle in the state.
+    destin : int
+        The index of the destination bottle in the state.
+    state : bytes or bytearray
+        A packed state.
+
+    Returns
+    -------
+    bool
+        True if the source is not empty, and, either the destination is empty
+        or it has some empty position(s) and the top symbols of both bottles
+        are the same.
+
+    """
+    step = botSize + 1
+    sourceLen = state[source * step]
+    destLen = state[destin * step]
+    return sourceLen != 0 and \
+           (destLen == 0 or
+           (destLen < botSize and
+            state[source * step + sourceLen] == state[destin * step + destLen]))
+
+# *****************************************************
+def packedDoMove(botSize, source, destin, state):
+    """
+    Transfers as much "liquid" as possible from source to destin
+
+    Same rule as gameFunctions.doMove, on a packed state, which is
+    changed in place.
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    source : int
+        The index of the source bottle in the state.
+    destin : int
+        The index of the destination bottle in the state.
+    state : bytearray
+        A packed state.
+
+    Returns
+    -------
+    int
+        The quantity of "liquid" that was transferred from source to destin
+        (0 if they are the same bottle).
+
+    Requires:
+    --------
+        packedMoveIsPossible(botSize, source, destin, state)
+    """
+    if source == destin:
+        return 0
+    step = botSize + 1
+    sourceBase = source * step
+    destBase = destin * step
+    sourceLen = state[sourceBase]
+    destLen = state[destBase]
+    code = state[sourceBase + sourceLen]
+    # How many there are in source to transfer? (rstrip does the scan in C)
+    contents = state[sourceBase + 1 : sourceBase + 1 + sourceLen]
+    howManyEqual = sourceLen - len(contents.rstrip(_CODES[code]))
+    # Transfer as many as possible
+    transfer = min(howManyEqual, botSize - destLen)
+    start = sourceBase + sourceLen - transfer + 1
+    state[destBase + destLen + 1 : destBase + destLen + 1 + transfer] = \
+        state[start : start + transfer]
+    state[start : start + transfer] = _CODES[0] * transfer
+    state[sourceBase] = sourceLen - transfer
+    state[destBase] = destLen + transfer
+    return transfer
+
+# *****************************************************
+def packedFull(botSize, bottle, state):
+    """
+    Is a given packed bottle all full with a same symbol?
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    bottle : int
+        The index of the bottle in the state.
+    state : bytes or bytearray
+        A packed state.
+
+    Returns
+    -------
+    bool
+        True if the bottle has botSize elements, all equal.
+
+    """
+    base = bottle * (botSize + 1)
+    if state[base] < botSize:
+        return False
+    return state.count(state[base + 1], base + 1, base + 1 + botSize) == botSize
+
+# *****************************************************
+def stackStates(states):
+    """
+    Many packed states of the same game in one array
+
+    Parameters
+    ----------
+    states : iterable of bytes or bytearray
+        Packed states, as returned by packBottles, all with the same
+        number of bottles and capacity.
+
+    Returns
+    -------
+    numpy array of uint8, shape (number of states, nrBotts * (botSize + 1))
+        One packed state per row (bytes(row) is the state again).
+
+    """
+    states = [bytes(state) for state in states]
+    return np.frombuffer(b"".join(states), dtype = np.uint8).reshape(len(states), -1).copy()
+
+# *****************************************************
+def packedDoMoves(botSize, states, sources, destins):
+    """
+    Plays one move in each of many packed states, with NumPy
+
+    Same rules as packedMoveIsPossible and packedDoMove: a move that is not
+    possible, or from a bottle into itself, leaves its state as it was.
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    states : numpy array of uint8, shape (M, nrBotts * (botSize + 1))
+        The packed states, as returned by stackStates (C-contiguous). They
+        are changed in place.
+    sources : array of ints, shape (M,)
+        The index of the source bottle of the move of each state.
+    destins : array of ints, shape (M,)
+        The index of the destination bottle of the move of each state.
+
+    Returns
+    -------
+    numpy array of int, shape (M,)
+        The quantity transferred in each state, 0 if the move was not
+        possible.
+
+    Raises
+    ------
+    ValueError:
+        If states is not C-contiguous (its changes would be lost).
+
+    """
+    sources = np.asarray(sources, dtype = np.intp)
+    destins = np.asarray(destins, dtype = np.intp)
+    if not states.flags.c_contiguous:
+        raise ValueError("states must be C-contiguous (see stackStates)")
+    flat = states.reshape(-1)
+    rowBase = np.arange(0, states.size, states.shape[1])
+    sourceBase = rowBase + sources * (botSize + 1)
+    destBase = rowBase + destins * (botSize + 1)
+    sourceLen = flat[sourceBase].astype(np.intp)
+    destLen = flat[destBase].astype(np.intp)
+    # The length byte is 0 for an empty bottle, so it is its top code
+    sourceTop = flat[sourceBase + sourceLen]
+    destTop = flat[destBase + destLen]
+    moving = (sources != destins) & (sourceLen > 0) & \
+             ((destLen == 0) | ((destLen < botSize) & (sourceTop == destTop)))
+    most = np.where(moving, np.minimum(sourceLen, botSize - destLen), 0)
+    # The run at the top of each source, one slot down at a time, only for
+    # the states where more can still be transferred
+    transfer = np.minimum(most, 1)
+    active = np.flatnonzero(transfer < most)
+    below = 1
+    while active.size:
+        active = active[flat[sourceBase[active] + sourceLen[active] - below] ==
+                        sourceTop[active]]
+        transfer[active] += 1
+        active = active[transfer[active] < most[active]]
+        below += 1
+    # One index per unit transferred, with its distance from the top
+    moved = np.flatnonzero(transfer)
+    units = np.repeat(moved, transfer[moved])
+    offsets = np.arange(len(units)) - np.repeat(np.cumsum(transfer[moved]) - transfer[moved],
+                                                transfer[moved])
+    flat[sourceBase[units] + sourceLen[units] - offsets] = 0
+    flat[destBase[units] + destLen[units] + 1 + offsets] = sourceTop[units]
+    flat[sourceBase] = sourceLen - transfer
+    flat[destBase] = destLen + transfer
+    return transfer
+
+# *****************************************************
+def compactStates(states, botSize):
+    """
+    Many packed states with two slots per byte, to keep them in little memory
+
+    Parameters
+    ----------
+    states : numpy array of uint8, shape (M, nrBotts * (botSize + 1))
+        Packed states, as returned by stackStates.
+    botSize : int
+        The capacity of bottles.
+
+    Returns
+    -------
+    numpy array of uint8, shape (M, ceil(nrBotts * botSize / 2))
+        The slots of each state, the even ones in the high half of each
+        byte (the lengths are the slots that are not 0).
+
+    Raises
+    ------
+    ValueError:
+        If a code is larger than 15 (more than 15 symbols).
+
+    """
+    slots = states.reshape(len(states), -1, botSize + 1)[:, :, 1:].reshape(len(states), -1)
+    if slots.size and slots.max() > 15:
+        raise ValueError("Only states with at most 15 symbols can be compacted")
+    if slots.shape[1] % 2:
+        slots = np.concatenate([slots, np.zeros((len(slots), 1), dtype = np.uint8)], axis = 1)
+    return (slots[:, 0::2] << 4) | slots[:, 1::2]
+
+# *****************************************************
+def expandStates(compact, nrBotts, botSize):
+    """
+    The packed states of compactStates, as returned by stackStates
+
+    Parameters
+    ----------
+    compact : numpy array of uint8, shape (M, ceil(nrBotts * botSize / 2))
+        As returned by compactStates.
+    nrBotts : int
+        The number of bottles.
+    botSize : int
+        The capacity of bottles.
+
+    Returns
+    -------
+    numpy array of uint8, shape (M, nrBotts * (botSize + 1))
+
+    """
+    count = len(compact)
+    slots = np.empty((count, 2 * compact.shape[1]), dtype = np.uint8)
+    slots[:, 0::2] = compact >> 4
+    slots[:, 1::2] = compact & 15
+    slots = slots[:, :nrBotts * botSize].reshape(count, nrBotts, botSize)
+    states = np.empty((count, nrBotts, botSize + 1), dtype = np.uint8)
+    states[:, :, 0] = np.count_nonzero(slots, axis = 2)
+    states[:, :, 1:] = slots
+    return states.reshape(count, -1)
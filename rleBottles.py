@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Run-length encoded bottles.
+
+A RunBottle keeps its contents as a stack of [symbol, count] runs, from
+the bottom to the top, so the top run, the transfer of liquid between
+bottles and the "full with a same symbol" check take constant time,
+whatever the capacity of the bottles.
+
+RunBottle behaves like the list of characters it replaces (len, indexing,
+iteration, append, pop, comparison and printing), so dictionaries of
+RunBottle can be given to the functions in gameFunctions unchanged. The
+functions moveIsPossible, doMove and full below have the same signatures
+as the ones in gameFunctions and use the constant time operations.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+# *****************************************************
+class RunBottle:
+    """
+    The contents of a bottle as a stack of [symbol, count] runs.
+    """
+
+    def __init__(self, contents = ()):
+        """
+        Parameters
+        ----------
+        contents : sequence of characters, optional
+            The contents of the bottle, from the bottom to the top.
+            The default is an empty bottle.
+        """
+        self.runs = []
+        self.length = 0
+        for symbol in contents:
+            self.append(symbol)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for symbol, count in self.runs:
+            for _ in range(count):
+                yield symbol
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("bottle index out of range")
+        for symbol, count in self.runs:
+            if index < count:
+                return symbol
+            index -= count
+
+    def __eq__(self, other):
+        if isinstance(other, RunBottle):
+            return self.runs == other.runs
+        return list(self) == other
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def append(self, symbol):
+        """
+        Adds one symbol to the top of the bottle.
+        """
+        if self.runs and self.runs[-1][0] == symbol:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([symbol, 1])
+        self.length += 1
+
+    def pop(self):
+        """
+        Removes and returns the symbol at the top of the bottle.
+        """
+        if not self.runs:
+            raise IndexError("pop from empty bottle")
+        top = self.runs[-1]
+        top[1] -= 1
+        if top[1] == 0:
+            self.runs.pop()
+        self.length -= 1
+        return top[0]
+
+    def topRun(self):
+        """
+        The symbol at the top of the bottle and how many times it is
+        repeated there. ("_", 0) if the bottle is empty.
+        """
+        if not self.runs:
+            return "_", 0
+        symbol, count = self.runs[-1]
+        return symbol, count
+
+    def pourInto(self, other, botSize):
+        """
+        Transfers as much of the top run as fits into the bottle other.
+
+        Parameters
+        ----------
+        other : RunBottle
+            The destination bottle.
+        botSize : int
+            The capacity of bottles.
+
+        Returns
+        -------
+        int
+            The quantity of "liquid" that was transferred.
+        """
+        symbol, count = self.runs[-1]
+        transfer = min(count, botSize - other.length)
+        if transfer == count:
+            self.runs.pop()
+        else:
+            self.runs[-1][1] -= transfer
+        if other.runs and other.runs[-1][0] == symbol:
+            other.runs[-1][1] += transfer
+        else:
+            other.runs.append([symbol, transfer])
+        self.length -= transfer
+        other.length += transfer
+        return transfer
+
+    def isFull(self, botSize):
+        """
+        Is the bottle all full with a same symbol?
+        """
+        return self.length == botSize and len(self.runs) == 1
+
+# *****************************************************
+def toRunBottles(bottles):
+    """
+    Converts a dictionary of bottles to run-length encoded bottles
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists.
+
+    Returns
+    -------
+    dictionary
+        The same keys, with RunBottle values.
+
+    """
+    return {letter: RunBottle(content) for letter, content in bottles.items()}
+
+# *****************************************************
+def toListBottles(bottles):
+    """
+    Converts a dictionary of run-length encoded bottles back to lists
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are RunBottle.
+
+    Returns
+    -------
+    dictionary
+        The same keys, with lists of characters as values.
+
+    """
+    return {letter: list(content) for letter, content in bottles.items()}
+
+# *****************************************************
+def full(bottle, botSize):
+    """
+    Is a given bottle all full with a same symbol? (see gameFunctions.full)
+
+    Parameters
+    ----------
+    bottle : RunBottle
+        The contents of a bottle.
+    botSize : int
+        The capacity of the bottle.
+
+    Returns
+    -------
+    bool
+        True if the bottle has botSize elements, all equal.
+
+    """
+    return bottle.isFull(botSize)
+
+# *****************************************************
+def doMove(botSize, source, destin, bottles):
+    """
+    Transfers as much "liquid" as possible from source to destin
+    (see gameFunctions.doMove)
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    source : string
+        The letter that identifies the source bottle in the dict bottles.
+    destin : string
+        The letter that identifies the destination bottle in the dict bottles.
+    bottles : dictionary
+        Keys are strings and values are RunBottle.
+
+    Returns
+    -------
+    int
+        The quantity of "liquid" that was transferred from source to destin.
+
+    Requires:
+    --------
+        moveIsPossible(botSize, source, destin, bottles)
+    """
+    if source == destin:
+        return 0
+    return bottles[source].pourInto(bottles[destin], botSize)
+
+# *****************************************************
+def moveIsPossible(botSize, source, destin, bottles):
+    """
+    Is it possible to transfer any "liquid" from source to destin?
+    (see gameFunctions.moveIsPossible)
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    source : string
+        The letter that identifies the source bottle in the dict bottles.
+    destin : string
+        The letter that identifies the destination bottle in the dict bottles.
+    bottles : dictionary
+        Keys are strings and values are RunBottle.
+
+    Returns
+    -------
+    bool
+        True if the source is not empty, and, either the destination is empty
+        or it has some empty position(s) and the top symbols of both bottles
+        are the same.
+
+    """
+    sourceBottle = bottles[source]
+    destBottle = bottles[destin]
+    return sourceBottle.length != 0 and \
+           (destBottle.length == 0 or
+           (destBottle.length < botSize and
+            sourceBottle.runs[-1][0] == destBottle.runs[-1][0]))
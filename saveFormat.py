@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Versioned file formats for saved games.
+
+A saved game is the tuple returned by oldGameInfo:
+    (expertise, totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors)
+
+Three formats are read, and the right one is found from the contents of
+the file (see loadGame):
+
+    -> binary (version 1), little-endian:
+         "WSRT", version (uint8), code width (uint8: 1 or 2 bytes),
+         expertise, totalNumberOfBottles, fullBottles, bottleSize, errors
+         (uint32 each), number of symbols (uint32), each symbol and then
+         each letter as a uint16 length followed by UTF-8 bytes, each bottle
+         as a uint32 length followed by one code per symbol (the index of
+         the symbol in the table), and the CRC-32 of all the previous bytes.
+    -> JSON: an object with "format": "watersort-save", "version": 1 and
+         the keys expertise, totalNumberOfBottles, fullBottles, bottleSize,
+         bottleInfo (object of lists of strings) and errors.
+    -> legacy text: the 6 lines written by the first versions of
+         writeGameInfo. Line 5 is read with ast.literal_eval, so nothing in
+         the file is ever executed.
+
+Every game read is checked against the schema (validateGame) and
+SaveFormatError, an IOError, is raised for malformed files.
+
+Usage (bulk conversion):
+    python3 saveFormat.py old.txt midgame.txt --out-dir saves --format binary
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import ast
+import json
+import os
+import struct
+import sys
+import zlib
+
+MAGIC = b"WSRT"
+VERSION = 1
+JSON_FORMAT = "watersort-save"
+
+# magic, version, code width, expertise, bottles, full bottles, size, errors
+_HEADER = struct.Struct("<4sBBIIIII")
+_UINT16 = struct.Struct("<H")
+_UINT32 = struct.Struct("<I")
+
+# Extensions that select a format when saving (others use the legacy text)
+EXTENSIONS = {".wsg": "binary", ".json": "json"}
+
+# *****************************************************
+class SaveFormatError(IOError):
+    """
+    Raised when a saved game is malformed.
+    """
+
+# *****************************************************
+def validateGame(expertise, totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors):
+    """
+    Checks that the information of a game follows the schema
+
+    Parameters
+    ----------
+    As returned by oldGameInfo.
+
+    Returns
+    -------
+    tuple
+        The same information, as the tuple returned by oldGameInfo.
+
+    Raises
+    ------
+    SaveFormatError:
+        If a value has the wrong type or is out of range: the numbers must
+        be non negative ints, bottleInfo a dictionary with
+        totalNumberOfBottles string keys whose values are lists of at most
+        bottleSize strings.
+    """
+    for name, value in (("expertise", expertise),
+                        ("totalNumberOfBottles", totalNumberOfBottles),
+                        ("fullBottles", fullBottles), ("bottleSize", bottleSize),
+                        ("errors", errors)):
+        if type(value) is not int or value < 0:
+            raise SaveFormatError(f"{name} must be a non negative int, not {value!r}")
+    if not isinstance(bottleInfo, dict) or len(bottleInfo) != totalNumberOfBottles:
+        raise SaveFormatError(f"bottleInfo must be a dictionary with {totalNumberOfBottles} bottles")
+    for letter, content in bottleInfo.items():
+        if not isinstance(letter, str) or not isinstance(content, list):
+            raise SaveFormatError(f"bottle {letter!r} must have a string key and a list value")
+        if len(content) > bottleSize:
+            raise SaveFormatError(f"bottle {letter!r} has more than {bottleSize} symbols")
+        for symbol in content:
+            if not isinstance(symbol, str):
+                raise SaveFormatError(f"bottle {letter!r} has a symbol that is not a string")
+    return expertise, totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors
+
+# *****************************************************
+def _packString(text):
+    data = text.encode("utf-8")
+    return _UINT16.pack(len(data)) + data
+
+# *****************************************************
+def dumpBinary(expertise, totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors):
+    """
+    The bytes of a game in the binary format (see the module documentation)
+
+    Parameters
+    ----------
+    As returned by oldGameInfo (bottleInfo values may be any sequence).
+
+    Returns
+    -------
+    bytes
+
+    """
+    symbols = sorted({symbol for content in bottleInfo.values() for symbol in content})
+    codes = {symbol: code for code, symbol in enumerate(symbols)}
+    width = 1 if len(symbols) <= 256 else 2
+    parts = [_HEADER.pack(MAGIC, VERSION, width, expertise, totalNumberOfBottles,
+                          fullBottles, bottleSize, errors),
+             _UINT32.pack(len(symbols))]
+    parts.extend(_packString(symbol) for symbol in symbols)
+    parts.extend(_packString(letter) for letter in bottleInfo.keys())
+    for content in bottleInfo.values():
+        parts.append(_UINT32.pack(len(content)))
+        if width == 1:
+            parts.append(bytes(codes[symbol] for symbol in content))
+        else:
+            parts.append(struct.pack(f"<{len(content)}H", *(codes[symbol] for symbol in content)))
+    data = b"".join(parts)
+    return data + _UINT32.pack(zlib.crc32(data))
+
+# *****************************************************
+def loadBinary(data):
+    """
+    The game stored in bytes in the binary format
+
+    Parameters
+    ----------
+    data : bytes
+        As returned by dumpBinary.
+
+    Returns
+    -------
+    tuple
+        As returned by oldGameInfo.
+
+    Raises
+    ------
+    SaveFormatError:
+        If data is not a valid game in the binary format.
+    """
+    try:
+        if len(data) < _HEADER.size + 4 or \
+           _UINT32.unpack_from(data, len(data) - 4)[0] != zlib.crc32(data[:-4]):
+            raise SaveFormatError("truncated data or wrong checksum")
+        magic, version, width, expertise, nrBotts, fullBottles, botSize, errors = \
+            _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or width not in (1, 2):
+            raise SaveFormatError("not a saved game of a known version")
+        end = len(data) - 4
+        offset = _HEADER.size
+
+        def readString(offset):
+            length = _UINT16.unpack_from(data, offset)[0]
+            offset += 2
+            if offset + length > end:
+                raise SaveFormatError("truncated data")
+            return data[offset : offset + length].decode("utf-8"), offset + length
+
+        nrSymbols = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        symbols = []
+        for _ in range(nrSymbols):
+            symbol, offset = readString(offset)
+            symbols.append(symbol)
+        letters = []
+        for _ in range(nrBotts):
+            letter, offset = readString(offset)
+            letters.append(letter)
+        bottleInfo = {}
+        for letter in letters:
+            length = _UINT32.unpack_from(data, offset)[0]
+            offset += 4
+            if length > botSize or offset + length * width > end:
+                raise SaveFormatError("bottle larger than its capacity or truncated data")
+            if width == 1:
+                codes = data[offset : offset + length]
+            else:
+                codes = struct.unpack_from(f"<{length}H", data, offset)
+            bottleInfo[letter] = [symbols[code] for code in codes]
+            offset += length * width
+        if offset != end:
+            raise SaveFormatError("unexpected data after the bottles")
+    except (struct.error, UnicodeDecodeError, IndexError) as error:
+        raise SaveFormatError(f"malformed binary game: {error}") from error
+    return validateGame(expertise, nrBotts, fullBottles, botSize, bottleInfo, errors)
+
+# *****************************************************
+def dumpJson(expertise, totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors):
+    """
+    The text of a game in the JSON format (see the module documentation)
+    """
+    return json.dumps({"format": JSON_FORMAT, "version": VERSION,
+                       "expertise": expertise, "totalNumberOfBottles": totalNumberOfBottles,
+                       "fullBottles": fullBottles, "bottleSize": bottleSize,
+                       "bottleInfo": {letter: list(content) for letter, content in bottleInfo.items()},
+                       "errors": errors}, ensure_ascii = False)
+
+# *****************************************************
+def loadJson(text):
+    """
+    The game stored in text in the JSON format
+
+    Raises
+    ------
+    SaveFormatError:
+        If text is not a valid game in the JSON format.
+    """
+    try:
+        game = json.loads(text)
+    except ValueError as error:
+        raise SaveFormatError(f"malformed JSON game: {error}") from error
+    if not isinstance(game, dict) or game.get("format") != JSON_FORMAT or \
+       game.get("version") != VERSION:
+        raise SaveFormatError("not a saved game of a known version")
+    try:
+        return validateGame(game["expertise"], game["totalNumberOfBottles"],
+                            game["fullBottles"], game["bottleSize"],
+                            game["bottleInfo"], game["errors"])
+    except KeyError as error:
+        raise SaveFormatError(f"missing {error} in JSON game") from error
+
+# *****************************************************
+def dumpLegacy(expertise, totalNumberOfBottles, fullBottles, bottleSize, bottleInfo, errors):
+    """
+    The text of a game in the legacy 6 lines format
+    """
+    return "".join(str(value) + "\n" for value in (expertise, totalNumberOfBottles, fullBottles,
+                                                   bottleSize, bottleInfo, errors))
+
+# *****************************************************
+def loadLegacy(text):
+    """
+    The game stored in text in the legacy 6 lines format
+
+    Raises
+    ------
+    SaveFormatError:
+        If text is not a valid game in the legacy format.
+    """
+    data = text.split("\n")
+    try:
+        bottleInfo = ast.literal_eval(data[4])
+        if isinstance(bottleInfo, dict):
+            bottleInfo = {letter: list(content) if isinstance(content, (list, tuple)) else content
+                          for letter, content in bottleInfo.items()}
+        return validateGame(int(data[0]), int(data[1]), int(data[2]), int(data[3]),
+                            bottleInfo, int(data[5]))
+    except (IndexError, ValueError, TypeError, SyntaxError, MemoryError,
+            RecursionError) as error:
+        raise SaveFormatError(f"malformed legacy game: {error}") from error
+
+# *****************************************************
+def loads(data):
+    """
+    The game stored in data, in any of the formats
+
+    Parameters
+    ----------
+    data : bytes
+        The contents of a saved game file.
+
+    Returns
+    -------
+    tuple
+        As returned by oldGameInfo.
+
+    Raises
+    ------
+    SaveFormatError:
+        If data is not a valid game in any of the formats.
+    """
+    if data.startswith(MAGIC):
+        return loadBinary(data)
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as error:
+        raise SaveFormatError("not a saved game") from error
+    if text.lstrip().startswith("{"):
+        return loadJson(text)
+    return loadLegacy(text)
+
+# *****************************************************
+def loadGame(fileName):
+    """
+    Reads a saved game in any of the formats
+
+    Raises
+    ------
+    FileNotFoundError:
+        If the file 'fileName' does not exist.
+    SaveFormatError:
+        If the file is not a valid saved game.
+    """
+    with open(fileName, "rb") as file:
+        return loads(file.read())
+
+# *****************************************************
+def dumps(info, fmt):
+    """
+    The bytes of the game info (a tuple as returned by oldGameInfo) in the
+    format fmt: "binary", "json" or "legacy".
+    """
+    if fmt == "binary":
+        return dumpBinary(*info)
+    if fmt == "json":
+        return dumpJson(*info).encode("utf-8")
+    if fmt == "legacy":
+        return dumpLegacy(*info).encode("utf-8")
+    raise ValueError(f"unknown format {fmt!r}")
+
+# *****************************************************
+def formatFor(fileName):
+    """
+    The format used to save to fileName, from its extension: "binary" for
+    .wsg, "json" for .json, and "legacy" for any other.
+    """
+    return EXTENSIONS.get(os.path.splitext(fileName)[1].lower(), "legacy")
+
+# *****************************************************
+def saveGame(fileName, info, fmt = None):
+    """
+    Writes a game to a file
+
+    Parameters
+    ----------
+    fileName : string
+        The name of the file.
+    info : tuple
+        As returned by oldGameInfo.
+    fmt : string, optional
+        "binary", "json" or "legacy". The default is None, which chooses
+        it from the extension of fileName (see formatFor).
+
+    Returns
+    -------
+    None.
+
+    """
+    with open(fileName, "wb") as file:
+        file.write(dumps(info, fmt or formatFor(fileName)))
+
+# *****************************************************
+def convertFiles(fileNames, outDir, fmt = "binary"):
+    """
+    Converts saved games to another format, one file at a time
+
+    Parameters
+    ----------
+    fileNames : iterable of strings
+        The saved games to convert, in any format.
+    outDir : string
+        The folder for the converted games, with the same base names and
+        the extension of fmt.
+    fmt : string, optional
+        "binary", "json" or "legacy". The default is "binary".
+
+    Yields
+    ------
+    (fileName, newFileName, error) : tuple
+        error is None if the conversion succeeded, otherwise the
+        SaveFormatError or the OSError of the file that could not be read or
+        written (newFileName is then None).
+
+    """
+    extension = {"binary": ".wsg", "json": ".json", "legacy": ".txt"}[fmt]
+    os.makedirs(outDir, exist_ok = True)
+    for fileName in fileNames:
+        base = os.path.splitext(os.path.basename(fileName))[0]
+        newFileName = os.path.join(outDir, base + extension)
+        try:
+            saveGame(newFileName, loadGame(fileName), fmt)
+        except OSError as error:
+            # SaveFormatError is an OSError too
+            yield fileName, None, error
+            continue
+        yield fileName, newFileName, None
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Converts saved games to another format.")
+    parser.add_argument("fileNames", nargs = "+", help = "saved games, in any format")
+    parser.add_argument("--out-dir", required = True)
+    parser.add_argument("--format", choices = ["binary", "json", "legacy"], default = "binary")
+    options = parser.parse_args(args)
+
+    failures = 0
+    for fileName, newFileName, error in convertFiles(options.fileNames, options.out_dir,
+                                                     options.format):
+        if error is None:
+            print(f"{fileName} -> {newFileName}")
+        else:
+            failures += 1
+            print(f"{fileName}: {error}", file = sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Pruning and move-ordering rules of the search of optimalSolver.
+
+The rules look at a board of runs (one tuple of runs, see solver.runsOf,
+per bottle, in the order of the letters), the lengths of its bottles and a
+possible move given by the indexes of its bottles.
+
+A pruning rule is a function (botSize, board, lengths, source, destin,
+previous) that returns True when the move can be left out of the search
+without losing any solution, or its length:
+
+    -> "complete": a bottle full with a same symbol is never poured (it
+       holds every unit of its symbol, so it can only go into an empty
+       bottle, which just swaps the two)
+    -> "uniformToEmpty": a bottle with a single symbol poured into an empty
+       bottle only changes its place
+    -> "emptySymmetry": the empty bottles are interchangeable, only the
+       first one is tried
+    -> "reverse": pouring back the previous move, when all of it goes back
+       (the state before it comes again)
+
+An ordering rule is a function (botSize, board, lengths, source, destin)
+that gives a key of the move; among the moves with the same bound, the
+moves are tried in the order of the keys of the rules chosen, smaller first:
+
+    -> "completing": the moves that leave the destination complete
+    -> "wholeRun": the moves of the whole top run onto a same symbol
+    -> "emptyLast": the moves into empty bottles at the end
+
+optimalSolver.optimalSolution takes the names of the rules to use (none
+by default). The states a pruning rule leaves out are also left out by
+the table of states of the search, so it only saves building them;
+benchmarks/benchSearchRules.py reports what each rule saves.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+# *****************************************************
+def pruneComplete(botSize, board, lengths, source, destin, previous):
+    return len(board[source]) == 1 and lengths[source] == botSize
+
+def pruneUniformToEmpty(botSize, board, lengths, source, destin, previous):
+    return not board[destin] and len(board[source]) == 1
+
+def pruneEmptySymmetry(botSize, board, lengths, source, destin, previous):
+    return not board[destin] and destin != lengths.index(0)
+
+def pruneReverse(botSize, board, lengths, source, destin, previous):
+    return previous is not None and (destin, source) == previous[:2] and \
+           board[source][-1][1] == previous[2]
+
+PRUNING_RULES = {"complete": pruneComplete,
+                 "uniformToEmpty": pruneUniformToEmpty,
+                 "emptySymmetry": pruneEmptySymmetry,
+                 "reverse": pruneReverse}
+
+# *****************************************************
+def orderCompleting(botSize, board, lengths, source, destin):
+    return 0 if len(board[destin]) <= 1 and \
+                lengths[destin] + board[source][-1][1] == botSize else 1
+
+def orderWholeRun(botSize, board, lengths, source, destin):
+    return 0 if board[destin] and board[source][-1][1] <= botSize - lengths[destin] else 1
+
+def orderEmptyLast(botSize, board, lengths, source, destin):
+    return 1 if not board[destin] else 0
+
+ORDERING_RULES = {"completing": orderCompleting,
+                  "wholeRun": orderWholeRun,
+                  "emptyLast": orderEmptyLast}
+
+# *****************************************************
+def ruleFunctions(names, rules):
+    """
+    The functions of the rules named (all of them if names is None)
+
+    Raises
+    ------
+    ValueError:
+        If a name is not a key of rules.
+    """
+    if names is None:
+        return list(rules.values())
+    unknown = [name for name in names if name not in rules]
+    if unknown:
+        raise ValueError(f"Unknown rules {unknown}, choose from {sorted(rules)}")
+    return [rules[name] for name in names]
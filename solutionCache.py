@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Shortest solutions of boards, kept between runs.
+
+SolutionCache maps a board (its canonical.canonicalKey, with the capacity
+of the bottles and the expertise) to the length of its shortest solution
+and its moves. The moves are kept as positions of the canonical key, so
+they are translated to the letters of any board with the same key (the
+same puzzle with the bottles in another order or other symbols).
+
+The solutions are kept in a SQLite file, the table solutions, and the
+most recently used ones also in memory. Reading a solution from memory
+takes microseconds. When the solutions in the file take more than
+maxBytes, the ones used least recently are removed (the time of use in
+the file is updated when a solution is read from the file, not from
+memory).
+
+Usage: python3 solutionCache.py solutions.db old.txt midgame.txt --timeout 30
+(the second time, the solutions come from the file)
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import collections
+import json
+import sqlite3
+import time
+
+import canonical
+import gameFunctions as funcs
+import optimalSolver
+import solver
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    key TEXT PRIMARY KEY,
+    length INTEGER,
+    moves TEXT,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutionsByUse ON solutions (used);
+"""
+
+# Solutions removed at a time when the file is over its size
+EVICT_BATCH = 64
+
+# *****************************************************
+class SolutionCache:
+    """
+    Shortest solutions in memory and in a file. Can be used in a with statement.
+    """
+
+    def __init__(self, fileName, memoryEntries = 4096, maxBytes = 64 << 20):
+        """
+        Parameters
+        ----------
+        fileName : string
+            The name of the database file. It is created if needed.
+        memoryEntries : int, optional
+            The number of solutions also kept in memory. The default is 4096.
+        maxBytes : int, optional
+            The maximum size of the solutions in the file (keys and moves).
+            The default is 64 MB.
+        """
+        self.connection = sqlite3.connect(fileName)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.memoryEntries = memoryEntries
+        self.maxBytes = maxBytes
+        self.memory = collections.OrderedDict()
+        self.totalBytes = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+        self.memoryHits = 0
+        self.fileHits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memoryEntries:
+            self.memory.popitem(last = False)
+
+    def _lookup(self, key):
+        # The (length, positions) of key, or None if it is not kept
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            self.memoryHits += 1
+            return entry
+        row = self.connection.execute("SELECT length, moves FROM solutions WHERE key = ?",
+                                      (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        with self.connection:
+            self.connection.execute("UPDATE solutions SET used = ? WHERE key = ?",
+                                    (time.time(), key))
+        entry = (row[0], None if row[1] is None else [tuple(move) for move in json.loads(row[1])])
+        self._remember(key, entry)
+        self.fileHits += 1
+        return entry
+
+    def _evict(self):
+        # Removes the solutions used least recently until the file fits
+        while self.totalBytes > self.maxBytes:
+            rows = self.connection.execute(
+                "SELECT key, size FROM solutions ORDER BY used LIMIT ?", (EVICT_BATCH,)).fetchall()
+            if not rows:
+                self.totalBytes = 0
+                return
+            with self.connection:
+                for key, size in rows:
+                    self.connection.execute("DELETE FROM solutions WHERE key = ?", (key,))
+                    self.memory.pop(key, None)
+                    self.totalBytes -= size
+                    if self.totalBytes <= self.maxBytes:
+                        break
+
+    def get(self, bottles, botSize, expert):
+        """
+        The solution of a board, if it is kept.
+
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists.
+        botSize : int
+            The capacity of bottles.
+        expert : int
+            The level of the user's expertise.
+
+        Returns
+        -------
+        tuple or None
+            None if the board is not kept. Otherwise (length, moves): the
+            number of moves of a shortest solution and its (source, destin)
+            pairs of letters of bottles, both None if the game can not be won.
+        """
+        key, letters = boardKey(bottles, botSize, expert)
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        length, positions = entry
+        if positions is None:
+            return None, None
+        return length, [(letters[source], letters[destin]) for source, destin in positions]
+
+    def put(self, bottles, botSize, expert, moves):
+        """
+        Keeps the solution of a board.
+
+        Parameters
+        ----------
+        bottles, botSize, expert :
+            As in get.
+        moves : list of tuples or None
+            The (source, destin) pairs of letters of a shortest solution,
+            None if the game can not be won.
+        """
+        key, letters = boardKey(bottles, botSize, expert)
+        if moves is None:
+            length = positions = text = None
+        else:
+            position = {letter: index for index, letter in enumerate(letters)}
+            positions = [(position[source], position[destin]) for source, destin in moves]
+            length = len(positions)
+            text = json.dumps(positions, separators = (",", ":"))
+        size = len(key) + (0 if text is None else len(text))
+        with self.connection:
+            old = self.connection.execute("SELECT size FROM solutions WHERE key = ?",
+                                          (key,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO solutions (key, length, moves, size, used)"
+                " VALUES (?, ?, ?, ?, ?)", (key, length, text, size, time.time()))
+        self.totalBytes += size - (0 if old is None else old[0])
+        self._remember(key, (length, positions))
+        self._evict()
+
+    def solve(self, bottles, botSize, expert, timeLimit = None, maxNodes = None):
+        """
+        The solution of a board, searched for (as in batchSolver.solveGame)
+        and kept if it is not kept yet.
+
+        Parameters
+        ----------
+        bottles, botSize, expert :
+            As in get.
+        timeLimit : float, optional
+            Maximum seconds for each search. The default is None.
+        maxNodes : int, optional
+            Maximum states for each search. The default is None.
+
+        Returns
+        -------
+        As get, but never None.
+
+        Raises
+        ------
+        SearchLimitExceeded:
+            If the search was stopped by the limits (nothing is kept).
+        """
+        found = self.get(bottles, botSize, expert)
+        if found is not None:
+            return found
+        if solver.isSolvable(bottles, botSize, expert, maxNodes, timeLimit) is False:
+            moves = None
+        else:
+            moves, _ = optimalSolver.optimalSolution(bottles, botSize, expert,
+                                                     maxNodes = maxNodes, timeLimit = timeLimit)
+        self.put(bottles, botSize, expert, moves)
+        return (None, None) if moves is None else (len(moves), moves)
+
+    def hint(self, bottles, botSize, expert, timeLimit = None, maxNodes = None):
+        """
+        The first move of a shortest solution (see solve), None if the game
+        can not be won or is already won.
+        """
+        length, moves = self.solve(bottles, botSize, expert, timeLimit, maxNodes)
+        return moves[0] if moves else None
+
+# *****************************************************
+def boardKey(bottles, botSize, expert):
+    """
+    The key of a board in the cache and the letter of the bottle at each
+    position of its canonical key (see canonical.canonicalOrder)
+    """
+    key, letters = canonical.canonicalOrder(bottles)
+    return json.dumps([botSize, expert, key], separators = (",", ":")), letters
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Shortest solutions, kept between runs.")
+    parser.add_argument("database", help = "the file of the solutions")
+    parser.add_argument("files", nargs = "+", help = "saved games (see oldGameInfo)")
+    parser.add_argument("--timeout", type = float, default = None,
+                        help = "seconds for each search (default: no limit)")
+    parser.add_argument("--max-mb", type = float, default = 64.0,
+                        help = "maximum size of the solutions in the file")
+    parser.add_argument("--moves", action = "store_true", help = "also print the moves")
+    options = parser.parse_args(args)
+    with SolutionCache(options.database, maxBytes = int(options.max_mb * (1 << 20))) as cache:
+        for fileName in options.files:
+            expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = funcs.oldGameInfo(fileName)
+            start = time.perf_counter()
+            try:
+                length, moves = cache.solve(bottles, botSize, expertise, options.timeout)
+                text = "no solution" if moves is None else f"{length} moves"
+            except solver.SearchLimitExceeded as error:
+                moves, text = None, str(error)
+            print(f"{fileName}: {text}, {(time.perf_counter() - start) * 1e6:.0f} us")
+            if options.moves and moves:
+                print(" ".join(f"{source}>{destin}" for source, destin in moves))
+        print(f"{cache.memoryHits} from memory, {cache.fileHits} from the file, "
+              f"{cache.misses} searched")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Solver for the bottles game, built on top of the rules in gameFunctions.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import time
+
+# Number of states expanded between two checks of the time limit
+CHECK_TIME_EVERY = 1024
+
+# *****************************************************
+class SearchLimitExceeded(Exception):
+    """
+    Raised when the search expands more nodes than it was allowed to.
+    """
+
+# *****************************************************
+def nrComplete(board, botSize):
+    """
+    The number of bottles all full with a same symbol in a board of runs
+
+    Parameters
+    ----------
+    board : tuple
+        One tuple of runs (see runsOf) per bottle.
+    botSize : int
+        The capacity of bottles.
+
+    Returns
+    -------
+    int
+        How many bottles have a single run of botSize symbols.
+
+    """
+    return sum(1 for runs in board if len(runs) == 1 and runs[0][1] == botSize)
+
+# *****************************************************
+def solve(bottles, botSize, expert, maxNodes = None):
+    """
+    Searches for a sequence of moves that wins the game
+
+    Depth-first search on bottles kept as runs of equal symbols, with the
+    moves of runMoves and boards that only differ in the order of the
+    bottles seen as the same (as in isSolvable). The moves are rebuilt
+    from the board each state was first reached from.
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists. It is not modified.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    maxNodes : int, optional
+        The maximum number of states to expand. The default is None (no limit).
+
+    Returns
+    -------
+    moves : list of tuples or None
+        The (source, destin) pairs that, played in order, leave
+        (number of bottles - expert) bottles full. None if no such
+        sequence exists.
+    nodes : int
+        The number of states expanded by the search.
+
+    Raises
+    ------
+    SearchLimitExceeded:
+        If more than maxNodes states had to be expanded.
+
+    """
+    letters = list(bottles.keys())
+    goal = len(letters) - expert
+
+    # The bottles keep their indexes, so that moves can be given by letter;
+    # states are compared sorted
+    board = tuple(runsOf(content) for content in bottles.values())
+    if nrComplete(board, botSize) == goal:
+        return [], 0
+    key = tuple(sorted(board))
+    # The key of the state each state was first reached from, and the move
+    parents = {key: None}
+    stack = [(board, key, runMoves(botSize, board))]
+    nodes = 1
+    while stack:
+        board, key, todo = stack[-1]
+        if not todo:
+            stack.pop()
+            continue
+        source, destin = todo.pop()
+        child = pourRuns(botSize, board, source, destin, keepOrder = True)
+        childKey = tuple(sorted(child))
+        if childKey in parents:
+            continue
+        parents[childKey] = (key, source, destin)
+        if nrComplete(child, botSize) == goal:
+            moves = []
+            while parents[childKey] is not None:
+                childKey, source, destin = parents[childKey]
+                moves.append((letters[source], letters[destin]))
+            moves.reverse()
+            return moves, nodes
+        nodes += 1
+        if maxNodes is not None and nodes > maxNodes:
+            raise SearchLimitExceeded(f"No solution found in {maxNodes} nodes")
+        stack.append((child, childKey, runMoves(botSize, child)))
+    return None, nodes
+
+# *****************************************************
+def runsOf(content):
+    """
+    The contents of a bottle as runs of equal symbols
+
+    Parameters
+    ----------
+    content : sequence of characters
+        The contents of a bottle, from the bottom to the top.
+
+    Returns
+    -------
+    tuple
+        One (symbol, count) pair per run, from the bottom to the top.
+
+    """
+    runs = []
+    for symbol in content:
+        if runs and runs[-1][0] == symbol:
+            runs[-1] = (symbol, runs[-1][1] + 1)
+        else:
+            runs.append((symbol, 1))
+    return tuple(runs)
+
+# *****************************************************
+def runMoves(botSize, board):
+    """
+    The useful moves of a board of runs, the most promising last
+
+    Only moves between bottles with the same top symbol, and from a bottle
+    with more than one run into one of the empty bottles (they are all
+    alike) are considered. Complete bottles are never poured.
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    board : tuple
+        One tuple of runs (see runsOf) per bottle.
+
+    Returns
+    -------
+    list of tuples
+        (source, destin) pairs of indexes in board. Moves that transfer
+        the whole top run of the source are at the end of the list.
+
+    """
+    tops = {}
+    lengths = []
+    empty = None
+    for i, runs in enumerate(board):
+        lengths.append(sum(count for _, count in runs))
+        if not runs:
+            empty = i
+        elif len(runs) > 1 or lengths[i] < botSize:
+            tops.setdefault(runs[-1][0], []).append(i)
+    partial = []
+    whole = []
+    for same in tops.values():
+        for source in same:
+            run = board[source][-1][1]
+            for destin in same:
+                if source != destin and lengths[destin] < botSize:
+                    if run <= botSize - lengths[destin]:
+                        whole.append((source, destin))
+                    else:
+                        partial.append((source, destin))
+            if empty is not None and len(board[source]) > 1:
+                partial.append((source, empty))
+    return partial + whole
+
+# *****************************************************
+def pourRuns(botSize, board, source, destin, keepOrder = False):
+    """
+    The board of runs after pouring the top of source into destin
+
+    Parameters
+    ----------
+    botSize : int
+        The capacity of bottles.
+    board : tuple
+        One tuple of runs (see runsOf) per bottle.
+    source : int
+        The index in board of the source bottle.
+    destin : int
+        The index in board of the destination bottle.
+    keepOrder : bool, optional
+        If True the bottles keep their indexes. The default is False
+        (the bottles are sorted).
+
+    Returns
+    -------
+    tuple
+        The new board.
+
+    Requires:
+    --------
+        the move is possible
+    """
+    sourceRuns = board[source]
+    destRuns = board[destin]
+    symbol, run = sourceRuns[-1]
+    transfer = min(run, botSize - sum(count for _, count in destRuns))
+    child = list(board)
+    child[source] = sourceRuns[:-1] if transfer == run else \
+                    sourceRuns[:-1] + ((symbol, run - transfer),)
+    child[destin] = destRuns[:-1] + ((symbol, destRuns[-1][1] + transfer),) \
+                    if destRuns else ((symbol, transfer),)
+    return tuple(child) if keepOrder else tuple(sorted(child))
+
+# *****************************************************
+def isSolvable(bottles, botSize, expert, maxNodes = None, timeLimit = None):
+    """
+    Fast check of whether a game can be won
+
+    Depth-first search on bottles kept as runs of equal symbols, with
+    boards that only differ in the order of the bottles seen as the same.
+    It does not build the sequence of moves (see solve for that).
+
+    Parameters
+    ----------
+    bottles : dictionary
+        Keys are strings and values are lists. It is not modified.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    maxNodes : int, optional
+        The maximum number of states to expand. The default is None (no limit).
+    timeLimit : float, optional
+        The maximum time for the search, in seconds. The default is None (no limit).
+
+    Returns
+    -------
+    bool or None
+        True if the game can be won, False if it can not, None if the
+        answer was not found within maxNodes states or timeLimit seconds.
+
+    """
+    deadline = None if timeLimit is None else time.perf_counter() + timeLimit
+    goal = len(bottles) - expert
+
+    board = tuple(sorted(runsOf(content) for content in bottles.values()))
+    if nrComplete(board, botSize) == goal:
+        return True
+    visited = {board}
+    stack = [(board, runMoves(botSize, board))]
+    nodes = 1
+    while stack:
+        board, todo = stack[-1]
+        if not todo:
+            stack.pop()
+            continue
+        source, destin = todo.pop()
+        child = pourRuns(botSize, board, source, destin)
+        if child in visited:
+            continue
+        visited.add(child)
+        if nrComplete(child, botSize) == goal:
+            return True
+        nodes += 1
+        if maxNodes is not None and nodes > maxNodes:
+            return None
+        if deadline is not None and nodes % CHECK_TIME_EVERY == 0 and \
+           time.perf_counter() > deadline:
+            return None
+        stack.append((child, runMoves(botSize, child)))
+    return False
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Endgame tablebase: the number of moves to win of every state of a small
+configuration, looked up without any search.
+
+A configuration is the number of bottles, their capacity and the
+expertise, as given to buildGameBottles: nrBotts - expert symbols with
+botSize units each. buildTablebase finds every state from which the game
+can be won with a retrograde breadth-first search (from the won state,
+undoing one move at a time, with NumPy over a whole depth at once), and
+writes its distance to the win to a file. States that are not in the
+file can not be won.
+
+States are kept in canonical form: each bottle is a code (its symbols, as
+digits from 1, in base nrSymbols + 1, the bottom one the least
+significant; 0 is empty), the codes are sorted and packed in an int of 64
+bits, and of the packings for every renaming of the symbols the smallest
+is kept. Boards that only differ in the order of the bottles or in the
+names of the symbols have the same state.
+
+The file is an open addressing hash table (linear probing, load at most
+1/2), read through mmap:
+    -> a header (HEADER)
+    -> slots keys, little-endian uint64 (0 is an empty slot)
+    -> slots distances, uint8
+Tablebase.distance is a hash and (usually) one read of the file, and the
+file can be opened by many processes at once, sharing its pages.
+
+Usage:
+    python3 tablebase.py table6x4.bin --build 6 4 2
+    python3 tablebase.py table6x4.bin midgame.txt
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import argparse
+import itertools
+import mmap
+import struct
+import time
+
+import numpy as np
+
+import gameFunctions as funcs
+
+MAGIC = b"WSTB"
+VERSION = 1
+# magic, version, nrBotts, botSize, expert, bits per bottle, slots, entries
+HEADER = struct.Struct("<4sHHHHHQQ")
+# Multiplier of the hash of the keys (Fibonacci hashing)
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+EMPTY_DISTANCE = 255
+# States whose predecessors are found at a time (bounds the memory used)
+CHUNK_STATES = 1 << 15
+
+# *****************************************************
+class Layout:
+    """
+    The codes of the bottles of a configuration and tables of what moves
+    do to them.
+    """
+
+    def __init__(self, nrBotts, botSize, expert):
+        """
+        Raises
+        ------
+        ValueError:
+            If a state does not fit in 64 bits.
+        """
+        self.nrBotts = nrBotts
+        self.botSize = botSize
+        self.expert = expert
+        self.nrSymbols = nrBotts - expert
+        base = self.nrSymbols + 1
+        self.codes = base ** botSize
+        self.bits = (self.codes - 1).bit_length()
+        if self.bits * nrBotts > 64 or self.nrSymbols < 1:
+            raise ValueError(f"{nrBotts} bottles of capacity {botSize} with expertise "
+                             f"{expert} are too many states for a tablebase")
+        self.mask = (1 << self.bits) - 1
+        self.powers = [base ** i for i in range(botSize)]
+        contents = [self.decode(code) for code in range(self.codes)]
+        self.contents = contents
+        self.length = np.array([len(content) for content in contents], dtype = np.int64)
+        self.top = np.array([content[-1] if content else -1 for content in contents],
+                            dtype = np.int64)
+        self.run = np.array([len(content) - _firstOfTopRun(content) for content in contents],
+                            dtype = np.int64)
+        # removeTop[code, t]: the code without its t top symbols;
+        # addTop[code, symbol, t]: the code with t more symbols on top
+        # (-1 when they do not fit)
+        self.removeTop = np.array([[self.encode(content[:max(0, len(content) - t)])
+                                    for t in range(botSize + 1)] for content in contents],
+                                  dtype = np.int64)
+        self.addTop = np.array([[[self.encode(content + [symbol] * t)
+                                  if len(content) + t <= botSize else -1
+                                  for t in range(botSize + 1)]
+                                 for symbol in range(self.nrSymbols)] for content in contents],
+                               dtype = np.int64)
+        # renames[p][code]: the code with the symbols renamed by the p-th permutation
+        self.renames = [[self.encode([permutation[symbol] for symbol in content])
+                         for content in contents]
+                        for permutation in itertools.permutations(range(self.nrSymbols))]
+        self.renameTable = np.array(self.renames, dtype = np.int64)
+
+    def decode(self, code):
+        content = []
+        while code:
+            content.append(code % (self.nrSymbols + 1) - 1)
+            code //= self.nrSymbols + 1
+        return content
+
+    def encode(self, content):
+        return sum((symbol + 1) * power for symbol, power in zip(content, self.powers))
+
+    def pack(self, codes):
+        key = 0
+        for i, code in enumerate(sorted(codes)):
+            key |= code << (self.bits * i)
+        return key
+
+    def stateKey(self, codes):
+        """
+        The canonical state of the bottles with codes (see the module documentation)
+        """
+        return min(self.pack([rename[code] for code in codes]) for rename in self.renames)
+
+    def stateKeys(self, rows):
+        """
+        stateKey of each row of an array of codes, shape (N, nrBotts)
+        """
+        best = None
+        for rename in self.renameTable:
+            renamed = np.sort(rename[rows], axis = 1).astype(np.uint64)
+            keys = np.zeros(len(rows), dtype = np.uint64)
+            for i in range(self.nrBotts):
+                keys |= renamed[:, i] << np.uint64(self.bits * i)
+            best = keys if best is None else np.minimum(best, keys)
+        return best
+
+    def unpack(self, keys):
+        """
+        The codes of the bottles of each key, shape (N, nrBotts)
+        """
+        rows = np.empty((len(keys), self.nrBotts), dtype = np.int64)
+        for i in range(self.nrBotts):
+            rows[:, i] = ((keys >> np.uint64(self.bits * i)) & np.uint64(self.mask)).astype(np.int64)
+        return rows
+
+    def wonKey(self):
+        full = [self.encode([symbol] * self.botSize) for symbol in range(self.nrSymbols)]
+        return self.stateKey(full + [0] * self.expert)
+
+    def predecessors(self, rows):
+        """
+        The states from which one move leads to each row of codes (one row
+        per state, repeated states included)
+        """
+        botSize = self.botSize
+        found = []
+        for destin in range(self.nrBotts):
+            destCodes = rows[:, destin]
+            symbol = self.top[destCodes]
+            run = self.run[destCodes]
+            destLength = self.length[destCodes]
+            for transfer in range(1, botSize + 1):
+                # The move left the t symbols on top of destin, which was
+                # empty before or had the same symbol on top
+                destOk = (run >= transfer) & ((run > transfer) | (destLength == transfer))
+                if not destOk.any():
+                    continue
+                for source in range(self.nrBotts):
+                    if source == destin:
+                        continue
+                    sourceCodes = rows[:, source]
+                    # All of the top run of the source was poured, unless
+                    # destin became full
+                    ok = destOk & (self.length[sourceCodes] + transfer <= botSize) & \
+                         ((self.top[sourceCodes] != symbol) | (destLength == botSize))
+                    index = np.flatnonzero(ok)
+                    if len(index) == 0:
+                        continue
+                    previous = rows[index]
+                    previous[:, destin] = self.removeTop[destCodes[index], transfer]
+                    previous[:, source] = self.addTop[sourceCodes[index], symbol[index], transfer]
+                    found.append(previous)
+        if not found:
+            return np.empty((0, self.nrBotts), dtype = np.int64)
+        return np.concatenate(found)
+
+def _firstOfTopRun(content):
+    # The position of the lowest symbol of the run at the top of content
+    position = len(content)
+    while position > 0 and content[position - 1] == content[-1]:
+        position -= 1
+    return position
+
+# *****************************************************
+def slotsOf(keys, slotBits):
+    """
+    The first slot of each key (uint64 array) in a table of 2 ** slotBits slots
+    """
+    return (keys * np.uint64(HASH_MULTIPLIER)) >> np.uint64(64 - slotBits)
+
+def slotOf(key, slotBits):
+    return ((key * HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> (64 - slotBits)
+
+# *****************************************************
+def retrogradeSearch(layout, verbose = False):
+    """
+    The distance to the win of every state that can be won
+
+    Returns
+    -------
+    keys : numpy array of uint64
+        The states.
+    distances : numpy array of uint8
+        The number of moves to win each one.
+    """
+    frontier = np.array([layout.wonKey()], dtype = np.uint64)
+    seen = frontier
+    layers = [frontier]
+    while True:
+        previous = [np.unique(layout.stateKeys(layout.predecessors(layout.unpack(
+                        frontier[start:start + CHUNK_STATES]))))
+                    for start in range(0, len(frontier), CHUNK_STATES)]
+        frontier = np.setdiff1d(np.unique(np.concatenate(previous)), seen, assume_unique = True)
+        if len(frontier) == 0:
+            break
+        if len(layers) >= EMPTY_DISTANCE:
+            raise ValueError("a distance does not fit in a byte")
+        seen = np.union1d(seen, frontier)
+        layers.append(frontier)
+        if verbose:
+            print(f"distance {len(layers) - 1}: {len(frontier)} states")
+    keys = np.concatenate(layers)
+    distances = np.concatenate([np.full(len(layer), distance, dtype = np.uint8)
+                                for distance, layer in enumerate(layers)])
+    return keys, distances
+
+# *****************************************************
+def buildTablebase(fileName, nrBotts, botSize, expert, verbose = False):
+    """
+    Writes the tablebase of a configuration to a file
+
+    Parameters
+    ----------
+    fileName : string
+        The name of the file.
+    nrBotts : int
+        The number of bottles.
+    botSize : int
+        The capacity of bottles.
+    expert : int
+        The level of the user's expertise.
+    verbose : bool, optional
+        Print the number of states at each distance. The default is False.
+
+    Returns
+    -------
+    int
+        The number of states that can be won (entries of the file).
+
+    Raises
+    ------
+    ValueError:
+        If the configuration is too large for a tablebase.
+    """
+    layout = Layout(nrBotts, botSize, expert)
+    keys, distances = retrogradeSearch(layout, verbose)
+    slotBits = max(1, (2 * len(keys) - 1).bit_length())
+    slots = 1 << slotBits
+    table = np.zeros(slots, dtype = np.uint64)
+    values = np.full(slots, EMPTY_DISTANCE, dtype = np.uint8)
+    # Linear probing for all the keys at once: at each round the keys not
+    # placed yet try their next slot, and one key takes each free slot
+    pending = np.arange(len(keys))
+    first = slotsOf(keys, slotBits)
+    probe = np.uint64(0)
+    while len(pending):
+        slot = (first[pending] + probe) & np.uint64(slots - 1)
+        free = np.flatnonzero(table[slot] == 0)
+        taken, chosen = np.unique(slot[free], return_index = True)
+        placed = pending[free[chosen]]
+        table[taken] = keys[placed]
+        values[taken] = distances[placed]
+        done = np.zeros(len(pending), dtype = bool)
+        done[free[chosen]] = True
+        pending = pending[~done]
+        probe += np.uint64(1)
+    with open(fileName, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, nrBotts, botSize, expert, layout.bits,
+                               slots, len(keys)))
+        file.write(table.astype("<u8").tobytes())
+        file.write(values.tobytes())
+    return len(keys)
+
+# *****************************************************
+class Tablebase:
+    """
+    A tablebase file, read through mmap. Can be used in a with statement.
+    """
+
+    def __init__(self, fileName):
+        """
+        Raises
+        ------
+        IOError:
+            If the file is not a tablebase.
+        """
+        with open(fileName, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            raise IOError(f"The file '{fileName}' is not a tablebase")
+        magic, version, nrBotts, botSize, expert, bits, slots, entries = \
+            HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION or \
+           len(self.map) != HEADER.size + 9 * slots:
+            raise IOError(f"The file '{fileName}' is not a tablebase")
+        self.layout = Layout(nrBotts, botSize, expert)
+        self.nrBotts = nrBotts
+        self.botSize = botSize
+        self.expert = expert
+        self.slots = slots
+        self.slotBits = slots.bit_length() - 1
+        self.entries = entries
+        self.distancesAt = HEADER.size + 8 * slots
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        self.map.close()
+
+    def codesOf(self, bottles):
+        """
+        The codes of the bottles, with the symbols numbered in sorted order.
+        None if some units of the symbols are missing (buildGameBottles can
+        leave some out), so the game can not be won.
+
+        Raises
+        ------
+        ValueError:
+            If the board is not of the configuration of the tablebase.
+        """
+        symbols = sorted({symbol for content in bottles.values() for symbol in content})
+        number = {symbol: index for index, symbol in enumerate(symbols)}
+        counts = [0] * len(symbols)
+        for content in bottles.values():
+            for symbol in content:
+                counts[number[symbol]] += 1
+        if len(bottles) != self.nrBotts or len(symbols) > self.layout.nrSymbols or \
+           any(count > self.botSize for count in counts) or \
+           any(len(content) > self.botSize for content in bottles.values()):
+            raise ValueError(f"The board is not of {self.nrBotts} bottles of capacity "
+                             f"{self.botSize} with expertise {self.expert}")
+        if len(symbols) < self.layout.nrSymbols or any(count < self.botSize for count in counts):
+            return None
+        return [self.layout.encode([number[symbol] for symbol in content])
+                for content in bottles.values()]
+
+    def lookup(self, key):
+        """
+        The distance to the win of a canonical state, None if it can not be won
+        """
+        mask = self.slots - 1
+        slot = slotOf(key, self.slotBits)
+        while True:
+            stored = struct.unpack_from("<Q", self.map, HEADER.size + 8 * slot)[0]
+            if stored == key:
+                return self.map[self.distancesAt + slot]
+            if stored == 0:
+                return None
+            slot = (slot + 1) & mask
+
+    def distance(self, bottles):
+        """
+        The least number of moves needed to win
+
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists.
+
+        Returns
+        -------
+        int or None
+            None if the game can not be won.
+
+        Raises
+        ------
+        ValueError:
+            If the board is not of the configuration of the tablebase.
+        """
+        codes = self.codesOf(bottles)
+        return None if codes is None else self.lookup(self.layout.stateKey(codes))
+
+    def bestMove(self, bottles):
+        """
+        A move that starts a shortest solution
+
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists. It is not modified.
+
+        Returns
+        -------
+        tuple or None
+            The (source, destin) letters, None if the game can not be won
+            or is already won.
+
+        Raises
+        ------
+        ValueError:
+            If the board is not of the configuration of the tablebase.
+        """
+        layout = self.layout
+        letters = list(bottles.keys())
+        codes = self.codesOf(bottles)
+        distance = None if codes is None else self.lookup(layout.stateKey(codes))
+        if not distance:
+            return None
+        contents = [layout.contents[code] for code in codes]
+        for source, sourceContent in enumerate(contents):
+            if not sourceContent:
+                continue
+            symbol = sourceContent[-1]
+            run = len(sourceContent) - _firstOfTopRun(sourceContent)
+            for destin, destContent in enumerate(contents):
+                room = self.botSize - len(destContent)
+                if destin == source or room == 0 or (destContent and destContent[-1] != symbol):
+                    continue
+                transfer = min(run, room)
+                child = list(codes)
+                child[source] = layout.encode(sourceContent[:len(sourceContent) - transfer])
+                child[destin] = layout.encode(destContent + [symbol] * transfer)
+                if self.lookup(layout.stateKey(child)) == distance - 1:
+                    return letters[source], letters[destin]
+        return None
+
+# *****************************************************
+def main(args = None):
+    parser = argparse.ArgumentParser(description = "Builds and reads endgame tablebases.")
+    parser.add_argument("table", help = "the tablebase file")
+    parser.add_argument("files", nargs = "*", help = "saved games to look up (see oldGameInfo)")
+    parser.add_argument("--build", type = int, nargs = 3, metavar = ("BOTTLES", "SIZE", "EXPERT"),
+                        help = "build the tablebase of a configuration")
+    options = parser.parse_args(args)
+    if options.build:
+        start = time.perf_counter()
+        entries = buildTablebase(options.table, *options.build, verbose = True)
+        print(f"{entries} states in {time.perf_counter() - start:.1f} s")
+    with Tablebase(options.table) as table:
+        for fileName in options.files:
+            expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = funcs.oldGameInfo(fileName)
+            start = time.perf_counter()
+            try:
+                distance = table.distance(bottles)
+                move = table.bestMove(bottles)
+            except ValueError as error:
+                print(f"{fileName}: {error}")
+                continue
+            elapsed = time.perf_counter() - start
+            text = "can not be won" if distance is None else \
+                   f"{distance} moves to win, best move {move}"
+            print(f"{fileName}: {text} ({elapsed * 1e6:.0f} us)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of batchSolver: a game that can not be read or solved
+gives an error row and the other games are still solved.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import batchSolver
+import gameFunctions as funcs
+
+# A game the search can not handle (bottles is not a dictionary)
+BROKEN = (1, 2, 0, 2, None, 0)
+WON = (1, 2, 0, 2, {'A': ['x', 'x'], 'B': []}, 0)
+
+# *****************************************************
+def test_errors_of_a_worker_become_error_rows():
+    assert batchSolver.solveEntry("broken", BROKEN, None, 1000)["status"] == "error"
+    missing = batchSolver.solveEntry("missing", os.path.join(ROOT, "no such game"), None, 1000)
+    assert missing["status"] == "error" and "error" in missing
+    assert batchSolver.solveEntry("won", WON, None, 1000)["status"] == "ok"
+
+def test_every_game_gets_a_row():
+    settings = funcs.newGameSettings(os.path.join(ROOT, "newgameinfo.txt"))
+    games = [("broken", BROKEN), ("won", WON)] + \
+            list(batchSolver.generatedGames(settings, 2, 3, solvable = True))
+    results = {result["game"]: result
+               for result in batchSolver.solveAll(games, workers = 1, timeLimit = 5,
+                                                  maxNodes = 20000)}
+    assert sorted(results) == ["0", "1", "broken", "won"]
+    assert results["broken"]["status"] == "error"
+    assert results["won"]["optimalLength"] == 0
+    for name in ("0", "1"):
+        assert results[name]["status"] == "error" or results[name]["solvable"] is not False
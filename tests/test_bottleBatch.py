@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of bottleBatch.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import bottleBatch
+import gameFunctions as funcs
+
+LETTERS = "ABCDEF"
+SYMBOLS = "@#%$"
+
+# *****************************************************
+def test_views_follow_the_rules_as_the_bottles():
+    boards, lengths = bottleBatch.buildGameBatch(200, 6, 4, 2, rng = 5)
+    for game in range(200):
+        views = bottleBatch.boardViews(boards, lengths, game, LETTERS)
+        bottles = bottleBatch.toBottles(boards, lengths, game, LETTERS, SYMBOLS)
+        for source in LETTERS:
+            assert funcs.full(views[source], 4) == funcs.full(bottles[source], 4)
+            for destin in LETTERS:
+                assert funcs.moveIsPossible(4, source, destin, views) == \
+                       funcs.moveIsPossible(4, source, destin, bottles)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Property tests of canonical.canonicalKey: the same puzzle, with its
+bottles shuffled and its symbols renamed, gets the same key, and two
+different puzzles get different keys.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import itertools
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import canonical
+
+LETTERS = "ABCDEFGH"
+SYMBOLS = "xyzw"
+
+# *****************************************************
+def randomBoard(rng, nrBotts, botSize, nrSymbols):
+    """
+    A board of nrBotts bottles with random contents of at most botSize
+    units of the first nrSymbols symbols
+    """
+    return {LETTERS[i]: [rng.choice(SYMBOLS[:nrSymbols]) for _ in range(rng.randint(0, botSize))]
+            for i in range(nrBotts)}
+
+def disguise(rng, bottles):
+    """
+    The same puzzle with its bottles shuffled and its symbols renamed
+    """
+    contents = list(bottles.values())
+    rng.shuffle(contents)
+    letters = rng.sample(LETTERS, len(contents))
+    rename = dict(zip(SYMBOLS, rng.sample("pqrs", len(SYMBOLS))))
+    return {letter: [rename[s] for s in content] for letter, content in zip(letters, contents)}
+
+def samePuzzle(first, second):
+    """
+    Brute force: is there a renaming of the symbols of first that gives
+    the contents of second, in some order of the bottles?
+    """
+    target = sorted(tuple(content) for content in second.values())
+    for names in itertools.permutations(SYMBOLS):
+        rename = dict(zip(SYMBOLS, names))
+        if sorted(tuple(rename[s] for s in content) for content in first.values()) == target:
+            return True
+    return False
+
+# *****************************************************
+def test_shuffled_and_renamed_boards_get_the_same_key():
+    rng = random.Random(5)
+    for _ in range(300):
+        bottles = randomBoard(rng, rng.randint(2, 6), rng.randint(2, 4), rng.randint(1, 4))
+        key = canonical.canonicalKey(bottles)
+        for _ in range(3):
+            assert canonical.canonicalKey(disguise(rng, bottles)) == key
+
+def test_different_puzzles_get_different_keys():
+    rng = random.Random(7)
+    # Small boards, so that many pairs are the same puzzle in disguise
+    boards = [randomBoard(rng, 3, 2, 3) for _ in range(120)]
+    keys = [canonical.canonicalKey(bottles) for bottles in boards]
+    nrSame = 0
+    for (first, firstKey), (second, secondKey) in itertools.combinations(zip(boards, keys), 2):
+        same = samePuzzle(first, second)
+        nrSame += same
+        assert (firstKey == secondKey) == same
+    assert nrSame > 0
+
+def test_ties_between_symbols_are_broken_the_same_way():
+    # Every symbol has the same heights and neighbours: only the
+    # individualisation of canonical.symbolNames tells them apart
+    first = {'A': ['x', 'y'], 'B': ['y', 'z'], 'C': ['z', 'x']}
+    second = {'A': ['x', 'y'], 'B': ['y', 'x'], 'C': ['z', 'z']}
+    assert canonical.canonicalKey(first) != canonical.canonicalKey(second)
+    assert canonical.canonicalKey(first) == \
+           canonical.canonicalKey({'B': ['q', 'p'], 'C': ['r', 'q'], 'A': ['p', 'r']})
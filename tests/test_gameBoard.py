@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of gameBoard.GameBoard.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameBoard
+import gameFunctions as funcs
+
+# *****************************************************
+def test_pour_into_itself_keeps_counts():
+    bottles = {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
+    board = gameBoard.GameBoard(bottles, 3, 1)
+    for source, destin in (('A', 'A'), ('A', 'B'), ('C', 'A')):
+        assert funcs.moveIsPossible(3, source, destin, bottles)
+        board.doMove(source, destin)
+        assert board.fullBottles == sum(1 for content in bottles.values()
+                                        if funcs.full(content, 3))
+    assert board.allBottlesFull()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of the rules of gameFunctions and of the modules that
+follow them.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+import gameFunctions as funcs
+import headlessGame
+import moveIndex
+import packedBoard
+import rleBottles
+import waterSortEnv
+
+# *****************************************************
+def test_pour_into_itself_is_a_possible_move_that_changes_nothing():
+    bottles = {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
+    assert funcs.moveIsPossible(3, 'A', 'A', bottles)
+    assert funcs.doMove(3, 'A', 'A', bottles) == 0
+    assert bottles == {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
+
+    runs = rleBottles.toRunBottles(bottles)
+    assert rleBottles.moveIsPossible(3, 'A', 'A', runs)
+    assert rleBottles.doMove(3, 'A', 'A', runs) == 0
+    assert rleBottles.toListBottles(runs) == bottles
+
+    index = moveIndex.MoveIndex(bottles, 3)
+    for source in bottles:
+        for destin in bottles:
+            assert index.moveIsPossible(source, destin) == \
+                   funcs.moveIsPossible(3, source, destin, bottles)
+    assert index.doMove('A', 'A') == 0
+    assert bottles == {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
+    assert ('A', 'A') not in index.legalMoves()
+
+    state, letters, symbols = packedBoard.packBottles(bottles, 3)
+    before = bytes(state)
+    assert packedBoard.packedMoveIsPossible(3, 0, 0, state)
+    assert packedBoard.packedDoMove(3, 0, 0, state) == 0
+    assert bytes(state) == before
+
+# *****************************************************
+class SelfPour:
+    def __init__(self):
+        self.turns = 0
+
+    def chooseMove(self, bottles, botSize, nrErrors):
+        self.turns += 1
+        return ('A', 'A') if self.turns <= 3 else None
+
+def test_pour_into_itself_is_not_an_error():
+    infoGame = (1, 3, 0, 3, {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}, 0)
+    summary = headlessGame.playGame(infoGame, SelfPour())
+    assert summary["result"] == "quit" and summary["errors"] == 0 and summary["moves"] == 3
+
+    env = waterSortEnv.WaterSortEnv(4, 4, 3, 1, seed = 0)
+    boards = env.reset().copy()
+    lengths = env.lengths.copy()
+    legal = env.legalMoves()
+    actions = np.zeros((4, 2), dtype = np.int64)
+    observation, reward, done, info = env.step(actions)
+    assert (legal[:, 0, 0] == (lengths[:, 0] > 0) & (lengths[:, 0] < 3)).all()
+    assert (env.errors == ~legal[:, 0, 0]).all()
+    assert (info["transfer"] == 0).all()
+    assert (observation == boards).all() and (env.lengths == lengths).all()
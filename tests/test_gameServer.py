@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of gameServer: a request that can not be decoded gets
+an error line and the connection goes on.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import gameServer
+
+# *****************************************************
+async def exchange(lines):
+    """
+    Sends each line to a new server and returns the decoded answers
+    """
+    server = await gameServer.startServer(os.path.join(ROOT, "newgameinfo.txt"), port = 0)
+    port = server.sockets[0].getsockname()[1]
+    answers = []
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port,
+                                                       limit = gameServer.MAX_LINE)
+        for line in lines:
+            writer.write(line + b"\n")
+            await writer.drain()
+            answers.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+    return answers
+
+# *****************************************************
+def test_deeply_nested_requests_get_an_error_line():
+    nested = b"[" * 200000
+    game = json.dumps({"op": "load", "game": "[" * 200000}).encode()
+    answers = asyncio.run(exchange([nested, b"{", game, b'{"op": "new"}']))
+    assert [answer["ok"] for answer in answers] == [False, False, False, True]
+    assert all(answer["error"] for answer in answers[:3])
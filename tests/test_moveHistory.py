@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of moveHistory: undo and redo roll back the bottles,
+fullBottles and nrErrors exactly.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameBoard
+import gameFunctions as funcs
+import moveHistory
+
+BOT_SIZE = 3
+
+# *****************************************************
+def play(choices, bottles, board, history):
+    """
+    Plays the (source, destin) choices as assignment3 does; the state
+    (bottles, fullBottles, nrErrors) after each of them
+    """
+    nrErrors = 0
+    states = [(copy.deepcopy(bottles), board.fullBottles, nrErrors)]
+    for source, destin in choices:
+        if funcs.moveIsPossible(BOT_SIZE, source, destin, bottles):
+            transfer = board.doMove(source, destin)
+            history.recordMove(source, destin, transfer, bottles, board.isFull(destin))
+        else:
+            nrErrors += 1
+            history.recordError()
+        states.append((copy.deepcopy(bottles), board.fullBottles, nrErrors))
+    return states
+
+def test_undo_and_redo_roll_back_exactly():
+    bottles = {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x'], 'D': ['x']}
+    board = gameBoard.GameBoard(bottles, BOT_SIZE, 2)
+    history = moveHistory.MoveHistory()
+    states = play([('A', 'B'), ('B', 'C'), ('A', 'A'), ('C', 'A'), ('D', 'A')],
+                  bottles, board, history)
+    assert states[-1][1:] == (2, 1)
+    fullBottles, nrErrors = states[-1][1:]
+    for state in reversed(states[:-1]):
+        fullBottles, nrErrors = history.undo(bottles, fullBottles, nrErrors, board)
+        assert (bottles, fullBottles, nrErrors) == state
+    assert not history.canUndo()
+    for state in states[1:]:
+        fullBottles, nrErrors = history.redo(bottles, fullBottles, nrErrors, board)
+        assert (bottles, fullBottles, nrErrors) == state
+    assert not history.canRedo()
+
+def test_undo_without_board_keeps_count_of_full_bottles():
+    bottles = {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
+    board = gameBoard.GameBoard(bottles, BOT_SIZE, 1)
+    history = moveHistory.MoveHistory()
+    states = play([('A', 'B'), ('C', 'A')], bottles, board, history)
+    fullBottles, nrErrors = states[-1][1:]
+    for state in reversed(states[:-1]):
+        fullBottles, nrErrors = history.undo(bottles, fullBottles, nrErrors)
+        assert (bottles, fullBottles, nrErrors) == state
+
+def test_new_move_clears_the_redo():
+    bottles = {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
+    board = gameBoard.GameBoard(bottles, BOT_SIZE, 1)
+    history = moveHistory.MoveHistory()
+    play([('A', 'B'), ('B', 'C')], bottles, board, history)
+    history.undo(bottles, 1, 1, board)
+    history.undo(bottles, 1, 0, board)
+    assert history.canRedo()
+    play([('A', 'C')], bottles, board, history)
+    assert not history.canRedo()
+    assert history.canUndo()
+    history.undo(bottles, 0, 0, board)
+    assert not history.canUndo()
+    assert bottles == {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of moveJournal: a session that crashed while writing
+loses nothing but the record being written.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import moveJournal
+
+# (expertise, nrBotts, fullBottles, botSize, bottles, nrErrors)
+GAME = (1, 3, 0, 3, {'A': ['x', 'y'], 'B': ['y', 'y'], 'C': ['x', 'x']}, 0)
+
+# *****************************************************
+def startJournal(fileName):
+    journal = moveJournal.MoveJournal(fileName)
+    journal.snapshot(GAME[:4] + ({letter: list(content) for letter, content
+                                  in GAME[4].items()},) + GAME[5:])
+    journal.recordError()
+    journal.recordMove('A', 'B', 1)
+    journal.close()
+
+def rebuilt(fileName):
+    expertise, nrBotts, fullBottles, botSize, bottles, nrErrors = \
+        moveJournal.loadJournal(fileName)
+    return bottles, nrErrors
+
+AFTER_MOVE = ({'A': ['x'], 'B': ['y', 'y', 'y'], 'C': ['x', 'x']}, 1)
+
+def test_truncated_last_record_is_ignored(tmp_path):
+    fileName = str(tmp_path / "journal.txt")
+    startJournal(fileName)
+    with open(fileName, "a", encoding = "utf-8") as file:
+        file.write("M C\tA")
+    assert rebuilt(fileName) == AFTER_MOVE
+    # A new session removes it before adding its records
+    journal = moveJournal.MoveJournal(fileName)
+    journal.recordMove('C', 'A', 2)
+    journal.close()
+    assert rebuilt(fileName) == ({'A': ['x', 'x', 'x'], 'B': ['y', 'y', 'y'], 'C': []}, 1)
+
+def test_partial_snapshot_falls_back_to_the_previous_one(tmp_path):
+    fileName = str(tmp_path / "journal.txt")
+    startJournal(fileName)
+    with open(fileName, "a", encoding = "utf-8") as file:
+        file.write('S {"format": "watersort-save", "vers')
+    assert rebuilt(fileName) == AFTER_MOVE
+
+def test_resumed_game_is_rebuilt_from_its_new_snapshot(tmp_path):
+    fileName = str(tmp_path / "journal.txt")
+    startJournal(fileName)
+    # What assignment3 does when the game is continued from the journal
+    info = moveJournal.loadJournal(fileName)
+    journal = moveJournal.MoveJournal(fileName)
+    journal.snapshot(info)
+    journal.recordMove('C', 'A', 2)
+    journal.recordError()
+    journal.close()
+    with open(fileName, encoding = "utf-8") as file:
+        assert sum(1 for line in file if line.startswith("S ")) == 2
+    assert rebuilt(fileName) == ({'A': ['x', 'x', 'x'], 'B': ['y', 'y', 'y'], 'C': []}, 2)
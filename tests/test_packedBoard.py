@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of packedBoard.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+import gameFunctions as funcs
+import packedBoard
+
+SYMBOLS = "@#%$!+o?"
+
+# *****************************************************
+def test_batch_moves_follow_the_moves_one_at_a_time():
+    generator = np.random.default_rng(3)
+    for nrBotts, botSize, expert in ((10, 8, 2), (6, 4, 1), (7, 5, 3)):
+        games = [funcs.buildGameBottles(nrBotts, botSize, expert, "ABCDEFGHIJ", SYMBOLS,
+                                        rng = number) for number in range(100)]
+        states = [packedBoard.packBottles(bottles, botSize, SYMBOLS)[0] for bottles in games]
+        batch = packedBoard.stackStates(states)
+        for step in range(20):
+            sources = generator.integers(0, nrBotts, len(states))
+            destins = generator.integers(0, nrBotts, len(states))
+            # Some moves from a bottle into itself
+            destins[:10] = sources[:10]
+            transfers = packedBoard.packedDoMoves(botSize, batch, sources, destins)
+            for state, source, destin, transfer, row in zip(states, sources.tolist(),
+                                                            destins.tolist(), transfers, batch):
+                expected = 0
+                if packedBoard.packedMoveIsPossible(botSize, source, destin, state):
+                    expected = packedBoard.packedDoMove(botSize, source, destin, state)
+                assert transfer == expected
+                assert bytes(row) == bytes(state)
+
+# *****************************************************
+def test_compact_states_expand_to_the_same_states():
+    games = [funcs.buildGameBottles(10, 7, 2, "ABCDEFGHIJ", SYMBOLS, rng = number)
+             for number in range(50)]
+    batch = packedBoard.stackStates(packedBoard.packBottles(bottles, 7)[0] for bottles in games)
+    compact = packedBoard.compactStates(batch, 7)
+    assert compact.shape == (50, 35)
+    assert (packedBoard.expandStates(compact, 10, 7) == batch).all()
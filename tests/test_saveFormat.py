@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of saveFormat: malformed files are rejected with
+SaveFormatError, and nothing in them is executed.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import json
+import os
+import struct
+import sys
+import zlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import saveFormat
+
+GAME = (2, 3, 1, 4, {'A': ['@', '@', '@', '@'], 'B': ['#', '#'], 'C': ['#', '#']}, 1)
+
+# *****************************************************
+def withChecksum(data):
+    return data + struct.pack("<I", zlib.crc32(data))
+
+def test_every_format_reads_back_the_game():
+    for fmt in ("binary", "json", "legacy"):
+        assert saveFormat.loads(saveFormat.dumps(GAME, fmt)) == GAME
+
+def test_truncated_binary_is_rejected():
+    data = saveFormat.dumpBinary(*GAME)
+    for end in range(len(data)):
+        with pytest.raises(saveFormat.SaveFormatError):
+            saveFormat.loads(data[:end])
+    # A truncated game with a right checksum
+    with pytest.raises(saveFormat.SaveFormatError):
+        saveFormat.loads(withChecksum(data[:-10]))
+
+def test_bad_magic_or_version_is_rejected():
+    body = saveFormat.dumpBinary(*GAME)[:-4]
+    with pytest.raises(saveFormat.SaveFormatError):
+        saveFormat.loadBinary(withChecksum(b"XXXX" + body[4:]))
+    with pytest.raises(saveFormat.SaveFormatError):
+        saveFormat.loads(withChecksum(body[:4] + bytes([saveFormat.VERSION + 1]) + body[5:]))
+    game = json.loads(saveFormat.dumpJson(*GAME))
+    for key, value in (("format", "other"), ("version", saveFormat.VERSION + 1)):
+        with pytest.raises(saveFormat.SaveFormatError):
+            saveFormat.loads(json.dumps(dict(game, **{key: value})).encode("utf-8"))
+
+def test_json_out_of_the_schema_is_rejected():
+    game = json.loads(saveFormat.dumpJson(*GAME))
+    for key, value in (("expertise", -1), ("errors", "1"), ("bottleSize", 1.5),
+                       ("totalNumberOfBottles", 4), ("bottleInfo", [["@"]]),
+                       ("bottleInfo", {"A": ["@"] * 5, "B": [], "C": []}),
+                       ("bottleInfo", {"A": [1], "B": [], "C": []})):
+        with pytest.raises(saveFormat.SaveFormatError):
+            saveFormat.loads(json.dumps(dict(game, **{key: value})).encode("utf-8"))
+    del game["errors"]
+    with pytest.raises(saveFormat.SaveFormatError):
+        saveFormat.loads(json.dumps(game).encode("utf-8"))
+
+def test_legacy_line_5_is_never_executed(tmp_path):
+    marker = tmp_path / "executed"
+    for line in (f"__import__('pathlib').Path({str(marker)!r}).touch()",
+                 f"{{'A': open({str(marker)!r}, 'w')}}",
+                 "{[1]: 2}", "[" * 100000):
+        text = f"2\n3\n0\n4\n{line}\n0\n"
+        with pytest.raises(saveFormat.SaveFormatError):
+            saveFormat.loads(text.encode("utf-8"))
+    assert not marker.exists()
+
+def test_conversion_goes_on_after_a_file_that_can_not_be_read(tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_bytes(saveFormat.dumps(GAME, "legacy"))
+    bad = tmp_path / "bad.txt"
+    bad.write_text("not a game")
+    names = [str(tmp_path / "missing.txt"), str(bad), str(tmp_path), str(good)]
+    results = list(saveFormat.convertFiles(names, str(tmp_path / "out")))
+    assert [error is None for _, _, error in results] == [False, False, False, True]
+    assert all(isinstance(error, OSError) for _, _, error in results[:3])
+    assert saveFormat.loadGame(results[3][1]) == GAME
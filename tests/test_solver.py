@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of solver: the solutions of solve win the game when they
+are played with the rules of gameFunctions.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameBoard
+import gameFunctions as funcs
+import solver
+
+FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# *****************************************************
+def replayWins(bottles, botSize, expert, moves):
+    """
+    Plays moves with the rules of gameFunctions; True if they win the game
+    """
+    board = gameBoard.GameBoard(bottles, botSize, expert)
+    for source, destin in moves:
+        if not funcs.moveIsPossible(botSize, source, destin, bottles):
+            return False
+        board.doMove(source, destin)
+    return board.allBottlesFull()
+
+def test_solutions_win_new_games():
+    settings = funcs.newGameSettings(os.path.join(FOLDER, "newgameinfo.txt"))
+    for number in range(30):
+        expertise, nrBotts, _, botSize, bottles, _ = \
+            funcs.newGameFromSettings(settings, True, funcs.gameSeed(11, number))
+        moves, nodes = solver.solve(bottles, botSize, expertise, maxNodes = 200000)
+        assert moves is not None
+        assert replayWins(bottles, botSize, expertise, moves)
+
+def test_games_that_can_not_be_won_have_no_solution():
+    found = 0
+    for number in range(30):
+        bottles = funcs.buildGameBottles(8, 4, 1, "ABCDEFGH", "@#%$!+o",
+                                         rng = funcs.gameSeed(5, number))
+        moves, nodes = solver.solve(bottles, 4, 1)
+        if solver.isSolvable(bottles, 4, 1) is False:
+            assert moves is None
+            found += 1
+        else:
+            assert replayWins(bottles, 4, 1, moves)
+    assert found > 0
+    # No move at all
+    moves, nodes = solver.solve({'A': ['x', 'y'], 'B': ['y', 'x']}, 2, 1)
+    assert moves is None
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Regression tests of zobrist: the hash kept by a GameBoard through random
+moves and undos is the hash of the board computed from scratch.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gameBoard
+import gameFunctions as funcs
+import moveHistory
+import rleBottles
+import zobrist
+
+LETTERS = "ABCDEFGHIJ"
+SYMBOLS = "abcdefgh"
+
+# *****************************************************
+def randomGame(rng, rules):
+    """
+    Plays random moves (self-pours and undos among them) on a new game,
+    checking the hash of the board after each of them
+    """
+    botSize = 4
+    bottles = funcs.buildGameBottles(10, botSize, 2, LETTERS, SYMBOLS, rng)
+    if rules is rleBottles:
+        bottles = rleBottles.toRunBottles(bottles)
+    table = zobrist.ZobristTable(seed = 3)
+    board = gameBoard.GameBoard(bottles, botSize, 2, table)
+    history = moveHistory.MoveHistory()
+    for _ in range(300):
+        if history.canUndo() and rng.random() < 0.2:
+            history.undo(bottles, board.fullBottles, 0, board)
+        else:
+            source, destin = rng.choice(LETTERS), rng.choice(LETTERS)
+            if not rules.moveIsPossible(botSize, source, destin, bottles):
+                continue
+            transfer = board.doMove(source, destin, rules)
+            history.recordMove(source, destin, transfer, bottles, board.isFull(destin))
+        assert board.hash == table.boardHash(bottles)
+
+# *****************************************************
+def test_incremental_hash_is_the_hash_from_scratch():
+    rng = random.Random(1)
+    for _ in range(20):
+        randomGame(rng, funcs)
+
+def test_incremental_hash_of_run_bottles():
+    rng = random.Random(2)
+    for _ in range(10):
+        randomGame(rng, rleBottles)
+
+def test_board_without_table_has_no_hash():
+    board = gameBoard.GameBoard({'A': ['x'], 'B': []}, 2, 1)
+    board.doMove('A', 'B')
+    assert board.hash is None
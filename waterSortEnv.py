@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Vectorized environment with the rules of the game, for training bots.
+
+WaterSortEnv keeps N games in NumPy arrays (in the layout of bottleBatch:
+boards of shape (N, nrBotts, botSize) with symbol codes from 1, and the
+lengths of the bottles) and plays one move in every game at each step, in
+the style of the vector environments of Gym:
+
+    env = WaterSortEnv(1024, 10, 4, 2, seed = 0)
+    observation = env.reset()
+    observation, reward, done, info = env.step(actions)
+
+actions has one (source, destin) pair of bottle indexes per game. As in
+assignment3.py, a move that is not possible (moveIsPossible) is an error,
+a game is lost after 3 errors and won when allBottlesFull. The reward of a
+step is REWARD_FULL for each bottle that became full (minus that for each
+one that stopped being full), REWARD_ERROR for an error and REWARD_WIN for
+the win. Games that end are built again at the same step (their final
+state is in info["final"]), so every game is always being played.
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import numpy as np
+
+import bottleBatch
+
+# Maximum errors before the game is lost, as in assignment3.py
+MAX_ERRORS = 3
+REWARD_FULL = 1.0
+REWARD_ERROR = -1.0
+REWARD_WIN = 10.0
+
+# *****************************************************
+class WaterSortEnv:
+    """
+    N games played at the same time, one move in each per step.
+    """
+
+    def __init__(self, count, nrBotts, botSize, expert, seed = None):
+        """
+        Parameters
+        ----------
+        count : int
+            The number of games (N).
+        nrBotts : int
+            The number of bottles in each game.
+        botSize : int
+            The capacity of bottles.
+        expert : int
+            The level of the user's expertise.
+        seed : int, optional
+            Seed of the random generator of the games. The default is None.
+        """
+        self.count = count
+        self.nrBotts = nrBotts
+        self.botSize = botSize
+        self.expert = expert
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(count)
+        self.positions = np.arange(botSize)
+        self.boards = np.zeros((count, nrBotts, botSize), dtype = np.uint8)
+        self.lengths = np.zeros((count, nrBotts), dtype = np.int64)
+        self.fullMask = np.zeros((count, nrBotts), dtype = bool)
+        self.fullBottles = np.zeros(count, dtype = np.int64)
+        self.errors = np.zeros(count, dtype = np.int64)
+
+    def _isFull(self, rows, bottles):
+        # Full with a same symbol: botSize symbols all equal to the first one
+        contents = self.boards[rows, bottles]
+        return (self.lengths[rows, bottles] == self.botSize) & \
+               (contents == contents[:, :1]).all(axis = 1)
+
+    def reset(self, mask = None):
+        """
+        Builds new games.
+
+        Parameters
+        ----------
+        mask : numpy array of bool, shape (N,), optional
+            The games to build again. The default is None (all of them).
+
+        Returns
+        -------
+        numpy array of uint8, shape (N, nrBotts, botSize)
+            The observation: the contents of the bottles of all the games.
+            It is the array of the environment, updated in place by step.
+        """
+        rows = self.rows if mask is None else np.flatnonzero(mask)
+        if len(rows) > 0:
+            boards, lengths = bottleBatch.buildGameBatch(len(rows), self.nrBotts, self.botSize,
+                                                        self.expert, self.rng)
+            self.boards[rows] = boards
+            self.lengths[rows] = lengths
+            self.errors[rows] = 0
+            full = (lengths == self.botSize) & (boards == boards[:, :, :1]).all(axis = 2)
+            self.fullMask[rows] = full
+            self.fullBottles[rows] = full.sum(axis = 1)
+        return self.boards
+
+    def legalMoves(self):
+        """
+        The moves that are possible in each game.
+
+        Returns
+        -------
+        numpy array of bool, shape (N, nrBotts, nrBotts)
+            True at [game, source, destin] if moveIsPossible.
+        """
+        tops = np.take_along_axis(self.boards, np.maximum(self.lengths - 1, 0)[:, :, None],
+                                  axis = 2)[:, :, 0]
+        notEmpty = self.lengths > 0
+        room = self.lengths < self.botSize
+        same = tops[:, :, None] == tops[:, None, :]
+        possible = notEmpty[:, :, None] & \
+                   (~notEmpty[:, None, :] | (room[:, None, :] & same))
+        return possible
+
+    def step(self, actions):
+        """
+        Plays one move in each game.
+
+        Parameters
+        ----------
+        actions : array of ints, shape (N, 2)
+            The (source, destin) bottle indexes of the move of each game.
+
+        Returns
+        -------
+        observation : numpy array of uint8, shape (N, nrBotts, botSize)
+            As returned by reset, after the moves (and the new games).
+        reward : numpy array of float, shape (N,)
+            The reward of each game (see the module documentation).
+        done : numpy array of bool, shape (N,)
+            True for the games that ended (and were built again).
+        info : dictionary
+            "transfer": the quantity moved in each game; "win": the games
+            won; "final": the boards of the games that ended, before being
+            built again (shape (number of ended games, nrBotts, botSize)).
+
+        Raises
+        ------
+        ValueError:
+            If actions does not have the shape (N, 2) or an index is out of range.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.count, 2) or actions.min() < 0 or \
+           actions.max() >= self.nrBotts:
+            raise ValueError(f"actions must be {self.count} pairs of indexes below {self.nrBotts}")
+        rows = self.rows
+        source = actions[:, 0]
+        destin = actions[:, 1]
+        sourceLen = self.lengths[rows, source]
+        destLen = self.lengths[rows, destin]
+        sourceRow = self.boards[rows, source]
+        destRow = self.boards[rows, destin]
+        sourceTop = sourceRow[rows, np.maximum(sourceLen - 1, 0)]
+        destTop = destRow[rows, np.maximum(destLen - 1, 0)]
+
+        # moveIsPossible (a bottle poured into itself is possible and moves
+        # nothing, as in gameFunctions.doMove)
+        possible = (sourceLen > 0) & \
+                   ((destLen == 0) | ((destLen < self.botSize) & (sourceTop == destTop)))
+        # doMove: the run of equal symbols at the top of the source is the
+        # distance from its top to the highest different symbol below it
+        inside = self.positions < sourceLen[:, None]
+        below = np.where(inside & (sourceRow != sourceTop[:, None]), self.positions, -1).max(axis = 1)
+        transfer = np.where(possible & (source != destin),
+                            np.minimum(sourceLen - 1 - below, self.botSize - destLen), 0)
+        leaving = inside & (self.positions >= (sourceLen - transfer)[:, None])
+        arriving = (self.positions >= destLen[:, None]) & \
+                   (self.positions < (destLen + transfer)[:, None])
+        self.boards[rows, source] = np.where(leaving, 0, sourceRow)
+        self.boards[rows, destin] = np.where(arriving, sourceTop[:, None], destRow)
+        self.lengths[rows, source] = sourceLen - transfer
+        self.lengths[rows, destin] = destLen + transfer
+
+        # Only the two bottles of each move can change of state
+        before = self.fullBottles.copy()
+        for bottles in (source, destin):
+            was = self.fullMask[rows, bottles]
+            now = self._isFull(rows, bottles)
+            self.fullMask[rows, bottles] = now
+            self.fullBottles += now.astype(np.int64) - was
+        self.errors += ~possible
+
+        win = self.fullBottles == self.nrBotts - self.expert
+        done = win | (self.errors >= MAX_ERRORS)
+        reward = REWARD_FULL * (self.fullBottles - before) + \
+                 np.where(possible, 0.0, REWARD_ERROR) + np.where(win, REWARD_WIN, 0.0)
+        info = {"transfer": transfer, "win": win, "final": self.boards[done].copy()}
+        self.reset(done)
+        return self.boards, reward, done, info
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fundamentos de Programação - Project 3
+
+Incremental Zobrist hashing of the game bottles.
+
+Every (bottle, position, symbol) triple gets a random 64-bit key and the
+hash of a board is the XOR of the keys of all its occupied positions. A
+move only changes the positions of the units it transfers, so the hash
+is updated in O(units moved) instead of being computed again.
+
+Works with the dictionaries of lists from gameFunctions and with the
+RunBottle dictionaries from rleBottles. A gameBoard.GameBoard built with
+a table keeps the hash of its bottles through its moves and their undos
+(headlessGame uses it to count the moves back to a board already seen).
+
+@author: Duarte Gonçalves (nº 56095) e Pedro Travessa (nº 59479) - Group 11
+"""
+
+import hashlib
+
+import gameFunctions as funcs
+
+# *****************************************************
+class ZobristTable:
+    """
+    The random keys of the (bottle, position, symbol) triples.
+
+    Keys are derived from the seed and the triple itself, and built only
+    when first needed, so two tables with the same seed always give the
+    same hashes, whatever the order in which they are used.
+    """
+
+    def __init__(self, seed = 0):
+        """
+        Parameters
+        ----------
+        seed : int, optional
+            Selects the family of keys. The default is 0.
+        """
+        self.salt = seed.to_bytes(16, "little", signed = True)
+        self.keys = {}
+
+    def key(self, letter, position, symbol):
+        """
+        The 64-bit key of symbol at position of the bottle letter.
+        """
+        triple = (letter, position, symbol)
+        value = self.keys.get(triple)
+        if value is None:
+            digest = hashlib.blake2b(f"{letter}\0{position}\0{symbol}".encode(),
+                                     digest_size = 8, key = self.salt).digest()
+            value = int.from_bytes(digest, "little")
+            self.keys[triple] = value
+        return value
+
+    def boardHash(self, bottles):
+        """
+        The hash of a whole board, in O(number of symbols).
+
+        Parameters
+        ----------
+        bottles : dictionary
+            Keys are strings and values are lists (or RunBottle).
+
+        Returns
+        -------
+        int
+            The 64-bit hash of the board.
+        """
+        result = 0
+        for letter, content in bottles.items():
+            for position, symbol in enumerate(content):
+                result ^= self.key(letter, position, symbol)
+        return result
+
+    def updateHash(self, boardHash, source, destin, transfer, bottles):
+        """
+        The hash of the board after a move, in O(transfer).
+
+        Parameters
+        ----------
+        boardHash : int
+            The hash of the board before the move.
+        source : string
+            The letter of the source bottle of the move.
+        destin : string
+            The letter of the destination bottle of the move.
+        transfer : int
+            The quantity returned by doMove.
+        bottles : dictionary
+            The bottles, already AFTER the move.
+
+        Returns
+        -------
+        int
+            The 64-bit hash of the board after the move.
+        """
+        destContent = bottles[destin]
+        symbol = destContent[len(destContent) - 1] if transfer > 0 else None
+        sourceTop = len(bottles[source])
+        destTop = len(destContent) - transfer
+        for i in range(transfer):
+            boardHash ^= self.key(source, sourceTop + i, symbol)
+            boardHash ^= self.key(destin, destTop + i, symbol)
+        return boardHash
+
+    def doMove(self, botSize, source, destin, bottles, boardHash, rules = funcs):
+        """
+        Does a move and updates the hash of the board.
+
+        Parameters
+        ----------
+        botSize : int
+            The capacity of bottles.
+        source : string
+            The letter that identifies the source bottle in the dict bottles.
+        destin : string
+            The letter that identifies the destination bottle in the dict bottles.
+        bottles : dictionary
+            Keys are strings and values are lists (or RunBottle).
+        boardHash : int
+            The hash of the board before the move.
+        rules : module, optional
+            The module whose doMove is used. The default is gameFunctions;
+            rleBottles can be given for RunBottle dictionaries.
+
+        Returns
+        -------
+        transfer : int
+            The quantity of "liquid" that was transferred from source to destin.
+        boardHash : int
+            The hash of the board after the move.
+
+        Requires:
+        --------
+            moveIsPossible(botSize, source, destin, bottles)
+        """
+        transfer = rules.doMove(botSize, source, destin, bottles)
+        return transfer, self.updateHash(boardHash, source, destin, transfer, bottles)